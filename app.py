@@ -11,15 +11,44 @@ Run:
 import os
 import re
 import json
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
-from collections import defaultdict
-
-import tempfile
+import time
+import random
+import asyncio
+import queue
+import heapq
+import hashlib
+import sqlite3
+import zlib
+import math
+import threading
+from array import array
+from bisect import bisect_left
+from functools import cached_property, lru_cache, wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dataclasses import dataclass, field, asdict, replace
+from typing import Iterator, List, Dict, NamedTuple, Optional, Tuple, Union
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+import io
+import importlib
+import multiprocessing
 from pathlib import Path   # you probably already have this
 
 import streamlit as st
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 # ===========================
 # 0) LLM CLIENT (OpenAI-style)
 # ===========================
@@ -31,31 +60,619 @@ except ImportError:
     openai = None
     LLM_ENABLED = False
 
+# ===========================
+# 0a) METRICS (latency histograms + counters, Prometheus text format)
+# ===========================
+METRICS_ENABLED = os.getenv("TALENTIQ_METRICS", "0") != "0"
+METRICS_PORT = int(os.getenv("TALENTIQ_METRICS_PORT", "0"))  # > 0: serve /metrics from main()
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _label_key(labels: Dict[str, object]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    esc = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels) + "}"
+
+class Metrics:
+    """
+    Process-wide counters and latency histograms, thread-safe, rendered in the
+    Prometheus text exposition format. While disabled every call returns after one
+    attribute check. Process-pool workers collect into their own copy, which
+    `run_batch` drains after each chunk and merges into the parent's.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED, buckets=LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, tuple], float] = defaultdict(float)
+        # per series: one count per bucket, then +Inf, then the sum of observations
+        self._hists: Dict[Tuple[str, tuple], List[float]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[(name, _label_key(labels))] += value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        slot = bisect_left(self.buckets, seconds)
+        with self._lock:
+            hist = self._hists.get(key)
+            if hist is None:
+                hist = self._hists[key] = [0.0] * (len(self.buckets) + 2)
+            hist[slot] += 1
+            hist[-1] += seconds
+
+    def timed(self, stage: str):
+        """Decorator: record the call's latency in talentiq_stage_seconds{stage=...}."""
+        def deco(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe("talentiq_stage_seconds", time.perf_counter() - t0, stage=stage)
+            return wrapper
+        return deco
+
+    def stage_totals(self) -> Dict[str, Tuple[int, float]]:
+        """{stage: (calls, seconds)} so far; diff two of these around a run for a per-run view."""
+        with self._lock:
+            return {
+                dict(labels)["stage"]: (int(sum(hist[:-1])), hist[-1])
+                for (name, labels), hist in self._hists.items()
+                if name == "talentiq_stage_seconds"
+            }
+
+    def counter_totals(self) -> Dict[str, float]:
+        """Counters summed over their labels, by metric name."""
+        out: Dict[str, float] = defaultdict(float)
+        with self._lock:
+            for (name, _), value in self._counters.items():
+                out[name] += value
+        return dict(out)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._hists.clear()
+
+    def drain(self) -> Tuple[Dict[Tuple[str, tuple], float], Dict[Tuple[str, tuple], List[float]]]:
+        """Everything collected so far, as (counters, histograms); leaves this registry empty."""
+        with self._lock:
+            out = (dict(self._counters), self._hists)
+            self._counters.clear()
+            self._hists = {}
+        return out
+
+    def merge(self, drained) -> None:
+        """Add what another registry's `drain` returned (same buckets), e.g. a worker process's."""
+        if not self.enabled:
+            return
+        counters, hists = drained
+        with self._lock:
+            for key, value in counters.items():
+                self._counters[key] += value
+            for key, hist in hists.items():
+                mine = self._hists.get(key)
+                if mine is None:
+                    self._hists[key] = list(hist)
+                else:
+                    for i, v in enumerate(hist):
+                        mine[i] += v
+
+    def render(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            hists = sorted((k, list(v)) for k, v in self._hists.items())
+        lines: List[str] = []
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for (name, labels), hist in hists:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0.0
+            for bound, count in zip([*map(str, self.buckets), "+Inf"], hist[:-1]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative:g}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {hist[-1]:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative:g}")
+        return "\n".join(lines) + "\n"
+
+METRICS = Metrics()
+
+def warn(event: str, message: str) -> None:
+    """Print a [warn] line and count it in talentiq_warnings_total{event=...}."""
+    print(f"[warn] {message}")
+    METRICS.inc("talentiq_warnings_total", event=event)
+
+_METRICS_SERVER: Optional[ThreadingHTTPServer] = None
+
+def serve_metrics(port: int = METRICS_PORT, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve METRICS at http://host:port/metrics from a daemon thread (once per process); enables collection."""
+    global _METRICS_SERVER
+    if _METRICS_SERVER is not None:
+        return _METRICS_SERVER
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = METRICS.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    METRICS.enabled = True
+    _METRICS_SERVER = ThreadingHTTPServer((host, port), Handler)
+    _METRICS_SERVER.daemon_threads = True
+    threading.Thread(target=_METRICS_SERVER.serve_forever, name="talentiq-metrics", daemon=True).start()
+    return _METRICS_SERVER
+
+# ===========================
+# 0b) ASYNC LLM TRANSPORT (pooled, retrying, rate limited)
+# ===========================
+LLM_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+LLM_TIMEOUT_S = float(os.getenv("TALENTIQ_LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("TALENTIQ_LLM_RETRIES", "5"))
+LLM_RPM = int(os.getenv("TALENTIQ_LLM_RPM", "500"))
+LLM_TPM = int(os.getenv("TALENTIQ_LLM_TPM", "200000"))
+LLM_MAX_CONCURRENCY = int(os.getenv("TALENTIQ_LLM_CONCURRENCY", "16"))
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+class LLMError(RuntimeError):
+    pass
+
+class _RetryableStatus(Exception):
+    def __init__(self, message: str, retry_after: Optional[str] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+_STREAM_END = object()
+
+class TokenBucket:
+    """Async token bucket holding up to `capacity` units, refilled evenly over `period` seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, n: float = 1.0) -> None:
+        n = min(float(n), self.capacity)  # an oversized request still gets through, alone
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:  # FIFO: later callers queue behind the one waiting
+            while True:
+                self._refill()
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                await asyncio.sleep((n - self.tokens) / self.rate)
+
+    def refund(self, n: float) -> None:
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + n)
+
+def prompt_tokens(messages: List[Dict[str, str]]) -> int:
+    """~4 chars per token plus a little per-message overhead."""
+    return sum(len(m.get("content") or "") for m in messages) // 4 + 4 * len(messages)
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: Optional[int]) -> int:
+    """Rough budget: ~4 chars per prompt token plus the completion allowance."""
+    return prompt_tokens(messages) + (max_tokens or 1000)
+
+class LLMClient:
+    """
+    OpenAI-compatible chat client shared by every LLM call in the app.
+
+    One pooled httpx.AsyncClient lives on a private event-loop thread; `chat()`
+    can be called from any thread (Streamlit, thread pools) and `achat()` from
+    any event loop. Requests are admitted by RPM/TPM token buckets plus a
+    concurrency cap, time out after `timeout` seconds and are retried with
+    exponential backoff + full jitter on timeouts, connection errors, 429 and 5xx
+    (honouring Retry-After). Point `base_url` at a local stand-in server to test.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = LLM_BASE_URL,
+        timeout: float = LLM_TIMEOUT_S,
+        max_retries: int = LLM_MAX_RETRIES,
+        rpm: int = LLM_RPM,
+        tpm: int = LLM_TPM,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 20.0,
+    ):
+        if httpx is None:
+            raise RuntimeError("LLMClient needs httpx. Install httpx.")
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # a forked worker inherits the object but not the loop thread
+            if self._loop is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._loop = asyncio.new_event_loop()
+                self._http = None
+                self._slots = None
+                threading.Thread(target=self._loop.run_forever, name="talentiq-llm", daemon=True).start()
+            return self._loop
+
+    def _session(self):
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+            )
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._http
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(self.backoff_cap, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    async def _request(self, payload: Dict[str, object], send):
+        """Admission control + retry loop around one `send(http, est_tokens)` attempt."""
+        http = self._session()
+        est = estimate_tokens(payload["messages"], payload.get("max_tokens"))
+        last_error = "no attempt made"
+        for attempt in range(self.max_retries + 1):
+            await self.requests.acquire(1)
+            await self.tokens.acquire(est)
+            retry_after = None
+            t0 = time.perf_counter()
+            try:
+                async with self._slots:
+                    result = await send(http, est)
+                METRICS.observe("talentiq_llm_request_seconds", time.perf_counter() - t0)
+                METRICS.inc("talentiq_llm_requests_total", outcome="ok")
+                return result
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+            except _RetryableStatus as e:
+                last_error, retry_after = str(e), e.retry_after
+            except LLMError:
+                METRICS.inc("talentiq_llm_requests_total", outcome="error")
+                raise
+            METRICS.inc("talentiq_llm_requests_total", outcome="retryable")
+            if attempt < self.max_retries:
+                delay = self._backoff(attempt, retry_after)
+                METRICS.inc("talentiq_llm_retries_total")
+                warn("llm_retry", f"LLM request failed ({last_error}); retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        raise LLMError(f"LLM request failed after {self.max_retries + 1} attempts: {last_error}")
+
+    @staticmethod
+    def _count_tokens(usage: Optional[Dict[str, object]], messages: List[Dict[str, str]], completion_chars: int) -> None:
+        """talentiq_llm_tokens_total from the server's usage block, else estimated (~4 chars per token)."""
+        if not METRICS.enabled:
+            return
+        usage = usage or {}
+        if "prompt_tokens" in usage or "completion_tokens" in usage:
+            prompt, completion, source = usage.get("prompt_tokens") or 0, usage.get("completion_tokens") or 0, "usage"
+        else:
+            prompt, completion, source = prompt_tokens(messages), completion_chars // 4, "estimate"
+        METRICS.inc("talentiq_llm_tokens_total", prompt, kind="prompt", source=source)
+        METRICS.inc("talentiq_llm_tokens_total", completion, kind="completion", source=source)
+
+    @staticmethod
+    def _check_status(resp, body: str) -> None:
+        if resp.status_code < 400:
+            return
+        msg = f"HTTP {resp.status_code}: {body[:200]}"
+        if resp.status_code not in RETRYABLE_STATUS:
+            raise LLMError(msg)
+        raise _RetryableStatus(msg, resp.headers.get("retry-after"))
+
+    async def _chat(self, payload: Dict[str, object]) -> Dict[str, object]:
+        async def send(http, est):
+            resp = await http.post("/chat/completions", json=payload)
+            self._check_status(resp, resp.text if resp.status_code >= 400 else "")
+            data = resp.json()
+            used = (data.get("usage") or {}).get("total_tokens")
+            if used is not None and used < est:
+                self.tokens.refund(est - used)
+            if METRICS.enabled:
+                content = ((data.get("choices") or [{}])[0].get("message") or {}).get("content") or ""
+                self._count_tokens(data.get("usage"), payload["messages"], len(content))
+            return data
+
+        return await self._request(payload, send)
+
+    async def _stream(self, payload: Dict[str, object], emit) -> None:
+        """
+        Server-sent-events completion; `emit(text)` gets every content delta.
+        Only failures before the first delta are retried; later ones raise
+        LLMError so the caller can keep what it already received.
+        """
+        async def send(http, est):
+            started = False
+            usage, chars = None, 0
+            try:
+                async with http.stream("POST", "/chat/completions", json=payload) as resp:
+                    if resp.status_code >= 400:
+                        self._check_status(resp, (await resp.aread()).decode("utf-8", "replace"))
+                    async for line in resp.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        chunk = line[5:].strip()
+                        if chunk == "[DONE]":
+                            break
+                        event = json.loads(chunk)
+                        usage = event.get("usage") or usage
+                        choices = event.get("choices") or [{}]
+                        delta = (choices[0].get("delta") or {}).get("content")
+                        if delta:
+                            started = True
+                            chars += len(delta)
+                            emit(delta)
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                if started:
+                    raise LLMError(f"stream interrupted: {type(e).__name__}: {e}") from e
+                raise
+            self._count_tokens(usage, payload["messages"], chars)
+
+        try:
+            await self._request(payload, send)
+        finally:
+            emit(_STREAM_END)
+
+    async def achat(self, messages: List[Dict[str, str]], model: Optional[str] = None, **params) -> Dict[str, object]:
+        payload = {"model": model or LLM_MODEL, "messages": messages, **params}
+        fut = asyncio.run_coroutine_threadsafe(self._chat(payload), self._ensure_loop())
+        return await asyncio.wrap_future(fut)
+
+    def chat(self, messages: List[Dict[str, str]], model: Optional[str] = None, **params) -> Dict[str, object]:
+        payload = {"model": model or LLM_MODEL, "messages": messages, **params}
+        fut = asyncio.run_coroutine_threadsafe(self._chat(payload), self._ensure_loop())
+        return fut.result()
+
+    def stream_chat(self, messages: List[Dict[str, str]], model: Optional[str] = None, **params) -> Iterator[str]:
+        """Yield content deltas of a streamed completion (callable from any thread)."""
+        payload = {"model": model or LLM_MODEL, "messages": messages, "stream": True, **params}
+        deltas: "queue.Queue[object]" = queue.Queue()
+        fut = asyncio.run_coroutine_threadsafe(self._stream(payload, deltas.put), self._ensure_loop())
+        while True:
+            item = deltas.get()
+            if item is _STREAM_END:
+                break
+            yield item
+        fut.result()  # surface the error, if the stream ended with one
+
+    def close(self) -> None:
+        if self._loop is not None and self._http is not None and self._pid == os.getpid():
+            asyncio.run_coroutine_threadsafe(self._http.aclose(), self._loop).result()
+            self._http = None
+
+_LLM_CLIENT: Optional[LLMClient] = None
+_LLM_CLIENT_LOCK = threading.Lock()
+
+def get_llm_client() -> Optional[LLMClient]:
+    """Process-wide client, or None when httpx isn't installed."""
+    global _LLM_CLIENT
+    if httpx is None:
+        return None
+    with _LLM_CLIENT_LOCK:
+        if _LLM_CLIENT is None:
+            _LLM_CLIENT = LLMClient(api_key=getattr(openai, "api_key", "") or "")
+        return _LLM_CLIENT
+
+def llm_chat(messages: List[Dict[str, str]], temperature: float = 0, **params) -> Dict[str, object]:
+    """Chat completion through the shared client (legacy openai SDK if httpx is missing)."""
+    client = get_llm_client()
+    if client is not None:
+        return client.chat(messages, temperature=temperature, **params)
+    return openai.ChatCompletion.create(model=LLM_MODEL, messages=messages, temperature=temperature, **params)
+
+def llm_chat_stream(messages: List[Dict[str, str]], temperature: float = 0, **params) -> Iterator[str]:
+    """Streamed chat completion as content deltas (same transports as `llm_chat`)."""
+    client = get_llm_client()
+    if client is not None:
+        yield from client.stream_chat(messages, temperature=temperature, **params)
+        return
+    chunks = openai.ChatCompletion.create(
+        model=LLM_MODEL, messages=messages, temperature=temperature, stream=True, **params
+    )
+    for chunk in chunks:
+        delta = chunk["choices"][0].get("delta", {}).get("content")
+        if delta:
+            yield delta
+
 # ===========================
 # 1) PDF TEXT LOADER
 # ===========================
+PDF_EXTRACTOR_VERSION = "pdf-v2"
+MAX_RESUME_CHARS = 16000  # resume text sent to the LLM; regex parsing and scoring read all of it
+MAX_PDF_PAGES = int(os.getenv("TALENTIQ_MAX_PDF_PAGES", "12"))
+LARGE_PDF_BYTES = 2 * 1024 * 1024  # above this, extract in a worker process
+PDF_TIMEOUT_S = 60.0
+
+@dataclass
+class PdfExtraction:
+    text: str
+    backend: str        # "pdfminer", "pypdf2" or "cache"
+    pages: int
+    seconds: float
+    truncated: bool = False
+
+def _pdfminer_pages(data: bytes, max_pages: int) -> Iterator[str]:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+    for page in extract_pages(io.BytesIO(data), maxpages=max_pages):
+        yield "".join(el.get_text() for el in page if isinstance(el, LTTextContainer))
+
+def _pypdf2_pages(data: bytes, max_pages: int) -> Iterator[str]:
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    for i, page in enumerate(reader.pages):
+        if i >= max_pages:
+            break
+        yield page.extract_text() or ""
+
+PDF_BACKENDS = (("pdfminer", _pdfminer_pages), ("pypdf2", _pypdf2_pages))
+
+def iter_pdf_pages(data: bytes, max_pages: int = MAX_PDF_PAGES) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (backend, page_text) for the first `max_pages` pages of an in-memory PDF.
+    If a backend fails (or isn't installed), the next one picks up at the page
+    where it stopped.
+    """
+    done = 0
+    errors = []
+    for name, pages in PDF_BACKENDS:
+        try:
+            for i, text in enumerate(pages(data, max_pages)):
+                if i < done:
+                    continue
+                done += 1
+                yield name, text
+            return
+        except Exception as e:
+            errors.append(f"{name}: {type(e).__name__}: {e}")
+            warn("pdf_backend", f"PDF backend {name} failed after {done} page(s): {e}")
+    if done == 0:
+        raise RuntimeError(
+            "Unable to extract text from PDF. Install pdfminer.six or PyPDF2. (" + "; ".join(errors) + ")"
+        )
+
+def extract_pdf_text(data: bytes, max_pages: int = MAX_PDF_PAGES, max_chars: Optional[int] = None) -> PdfExtraction:
+    """Page-by-page extraction that stops after `max_pages`, or as soon as `max_chars` are collected if given."""
+    t0 = time.perf_counter()
+    parts: List[str] = []
+    backend, n_chars, n_pages, truncated = "none", 0, 0, False
+    pages = iter_pdf_pages(data, max_pages)
+    try:
+        for backend, text in pages:
+            parts.append(text)
+            n_pages += 1
+            n_chars += len(text) + 1
+            if max_chars is not None and n_chars >= max_chars:
+                truncated = True
+                break
+    finally:
+        pages.close()
+    text = "\n".join(parts)[:max_chars] if max_chars is not None else "\n".join(parts)
+    return PdfExtraction(text, backend, n_pages, time.perf_counter() - t0, truncated)
+
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_PDF_POOL_LOCK = threading.Lock()
+
+def _pdf_pool() -> ProcessPoolExecutor:
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            _PDF_POOL = ProcessPoolExecutor(max_workers=max(1, min(4, (os.cpu_count() or 2) // 2)), mp_context=_mp_context())
+        return _PDF_POOL
+
+def _kill_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop `pool` and kill its workers: shutdown() alone leaves a worker stuck in a
+    pathological PDF running. Extractions in flight elsewhere get BrokenProcessPool.
+    """
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is pool:
+            _PDF_POOL = None
+    procs = list((getattr(pool, "_processes", None) or {}).values())  # shutdown() clears it
+    pool.shutdown(wait=False, cancel_futures=True)
+    for proc in procs:
+        proc.kill()
+
+def _extract_in_worker(data: bytes, max_pages: int, max_chars: Optional[int]) -> PdfExtraction:
+    """extract_pdf_text in the PDF pool, bounded by PDF_TIMEOUT_S."""
+    for attempt in range(2):
+        pool = _pdf_pool()
+        fut = pool.submit(_picklable(extract_pdf_text), data, max_pages, max_chars)
+        try:
+            return fut.result(timeout=PDF_TIMEOUT_S)
+        except FuturesTimeout:
+            warn("pdf_timeout", f"PDF extraction gave up after {PDF_TIMEOUT_S:g}s; restarting the PDF worker pool")
+            _kill_pdf_pool(pool)
+            raise TimeoutError(f"PDF extraction took longer than {PDF_TIMEOUT_S:g}s") from None
+        except BrokenProcessPool:
+            if attempt:
+                raise
+            _kill_pdf_pool(pool)  # killed by another caller's timeout: once more on a fresh pool
+
+@METRICS.timed("load_pdf_bytes")
+def load_pdf_bytes(data: bytes, max_pages: int = MAX_PDF_PAGES, max_chars: Optional[int] = None) -> PdfExtraction:
+    """
+    Extract text from PDF bytes without touching disk. Results are cached by
+    content (see ResumeCache); large files are parsed in a worker process so a
+    huge scanned CV can't hold the caller for longer than PDF_TIMEOUT_S.
+    """
+    t0 = time.perf_counter()
+    cache = get_resume_cache()
+    key = content_key(data, "pdf-text", PDF_EXTRACTOR_VERSION, str(max_pages), str(max_chars))
+    if cache is not None:
+        hit = cache.get(key)
+        METRICS.inc("talentiq_cache_lookups_total", kind="pdf-text", result="miss" if hit is None else "hit")
+        if hit is not None:
+            return PdfExtraction(hit, "cache", 0, time.perf_counter() - t0)
+    if len(data) > LARGE_PDF_BYTES:
+        result = _extract_in_worker(data, max_pages, max_chars)
+    else:
+        result = extract_pdf_text(data, max_pages, max_chars)
+    if cache is not None:
+        cache.put(key, result.text, kind="pdf-text")
+    return result
+
 def load_pdf_text(path: str) -> str:
     """
     Minimal PDF text extraction using pdfminer.six if available.
     Falls back to PyPDF2 if pdfminer isn't installed.
     """
-    try:
-        from pdfminer.high_level import extract_text
-        return extract_text(path) or ""
-    except Exception:
-        try:
-            import PyPDF2
-            txt = []
-            with open(path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for p in reader.pages:
-                    t = p.extract_text() or ""
-                    txt.append(t)
-            return "\n".join(txt)
-        except Exception as e:
-            raise RuntimeError(
-                "Unable to extract text from PDF. Install pdfminer.six or PyPDF2."
-            ) from e
+    return load_pdf_bytes(Path(path).read_bytes()).text
 
 # ============================================================
 # 2) JD → CONFIG (role, weights, taxonomy, aliases)
@@ -121,26 +738,64 @@ ROLE_HINTS = {
     "product": ["product manager", "product management", "discovery", "roadmap", "backlog", "stakeholder", "analytics", "mixpanel", "amplitude"],
 }
 
+# every phrase config derivation counts in a JD: role hints + default taxonomy skills
+JD_TERMS = frozenset(h.lower() for hints in ROLE_HINTS.values() for h in hints) | frozenset(
+    s.lower() for areas in DEFAULT_TAXONOMY.values() for skills in areas.values() for s in skills
+)
+JD_CONFIG_CACHE_SIZE = int(os.getenv("TALENTIQ_JD_CACHE_SIZE", "128"))
+
 def _tokenize_lower(text: str) -> List[str]:
     return re.findall(r"[a-z0-9\.\+#/\-]+", text.lower())
 
-def infer_role(jd_text: str) -> str:
-    t = jd_text.lower()
+@dataclass(frozen=True)
+class JDAnalysis:
+    """
+    One pass over a JD: occurrence count of every JD_TERMS phrase (same numbers as
+    `lowered.count(term)`; absent terms are left out) and the set of its tokens.
+    """
+    counts: Dict[str, int]
+    tokens: frozenset
+
+@lru_cache(maxsize=4096)
+def _analyze_jd_line(line: str) -> Tuple[Tuple[Tuple[str, int], ...], Tuple[str, ...]]:
+    hits = skill_matcher(JD_TERMS).find(line)
+    return tuple((term, len(spans)) for term, spans in hits.items()), tuple(_tokenize_lower(line))
+
+def analyze_jd(jd_text: str) -> JDAnalysis:
+    """
+    Count all role hints and taxonomy terms in one matcher scan. No term spans a
+    newline, so counts add up line by line; lines are cached, and editing a JD
+    only rescans the lines that changed.
+    """
+    counts: Dict[str, int] = defaultdict(int)
+    tokens = set()
+    for line in jd_text.lower().split("\n"):
+        line_counts, line_tokens = _analyze_jd_line(line)
+        for term, n in line_counts:
+            counts[term] += n
+        tokens.update(line_tokens)
+    return JDAnalysis(counts=dict(counts), tokens=frozenset(tokens))
+
+def jd_fingerprint(jd_text: str) -> str:
+    """Hash of a JD as config derivation sees it: case and surrounding whitespace don't matter."""
+    return hashlib.sha256(jd_text.lower().strip().encode("utf-8")).hexdigest()
+
+def infer_role(jd_text: str, analysis: Optional[JDAnalysis] = None) -> str:
+    counts = (analysis or analyze_jd(jd_text)).counts
     scores = {}
     for role, hints in ROLE_HINTS.items():
-        scores[role] = sum(t.count(h) for h in hints)
+        scores[role] = sum(counts.get(h, 0) for h in hints)
     role = max(scores.items(), key=lambda kv: kv[1])[0]
     if all(v == 0 for v in scores.values()):
         role = "frontend"
     return role
 
-def _area_hit_counts(role: str, jd_text: str, taxonomy: Dict[str, Dict[str, List[str]]]) -> Dict[str, int]:
-    t = jd_text.lower()
+def _area_hit_counts(role: str, analysis: JDAnalysis, taxonomy: Dict[str, Dict[str, List[str]]]) -> Dict[str, int]:
     counts = {}
     for area, skills in taxonomy[role].items():
         c = 0
         for s in skills:
-            c += t.count(s.lower())
+            c += analysis.counts.get(s.lower(), 0)
         counts[area] = c
     return counts
 
@@ -155,9 +810,9 @@ def _normalize_weights(counts: Dict[str, int], default: Dict[str, float], blend:
     s = sum(mixed.values()) or 1.0
     return {k: v / s for k, v in mixed.items()}
 
-def _expand_aliases_from_jd(jd_text: str, base_aliases: Dict[str, List[str]]) -> Dict[str, List[str]]:
+def _expand_aliases_from_jd(analysis: JDAnalysis, base_aliases: Dict[str, List[str]]) -> Dict[str, List[str]]:
     aliases = {k.lower(): list({*v}) for k, v in base_aliases.items()}
-    toks = set(_tokenize_lower(jd_text))
+    toks = set(analysis.tokens)
 
     def add_alias(canon: str, *candidates: str):
         canon = canon.lower()
@@ -192,11 +847,10 @@ def _expand_aliases_from_jd(jd_text: str, base_aliases: Dict[str, List[str]]) ->
         aliases[k] = sorted(list({a.lower() for a in aliases[k] if a.strip()}))
     return aliases
 
-def _focus_taxonomy(role: str, jd_text: str, taxonomy: Dict[str, Dict[str, List[str]]], keep_at_least: int = 2) -> Dict[str, Dict[str, List[str]]]:
-    t = jd_text.lower()
+def _focus_taxonomy(role: str, analysis: JDAnalysis, taxonomy: Dict[str, Dict[str, List[str]]], keep_at_least: int = 2) -> Dict[str, Dict[str, List[str]]]:
     focused: Dict[str, Dict[str, List[str]]] = {role: {}}
     for area, skills in taxonomy[role].items():
-        hits = [s for s in skills if s.lower() in t]
+        hits = [s for s in skills if analysis.counts.get(s.lower(), 0) > 0]
         if len(hits) >= keep_at_least:
             focused[role][area] = sorted(list({*hits}))
         else:
@@ -204,22 +858,44 @@ def _focus_taxonomy(role: str, jd_text: str, taxonomy: Dict[str, Dict[str, List[
             focused[role][area] = sorted(list({*hits, *extras}))
     return focused
 
+@METRICS.timed("config_from_jd")
 def config_from_jd(jd_text: str) -> Tuple[str, Dict[str, Dict[str, float]], Dict[str, Dict[str, List[str]]], Dict[str, List[str]]]:
-    role = infer_role(jd_text)
-    counts = _area_hit_counts(role, jd_text, DEFAULT_TAXONOMY)
+    analysis = analyze_jd(jd_text)
+    role = infer_role(jd_text, analysis)
+    counts = _area_hit_counts(role, analysis, DEFAULT_TAXONOMY)
     role_weights = DEFAULT_ROLE_WEIGHTS[role]
     derived_weights = _normalize_weights(counts, role_weights, blend=0.6)
-    focused_tax = _focus_taxonomy(role, jd_text, DEFAULT_TAXONOMY, keep_at_least=2)
-    aliases = _expand_aliases_from_jd(jd_text, DEFAULT_ALIASES)
+    focused_tax = _focus_taxonomy(role, analysis, DEFAULT_TAXONOMY, keep_at_least=2)
+    aliases = _expand_aliases_from_jd(analysis, DEFAULT_ALIASES)
     final_role_weights = {role: derived_weights}
     final_taxonomy = focused_tax
     final_aliases = aliases
     return role, final_role_weights, final_taxonomy, final_aliases
 
-# Current run-time config (will be overwritten per JD)
-ROLE_WEIGHTS: Dict[str, Dict[str, float]] = DEFAULT_ROLE_WEIGHTS.copy()
-TAXONOMY: Dict[str, Dict[str, List[str]]] = DEFAULT_TAXONOMY.copy()
-ALIASES = DEFAULT_ALIASES.copy()
+_JD_CONFIGS: "OrderedDict[Tuple[str, str], ScoringConfig]" = OrderedDict()
+_JD_CONFIGS_LOCK = threading.Lock()
+
+def resolve_config(role_choice: str, jd_text: str) -> "ScoringConfig":
+    """
+    Run-time config for a role choice: "auto" derives everything from the JD,
+    a fixed role uses the defaults. Memoized (LRU) by role choice + `jd_fingerprint`,
+    so reruns on an unchanged JD return the same config (and its Canonicalizer).
+    """
+    key = (role_choice, jd_fingerprint(jd_text) if role_choice == "auto" else "")
+    with _JD_CONFIGS_LOCK:
+        config = _JD_CONFIGS.get(key)
+        if config is not None:
+            _JD_CONFIGS.move_to_end(key)
+            return config
+    if role_choice == "auto":
+        config = ScoringConfig.create(*config_from_jd(jd_text))
+    else:
+        config = ScoringConfig.create(role_choice, DEFAULT_ROLE_WEIGHTS, DEFAULT_TAXONOMY, DEFAULT_ALIASES)
+    with _JD_CONFIGS_LOCK:
+        _JD_CONFIGS[key] = config
+        while len(_JD_CONFIGS) > JD_CONFIG_CACHE_SIZE:
+            _JD_CONFIGS.popitem(last=False)
+    return config
 
 # ===========================
 # 3) SCORING DATA STRUCTURES
@@ -233,15 +909,20 @@ THETA = {
 
 NEGATIONS = ["no ", "not ", "without ", "lack of ", "beginner", "basic", "exposed to", "familiarity with"]
 
-@dataclass
+@dataclass(slots=True)
 class SkillItem:
     name: str
     level_hint: str = "intermediate"
     last_used: Optional[str] = None
     years_hint: Optional[float] = None
     evidence_snippets: List[str] = field(default_factory=list)
+    evidence_spans: List[Tuple[int, int]] = field(default_factory=list)  # regex matches in raw_text.lower()
 
-@dataclass
+    @property
+    def evidence_count(self) -> int:
+        return len(self.evidence_snippets) + len(self.evidence_spans)
+
+@dataclass(slots=True)
 class ResumeStruct:
     identity: Dict[str, List[str]]
     roles: List[Dict[str, Optional[str]]]
@@ -262,19 +943,377 @@ class Canonicalizer:
         t = token.strip().lower()
         return self.alias2canon.get(t, t)
 
+@lru_cache(maxsize=32)
+def canonicalizer(aliases: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Canonicalizer:
+    """Canonicalizer per (frozen) alias table; configs with the same aliases share one."""
+    return Canonicalizer(dict(aliases))
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    """
+    Run-time config for one JD (role, weights, taxonomy, aliases, theta), frozen
+    into nested tuples. Immutable and hashable, so it is passed explicitly through
+    extraction and scoring (safe across sessions and worker threads/processes)
+    and can key caches. Build with `create` / `resolve_config`.
+    """
+    role: str
+    role_weights: Tuple[Tuple[str, Tuple[Tuple[str, float], ...]], ...]
+    taxonomy: Tuple[Tuple[str, Tuple[Tuple[str, Tuple[str, ...]], ...]], ...]
+    aliases: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    theta: Tuple[Tuple[str, Tuple[Tuple[str, float], ...]], ...]
+
+    @classmethod
+    def create(
+        cls,
+        role: str,
+        role_weights: Dict[str, Dict[str, float]],
+        taxonomy: Dict[str, Dict[str, List[str]]],
+        aliases: Dict[str, List[str]],
+        theta: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> "ScoringConfig":
+        theta = THETA if theta is None else theta
+        return cls(
+            role=role,
+            role_weights=tuple((r, tuple(ws.items())) for r, ws in role_weights.items()),
+            taxonomy=tuple((r, tuple((a, tuple(sk)) for a, sk in areas.items())) for r, areas in taxonomy.items()),
+            aliases=tuple((c, tuple(al)) for c, al in aliases.items()),
+            theta=tuple((r, tuple(th.items())) for r, th in theta.items()),
+        )
+
+    def weights_for(self, role: str) -> Dict[str, float]:
+        return dict(dict(self.role_weights)[role])
+
+    def areas_for(self, role: str) -> Dict[str, List[str]]:
+        return {area: list(skills) for area, skills in dict(self.taxonomy)[role]}
+
+    def theta_for(self, role: str) -> Dict[str, float]:
+        return dict(dict(self.theta)[role])
+
+    @cached_property
+    def terms(self) -> frozenset:
+        """Every taxonomy skill (all roles), lowercased: what the regex parser looks for."""
+        return frozenset(s.lower() for _, areas in self.taxonomy for _, skills in areas for s in skills)
+
+    @cached_property
+    def alias_terms(self) -> frozenset:
+        """`terms` plus every alias spelling, lowercased: what an LLM parse may map onto a taxonomy skill."""
+        return self.terms | frozenset(self.canon.alias2canon)
+
+    @property
+    def canon(self) -> Canonicalizer:
+        return canonicalizer(self.aliases)
+
 # ===========================
-# 4) LLM EXTRACTORS
+# 3b) PARSE CACHE (content-addressed, on disk)
 # ===========================
-def llm_extract_resume(pdf_text: str, enabled: bool) -> Optional[ResumeStruct]:
+LLM_MODEL = "gpt-4o-mini"
+RESUME_PROMPT_VERSION = "resume-v2"  # bump whenever the resume parsing prompts change
+BATCH_PROMPT_VERSION = "batch-v1"    # bump whenever the multi-resume wrapper (BATCH_RESUME_PROMPT) changes
+
+CACHE_DIR = Path(os.getenv("TALENTIQ_CACHE_DIR", str(Path.home() / ".cache" / "talentiq")))
+CACHE_MAX_BYTES = int(os.getenv("TALENTIQ_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHE_ENABLED = os.getenv("TALENTIQ_CACHE", "1") != "0"
+
+def content_key(data: bytes, *parts: str) -> str:
+    """sha256 over the content plus whatever else the cached value depends on."""
+    h = hashlib.sha256(data)
+    for part in parts:
+        h.update(b"\0" + part.encode("utf-8"))
+    return h.hexdigest()
+
+def struct_to_json(rs: ResumeStruct) -> str:
+    return json.dumps(asdict(rs), ensure_ascii=False)
+
+def struct_from_json(raw: str) -> ResumeStruct:
+    data = json.loads(raw)
+    data["skills"] = [SkillItem(**s) for s in data.get("skills", [])]
+    for sk in data["skills"]:
+        sk.evidence_spans = [tuple(span) for span in sk.evidence_spans]
+    return ResumeStruct(**data)
+
+class ResumeCache:
     """
-    LLM resume parser. If `enabled` is False or LLM not configured, returns None.
+    Content-addressed key/value store on SQLite, bounded by total value size.
+    Least recently used entries are evicted first. Safe to share between threads
+    and processes (one short-lived connection per operation).
     """
-    if not enabled or not LLM_ENABLED:
-        return None
-    if not pdf_text or len(pdf_text.strip()) < 50:
+
+    def __init__(self, path: Path, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, kind TEXT NOT NULL, value TEXT NOT NULL,"
+                " size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_used)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with self._connect() as db:
+                row = db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                db.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+                return row[0]
+        except sqlite3.Error as e:
+            warn("cache_read", f"resume cache read failed: {e}")
+            return None
+
+    def put(self, key: str, value: str, kind: str = "struct") -> None:
+        size = len(value.encode("utf-8"))
+        try:
+            with self._connect() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO entries (key, kind, value, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, kind, value, size, time.time()),
+                )
+                self._evict(db)
+        except sqlite3.Error as e:
+            warn("cache_write", f"resume cache write failed: {e}")
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall():
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def invalidate(self, key: Optional[str] = None, kind: Optional[str] = None) -> int:
+        """Drop one key, every entry of one kind, or (no arguments) everything."""
+        with self._connect() as db:
+            if key is not None:
+                cur = db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            elif kind is not None:
+                cur = db.execute("DELETE FROM entries WHERE kind = ?", (kind,))
+            else:
+                cur = db.execute("DELETE FROM entries")
+            return cur.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as db:
+            n, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": n, "bytes": total, "max_bytes": self.max_bytes}
+
+_RESUME_CACHE: Optional[ResumeCache] = None
+_RESUME_CACHE_LOCK = threading.Lock()
+
+def get_resume_cache() -> Optional[ResumeCache]:
+    """Process-wide cache, or None when disabled (TALENTIQ_CACHE=0) or unusable."""
+    global _RESUME_CACHE, CACHE_ENABLED
+    if not CACHE_ENABLED:
         return None
+    with _RESUME_CACHE_LOCK:
+        if _RESUME_CACHE is None:
+            try:
+                _RESUME_CACHE = ResumeCache(CACHE_DIR / "resume_cache.sqlite3")
+            except (OSError, sqlite3.Error) as e:
+                warn("cache_disabled", f"resume cache disabled: {e}")
+                CACHE_ENABLED = False
+        return _RESUME_CACHE
+
+def llm_cache_key(pdf_text: str, batch: bool = False) -> str:
+    """Parse cache key; single and batched parses come from different prompts and never share a key."""
+    parts = ("llm", LLM_MODEL, RESUME_PROMPT_VERSION) + ((BATCH_PROMPT_VERSION,) if batch else ())
+    return content_key(pdf_text.encode("utf-8"), *parts)
 
-    system_prompt = """
+# ===========================
+# 3c) COMPACT RESUMES (interned ids, offset snippets, typed arrays)
+# ===========================
+class Interner:
+    """Thread-safe string <-> small int table, shared by every resume in the process. Id 0 is None."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._strs: List[Optional[str]] = [None]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._strs) - 1
+
+    def intern(self, s: Optional[str]) -> int:
+        if s is None:
+            return 0
+        i = self._ids.get(s)
+        if i is None:
+            with self._lock:
+                i = self._ids.get(s)
+                if i is None:
+                    i = self._ids[s] = len(self._strs)
+                    self._strs.append(s)
+        return i
+
+    def lookup(self, i: int) -> Optional[str]:
+        return self._strs[i]
+
+SKILL_IDS = Interner()  # canonical skill names
+LABEL_IDS = Interner()  # level hints and last-used dates
+
+SNIP_TEXT, SNIP_WINDOW = 0, 1  # snippet = text[s:e] | "…" + text[s:e] lowercased, newlines flattened + "…"
+SNIP_MATCH = 2                 # an evidence_spans entry: regex match offsets in the lowered raw text
+
+def _window_snippet(text: str, start: int, end: int) -> str:
+    return "…" + text[start:end].lower().replace("\n", " ") + "…"
+
+@dataclass(slots=True, eq=False)
+class CompactResume:
+    """
+    A parsed resume packed for keeping many candidates resident (UI re-ranking,
+    the candidate pool): skill names and labels are interned ids, per-skill
+    fields live in typed arrays, and evidence snippets are (start, end) offsets
+    into `text` - the raw resume text, followed by any parser snippets that do
+    not occur in it. `depths` and `penalty` are precomputed, so scoring never
+    touches snippet text; `to_struct()` rebuilds the ResumeStruct for one
+    candidate's details view. Build with `from_struct`.
+    """
+    text: str
+    text_len: int          # text[:text_len] is the raw resume text
+    skills: array          # 'I' SKILL_IDS, one per SkillItem, in order
+    levels: array          # 'I' LABEL_IDS of level_hint
+    last_used: array       # 'I' LABEL_IDS, 0 = None
+    years: array           # 'd' years_hint, NaN = None
+    depths: array          # 'd' depth() per skill
+    snip_at: array         # 'I' skill i's evidence is spans snip_at[i]:snip_at[i + 1]
+    spans: array           # 'I' start, end pairs into `text` (its lowered form for SNIP_MATCH)
+    span_kind: array       # 'B' SNIP_TEXT | SNIP_WINDOW | SNIP_MATCH per span
+    penalty: float         # negation_penalty of the raw text
+    meta: tuple            # (identity, roles, tools, education) as parsed
+
+    @classmethod
+    def from_struct(cls, rs: ResumeStruct) -> "CompactResume":
+        raw = rs.raw_text or ""
+        extra: List[str] = []
+        size = len(raw)
+        flat: Optional[str] = None
+        skills, levels, last_used = array("I"), array("I"), array("I")
+        years, depths = array("d"), array("d")
+        snip_at, spans, kinds = array("I", [0]), array("I"), array("B")
+        for sk in rs.skills:
+            skills.append(SKILL_IDS.intern(sk.name))
+            levels.append(LABEL_IDS.intern(sk.level_hint))
+            last_used.append(LABEL_IDS.intern(sk.last_used))
+            y = sk.years_hint
+            years.append(float(y) if isinstance(y, (int, float)) and not isinstance(y, bool) else math.nan)
+            depths.append(depth(sk))
+            for snip in sk.evidence_snippets:
+                snip = str(snip)
+                at = raw.find(snip)
+                if at >= 0:
+                    spans.extend((at, at + len(snip)))
+                    kinds.append(SNIP_TEXT)
+                    continue
+                if len(snip) >= 2 and snip[0] == snip[-1] == "…":
+                    # regex parser window: "…" + lowered[s:e] with newlines flattened + "…"
+                    if flat is None:
+                        flat = raw.lower().replace("\n", " ")
+                    at = flat.find(snip[1:-1]) if len(flat) == len(raw) else -1
+                    if at >= 0 and _window_snippet(raw, at, at + len(snip) - 2) == snip:
+                        spans.extend((at, at + len(snip) - 2))
+                        kinds.append(SNIP_WINDOW)
+                        continue
+                extra.append(snip)
+                spans.extend((size, size + len(snip)))
+                kinds.append(SNIP_TEXT)
+                size += len(snip)
+            for start, end in sk.evidence_spans:
+                spans.extend((start, end))
+                kinds.append(SNIP_MATCH)
+            snip_at.append(len(kinds))
+        return cls(
+            text=raw + "".join(extra) if extra else raw,
+            text_len=len(raw),
+            skills=skills,
+            levels=levels,
+            last_used=last_used,
+            years=years,
+            depths=depths,
+            snip_at=snip_at,
+            spans=spans,
+            span_kind=kinds,
+            penalty=negation_penalty(raw),
+            meta=(rs.identity, rs.roles, rs.tools, rs.education),
+        )
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    @property
+    def raw_text(self) -> str:
+        return self.text if self.text_len == len(self.text) else self.text[:self.text_len]
+
+    def skill_names(self) -> List[str]:
+        return [SKILL_IDS.lookup(i) for i in self.skills]
+
+    def skill_keys(self) -> List[str]:
+        """Lowercased skill names, as scoring matches them against the taxonomy."""
+        return [SKILL_IDS.lookup(i).lower() for i in self.skills]
+
+    def _evidence(self, i: int, kinds) -> List[Tuple[int, int, int]]:
+        return [
+            (self.span_kind[k], self.spans[2 * k], self.spans[2 * k + 1])
+            for k in range(self.snip_at[i], self.snip_at[i + 1])
+            if self.span_kind[k] in kinds
+        ]
+
+    def snippets(self, i: int) -> List[str]:
+        """Evidence snippets of skill i as stored on the SkillItem, materialized from their offsets."""
+        return [
+            _window_snippet(self.text, start, end) if kind == SNIP_WINDOW else self.text[start:end]
+            for kind, start, end in self._evidence(i, (SNIP_TEXT, SNIP_WINDOW))
+        ]
+
+    def match_spans(self, i: int) -> List[Tuple[int, int]]:
+        return [(start, end) for _, start, end in self._evidence(i, (SNIP_MATCH,))]
+
+    def to_struct(self) -> ResumeStruct:
+        identity, roles, tools, education = self.meta
+        skills = [
+            SkillItem(
+                name=SKILL_IDS.lookup(self.skills[i]),
+                level_hint=LABEL_IDS.lookup(self.levels[i]),
+                last_used=LABEL_IDS.lookup(self.last_used[i]),
+                years_hint=None if math.isnan(self.years[i]) else self.years[i],
+                evidence_snippets=self.snippets(i),
+                evidence_spans=self.match_spans(i),
+            )
+            for i in range(len(self.skills))
+        ]
+        return ResumeStruct(identity=identity, roles=roles, skills=skills, tools=tools, education=education, raw_text=self.raw_text)
+
+    def __getstate__(self):
+        # ids are only meaningful inside this process: pickle the strings, re-intern on load
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["skills"] = self.skill_names()
+        state["levels"] = [LABEL_IDS.lookup(i) for i in self.levels]
+        state["last_used"] = [LABEL_IDS.lookup(i) for i in self.last_used]
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        state["skills"] = array("I", map(SKILL_IDS.intern, state["skills"]))
+        state["levels"] = array("I", map(LABEL_IDS.intern, state["levels"]))
+        state["last_used"] = array("I", map(LABEL_IDS.intern, state["last_used"]))
+        for name, value in state.items():
+            setattr(self, name, value)
+
+ParsedResume = Union[ResumeStruct, CompactResume]
+
+def as_struct(resume: ParsedResume) -> ResumeStruct:
+    return resume.to_struct() if isinstance(resume, CompactResume) else resume
+
+# ===========================
+# 4) LLM EXTRACTORS
+# ===========================
+RESUME_SCHEMA_PROMPT = """
 You are a resume parser for a hiring scoring engine.
 Return STRICT JSON with this schema:
 
@@ -315,80 +1354,494 @@ Only JSON, no explanation.
 If unsure, make best-effort guesses.
 """.strip()
 
+BATCH_RESUME_PROMPT = RESUME_SCHEMA_PROMPT + """
+
+You will receive SEVERAL resumes, each wrapped as
+<<<RESUME id=N>>>
+...
+<<<END id=N>>>
+Return STRICT JSON: an array with exactly one object per resume, each being the
+schema above plus an "id" field holding that resume's N as a string.
+""".rstrip()
+
+def _skill_from_llm(s: Dict[str, object]) -> SkillItem:
+    return SkillItem(
+        name=s.get("name", "").strip(),
+        level_hint=s.get("level_hint", "intermediate"),
+        last_used=s.get("last_used"),
+        years_hint=s.get("years_hint"),
+        evidence_snippets=list(s.get("evidence_snippets") or [])[:3],
+    )
+
+def _safe_skill(s: object) -> Optional[SkillItem]:
+    """SkillItem for one LLM skill entry, or None if the entry is malformed (e.g. no name)."""
+    try:
+        skill = _skill_from_llm(s)
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return skill if skill.name else None
+
+def _struct_from_llm_data(data: object, pdf_text: str) -> Optional[ResumeStruct]:
+    """
+    ResumeStruct from a parsed LLM document. Malformed entries are skipped and the
+    rest kept; None if the document is not an object, or none of its skills survive.
+    """
+    if not isinstance(data, dict):
+        return None
+    identity = data.get("identity", {"name": ["Unknown"], "emails": []})
+    roles = data.get("roles", [])
+    education = data.get("education", [])
+    skills_raw = data.get("skills") or []
+    if not isinstance(skills_raw, list):
+        skills_raw = [skills_raw]
+
+    skills: List[SkillItem] = [sk for sk in map(_safe_skill, skills_raw) if sk is not None]
+    if len(skills) < len(skills_raw):
+        if not skills:
+            return None
+        warn("llm_skill_dropped", f"LLM resume parse: skipped {len(skills_raw) - len(skills)} malformed skill(s)")
+
+    return ResumeStruct(
+        identity=identity,
+        roles=roles,
+        skills=skills,
+        education=education,
+        raw_text=pdf_text,
+    )
+
+def _cached_llm_struct(pdf_text: str) -> Optional[ResumeStruct]:
+    """A parse by either current prompt (single first); entries from older prompt versions are never read."""
+    cache = get_resume_cache()
+    if cache is None:
+        return None
+    hit = cache.get(llm_cache_key(pdf_text))
+    if hit is None:
+        hit = cache.get(llm_cache_key(pdf_text, batch=True))
+    METRICS.inc("talentiq_cache_lookups_total", kind="llm", result="miss" if hit is None else "hit")
+    if hit is None:
+        return None
+    parsed = struct_from_json(hit)
+    parsed.raw_text = pdf_text
+    return parsed
+
+def _store_llm_struct(pdf_text: str, parsed: ResumeStruct, batch: bool = False) -> None:
+    cache = get_resume_cache()
+    if cache is not None:
+        # raw_text is the key's own content; don't store it twice
+        cache.put(
+            llm_cache_key(pdf_text, batch), struct_to_json(replace(parsed, raw_text="")),
+            kind="llm-batch" if batch else "llm",
+        )
+
+LLM_STREAMING = os.getenv("TALENTIQ_LLM_STREAM", "1") != "0"
+
+class ResumeStreamParser:
+    """
+    Incremental scanner for a streamed resume-schema JSON completion.
+
+    `feed(delta)` returns the objects that became complete in that delta, as
+    ("identity", dict), ("role", dict), ("skill", SkillItem) or ("education", dict).
+    `result()` returns (data, complete): the full document when it parses, else
+    whatever complete pieces arrived before the output went wrong.
+    """
+
+    ITEM_KINDS = {"roles": "role", "skills": "skill", "education": "education"}
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        self.root = -1
+        self.stack: List[list] = []   # [open char, key it lives under, start offset, pending key]
+        self.in_str = False
+        self.esc = False
+        self.str_start = 0
+        self.last_str = ""
+        self.closed = False
+        self.identity: Optional[Dict[str, object]] = None
+        self.items: Dict[str, List[Dict[str, object]]] = {k: [] for k in self.ITEM_KINDS}
+
+    def feed(self, delta: str) -> List[Tuple[str, object]]:
+        self.text += delta
+        text, events = self.text, []
+        for i in range(self.pos, len(text)):
+            if self.closed:
+                break
+            ch = text[i]
+            if self.in_str:
+                if self.esc:
+                    self.esc = False
+                elif ch == "\\":
+                    self.esc = True
+                elif ch == '"':
+                    self.in_str = False
+                    self.last_str = text[self.str_start:i + 1]
+            elif not self.stack:
+                if ch == "{":  # anything before the root object (``` fences, prose) is skipped
+                    self.root = i
+                    self.stack.append(["{", None, i, None])
+            elif ch == '"':
+                self.in_str = True
+                self.str_start = i
+            elif ch == ":":
+                try:
+                    self.stack[-1][3] = json.loads(self.last_str)
+                except ValueError:
+                    self.stack[-1][3] = None
+            elif ch == ",":
+                if self.stack[-1][0] == "{":
+                    self.stack[-1][3] = None
+            elif ch in "{[":
+                parent = self.stack[-1]
+                self.stack.append([ch, parent[3] if parent[0] == "{" else parent[1], i, None])
+            elif ch in "}]":
+                kind, key, start, _ = self.stack.pop()
+                if kind == "{":
+                    event = self._complete(key, text[start:i + 1])
+                    if event is not None:
+                        events.append(event)
+                self.closed = not self.stack
+        self.pos = len(text)
+        return events
+
+    def _complete(self, key: Optional[str], fragment: str) -> Optional[Tuple[str, object]]:
+        depth = len(self.stack)
+        is_identity = depth == 1 and key == "identity"
+        is_item = depth == 2 and self.stack[-1][0] == "[" and key in self.ITEM_KINDS
+        if not (is_identity or is_item):
+            return None
+        try:
+            obj = json.loads(fragment)
+        except ValueError:
+            return None
+        if is_identity:
+            self.identity = obj
+            return "identity", obj
+        self.items[key].append(obj)
+        kind = self.ITEM_KINDS[key]
+        if kind != "skill":
+            return kind, obj
+        skill = _safe_skill(obj)
+        return ("skill", skill) if skill is not None else None
+
+    def result(self) -> Tuple[Optional[Dict[str, object]], bool]:
+        if self.root >= 0:
+            try:
+                data, _ = json.JSONDecoder().raw_decode(self.text, self.root)
+                if isinstance(data, dict):
+                    return data, True
+            except ValueError:
+                pass
+        if self.identity is None and not any(self.items.values()):
+            return None, False
+        salvaged: Dict[str, object] = dict(self.items)
+        if self.identity is not None:
+            salvaged["identity"] = self.identity
+        return salvaged, False
+
+@dataclass
+class StreamStats:
+    first_result_s: Optional[float] = None  # time until the first identity/role/skill was usable
+    total_s: float = 0.0
+    items: int = 0
+    complete: bool = False                  # False: the result was salvaged from partial output
+
+def _resume_messages(pdf_text: str) -> List[Dict[str, str]]:
     user_prompt = f"""
 Here is a resume. Parse it into the requested schema.
 
 RESUME:
-\"\"\"{pdf_text[:16000]}\"\"\"
+\"\"\"{pdf_text[:MAX_RESUME_CHARS]}\"\"\"
 """
+    return [
+        {"role": "system", "content": RESUME_SCHEMA_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+def llm_extract_resume_streaming(pdf_text: str) -> Tuple[Optional[ResumeStruct], StreamStats]:
+    """
+    Streamed LLM parse. A response that breaks off or turns malformed keeps the
+    pieces that did arrive (not cached, so a later run retries); malformed entries
+    are skipped. Time to the first complete identity/role/skill and to the end of
+    the stream go to talentiq_stage_seconds (stages "llm_first_result",
+    "llm_stream"). Caller checks enabled/length/cache (see `llm_extract_resume`).
+    """
+    stats = StreamStats()
+    parser = ResumeStreamParser()
+    t0 = time.perf_counter()
+    try:
+        for delta in llm_chat_stream(_resume_messages(pdf_text), temperature=0):
+            for _ in parser.feed(delta):
+                stats.items += 1
+                if stats.first_result_s is None:
+                    stats.first_result_s = time.perf_counter() - t0
+                    METRICS.observe("talentiq_stage_seconds", stats.first_result_s, stage="llm_first_result")
+    except Exception as e:
+        warn("llm_stream", f"LLM resume stream failed after {stats.items} item(s): {e}")
+    stats.total_s = time.perf_counter() - t0
+    METRICS.observe("talentiq_stage_seconds", stats.total_s, stage="llm_stream")
+
+    data, stats.complete = parser.result()
+    parsed = _struct_from_llm_data(data, pdf_text) if data is not None else None
+    if parsed is None:
+        if data is not None:
+            warn("llm_parse", "LLM resume parse returned no usable skills")
+        return None, stats
+    if stats.complete:
+        _store_llm_struct(pdf_text, parsed)
+    else:
+        METRICS.inc("talentiq_llm_salvaged_total")
+        warn("llm_salvaged", f"LLM resume parse salvaged {stats.items} item(s) from partial output")
+    return parsed, stats
+
+@METRICS.timed("llm_extract_resume")
+def llm_extract_resume(pdf_text: str, enabled: bool) -> Optional[ResumeStruct]:
+    """
+    LLM resume parser. If `enabled` is False or LLM not configured, returns None.
+    Streams by default (TALENTIQ_LLM_STREAM=0 waits for the whole completion).
+    """
+    if not enabled or not LLM_ENABLED:
+        return None
+    if not pdf_text or len(pdf_text.strip()) < 50:
+        return None
+
+    cached = _cached_llm_struct(pdf_text)
+    if cached is not None:
+        return cached
+
+    if LLM_STREAMING:
+        return llm_extract_resume_streaming(pdf_text)[0]
 
     try:
-        resp = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0,
-        )
+        resp = llm_chat(_resume_messages(pdf_text), temperature=0)
         raw_json = resp["choices"][0]["message"]["content"]
         data = json.loads(raw_json)
+        parsed = _struct_from_llm_data(data, pdf_text)
+        if parsed is None:
+            warn("llm_parse", "LLM resume parse returned no usable skills")
+            return None
+        _store_llm_struct(pdf_text, parsed)
+        return parsed
+    except Exception as e:
+        warn("llm_parse", f"LLM resume parse failed: {e}")
+        return None
 
-        identity = data.get("identity", {"name": ["Unknown"], "emails": []})
-        roles = data.get("roles", [])
-        education = data.get("education", [])
-        skills_raw = data.get("skills", [])
-
-        skills: List[SkillItem] = []
-        for s in skills_raw:
-            skills.append(
-                SkillItem(
-                    name=s.get("name", "").strip(),
-                    level_hint=s.get("level_hint", "intermediate"),
-                    last_used=s.get("last_used"),
-                    years_hint=s.get("years_hint"),
-                    evidence_snippets=s.get("evidence_snippets", [])[:3],
-                )
-            )
+LLM_BATCH_TOKEN_BUDGET = int(os.getenv("TALENTIQ_LLM_BATCH_TOKENS", "12000"))
+LLM_BATCH_MAX_ITEMS = 8
+LLM_BATCH_OUTPUT_TOKENS = 700   # completion allowance per packed resume
+SHORT_RESUME_CHARS = 6000       # longer resumes always get their own request
+
+def _pack_batches(texts: List[str], idxs: List[int], token_budget: int) -> List[List[int]]:
+    """Greedy packing: fill a batch until the next resume would exceed the token budget."""
+    budget_left = token_budget - len(BATCH_RESUME_PROMPT) // 4
+    batches, cur, used = [], [], 0
+    for i in idxs:
+        cost = len(texts[i]) // 4 + LLM_BATCH_OUTPUT_TOKENS
+        if cur and (used + cost > budget_left or len(cur) >= LLM_BATCH_MAX_ITEMS):
+            batches.append(cur)
+            cur, used = [], 0
+        cur.append(i)
+        used += cost
+    if cur:
+        batches.append(cur)
+    return batches
+
+def _llm_extract_batch(texts: List[str], batch: List[int], out: List[Optional[ResumeStruct]]) -> None:
+    """Parse one packed batch; on failure split it in halves, down to single requests."""
+    if len(batch) == 1:
+        try:
+            out[batch[0]] = llm_extract_resume(texts[batch[0]], enabled=True)
+        except Exception as e:
+            warn("llm_parse", f"LLM resume parse failed: {e}")
+        return
 
-        return ResumeStruct(
-            identity=identity,
-            roles=roles,
-            skills=skills,
-            education=education,
-            raw_text=pdf_text,
+    blocks = "\n\n".join(f"<<<RESUME id={i}>>>\n{texts[i]}\n<<<END id={i}>>>" for i in batch)
+    missing = list(batch)
+    try:
+        resp = llm_chat(
+            [
+                {"role": "system", "content": BATCH_RESUME_PROMPT},
+                {"role": "user", "content": f"Parse each of these {len(batch)} resumes.\n\n{blocks}"},
+            ],
+            temperature=0,
+            max_tokens=LLM_BATCH_OUTPUT_TOKENS * len(batch),
         )
+        data = json.loads(resp["choices"][0]["message"]["content"])
+        if isinstance(data, dict):
+            data = data.get("resumes", [])
+        by_id = {str(item.get("id")): item for item in data if isinstance(item, dict)}
+        for i in batch:
+            item = by_id.get(str(i))
+            if item is not None:
+                out[i] = _struct_from_llm_data(item, texts[i])
+                if out[i] is not None:
+                    _store_llm_struct(texts[i], out[i], batch=True)
+        missing = [i for i in batch if out[i] is None]
+        if not missing:
+            return
+        warn("llm_batch_partial", f"LLM batch parse returned {len(batch) - len(missing)}/{len(batch)} resumes")
     except Exception as e:
-        print(f"[warn] LLM resume parse failed: {e}")
-        return None
+        missing = [i for i in batch if out[i] is None]
+        warn("llm_batch", f"LLM batch parse failed ({len(batch)} resumes): {e}")
+
+    if len(missing) == 1:
+        _llm_extract_batch(texts, missing, out)
+        return
+    half = len(missing) // 2
+    _llm_extract_batch(texts, missing[:half], out)
+    _llm_extract_batch(texts, missing[half:], out)
+
+@METRICS.timed("llm_extract_resumes_batch")
+def llm_extract_resumes_batch(
+    texts: List[str],
+    enabled: bool,
+    token_budget: int = LLM_BATCH_TOKEN_BUDGET,
+    max_workers: int = LLM_MAX_CONCURRENCY,
+) -> List[Optional[ResumeStruct]]:
+    """
+    LLM-parse many resumes, packing short ones several to a request (sized to
+    `token_budget`) so the schema prompt and the round trip are shared.
+    Cached resumes are skipped; a batch that fails or comes back malformed is
+    split and retried down to single-resume requests. Same order as `texts`;
+    None where the LLM is disabled or parsing failed.
+    """
+    out: List[Optional[ResumeStruct]] = [None] * len(texts)
+    if not enabled or not LLM_ENABLED:
+        return out
+    todo = []
+    for i, txt in enumerate(texts):
+        if not txt or len(txt.strip()) < 50:
+            continue
+        out[i] = _cached_llm_struct(txt)
+        if out[i] is None:
+            todo.append(i)
+
+    short = [i for i in todo if len(texts[i]) <= SHORT_RESUME_CHARS]
+    batches = _pack_batches(texts, short, token_budget) + [[i] for i in todo if len(texts[i]) > SHORT_RESUME_CHARS]
+    run_batch(
+        lambda batch: _llm_extract_batch(texts, batch, out),
+        [(b,) for b in batches],
+        executor="thread",
+        max_workers=max_workers,
+    )
+    return out
+
+_WORD_GLUE = "a-z0-9+#"  # `_tokenize_lower` token chars that are not separators ("./-")
+
+class SkillMatcher:
+    """
+    Multi-term matcher compiled into one trie-shaped regex, so a text is scanned
+    once no matter how many terms there are. Semantics per term are the same as
+    `re.finditer(re.escape(term), text)`: leftmost, non-overlapping occurrences.
+
+    words=True matches whole words of the `_tokenize_lower` grammar only: a hit
+    may not touch a letter, digit, "+" or "#" on either side ("go" not in
+    "google" or "ago"; "react" in "react.js", "python" in "python/django"), and
+    the words of a multi-word term may be separated by any whitespace.
+    """
+
+    def __init__(self, terms, words: bool = False):
+        self.terms: List[str] = sorted({t.lower() for t in terms if t})
+        self.words = words
+        known = set(self.terms)
+        # every term that is a prefix of a longer term also matches where it does
+        self._prefixes: Dict[str, List[str]] = {
+            t: [t[:i] for i in range(1, len(t) + 1) if t[:i] in known] for t in self.terms
+        }
+        body = _trie_regex(self.terms, words)
+        if words:
+            # a shorter term found inside a longer hit needs its own end-of-word check
+            self._term_res = {t: re.compile(_word_regex(t)) for t in self.terms}
+            body = f"(?<![{_WORD_GLUE}])(?=({body})(?![{_WORD_GLUE}]))"
+        else:
+            body = "(?=(" + body + "))"
+        self._pattern = re.compile(body) if self.terms else None
+
+    def find(self, lowered: str, limit: Optional[int] = None) -> Dict[str, List[Tuple[int, int]]]:
+        """Return {term: [(start, end), ...]} for every term present in `lowered`."""
+        hits: Dict[str, List[Tuple[int, int]]] = {}
+        if self._pattern is None:
+            return hits
+        last_end: Dict[str, int] = {}
+        for m in self._pattern.finditer(lowered):
+            start = m.start()
+            found = " ".join(m.group(1).split()) if self.words else m.group(1)
+            for term in self._prefixes[found]:
+                if start < last_end.get(term, 0):
+                    continue
+                if not self.words:
+                    end = start + len(term)
+                elif term == found:
+                    end = m.end(1)
+                else:
+                    sub = self._term_res[term].match(lowered, start)
+                    if sub is None:
+                        continue
+                    end = sub.end()
+                last_end[term] = end
+                spans = hits.setdefault(term, [])
+                if limit is None or len(spans) < limit:
+                    spans.append((start, end))
+        return hits
+
+def _word_regex(term: str) -> str:
+    return r"\s+".join(map(re.escape, term.split(" "))) + f"(?![{_WORD_GLUE}])"
+
+def _trie_regex(terms: List[str], words: bool = False) -> str:
+    trie: Dict[str, dict] = {}
+    for t in terms:
+        node = trie
+        for ch in t:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        alts = [(r"\s+" if words and ch == " " else re.escape(ch)) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        # greedy optional: prefer the longest term ending below this node
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+@lru_cache(maxsize=32)
+def skill_matcher(terms: frozenset, words: bool = False) -> SkillMatcher:
+    """Compiled matcher per term set; shared across resumes and reruns."""
+    return SkillMatcher(terms, words)
+
+SNIPPET_WINDOW = 50  # chars of context either side of a regex match in a why-card snippet
+
+def match_snippet(lowered: str, start: int, end: int, window: int = SNIPPET_WINDOW) -> str:
+    return "…" + lowered[max(0, start - window):min(len(lowered), end + window)].replace("\n", " ") + "…"
+
+def skill_snippets(skill: SkillItem, raw_text: str) -> List[str]:
+    """
+    Display snippets for a skill: the parser's own, then one per regex match span,
+    built here from the raw text (only for the why-cards actually shown).
+    """
+    out = list(skill.evidence_snippets)
+    if skill.evidence_spans:
+        lowered = (raw_text or "").lower()
+        out += [match_snippet(lowered, start, end) for start, end in skill.evidence_spans]
+    return out
 
-def regex_extract_resume(pdf_text: str, role: str, canon: Canonicalizer) -> ResumeStruct:
+@METRICS.timed("regex_extract_resume")
+def regex_extract_resume(pdf_text: str, config: ScoringConfig) -> ResumeStruct:
     """
-    Regex fallback: scan for known taxonomy skills, create SkillItems with snippets.
+    Regex fallback: scan for known taxonomy skills as whole words, create SkillItems
+    with the offsets of up to 3 matches each as evidence (snippet text is built on demand).
     """
     text = pdf_text or ""
     lowered = text.lower()
     tokens = set()
+    canon = config.canon
 
-    all_skills = set()
-    for r, areas in TAXONOMY.items():
-        for _, skills in areas.items():
-            for s in skills:
-                all_skills.add(s.lower())
-
-    def snippets_for(term: str, window=50) -> List[str]:
-        out = []
-        for m in re.finditer(re.escape(term.lower()), lowered):
-            start = max(0, m.start() - window)
-            end = min(len(lowered), m.end() + window)
-            out.append("…" + lowered[start:end].replace("\n", " ") + "…")
-            if len(out) >= 3:
-                break
-        return out
+    matcher = skill_matcher(config.terms, words=True)
+    hits = matcher.find(lowered, limit=3)
 
     skills: List[SkillItem] = []
-    for s in sorted(all_skills):
-        if s in lowered:
+    for s in matcher.terms:
+        if s in hits:
             can = canon.canon(s)
             if can not in tokens:
                 tokens.add(can)
@@ -398,7 +1851,7 @@ def regex_extract_resume(pdf_text: str, role: str, canon: Canonicalizer) -> Resu
                         level_hint="intermediate",
                         last_used=None,
                         years_hint=None,
-                        evidence_snippets=snippets_for(s),
+                        evidence_spans=hits[s],
                     )
                 )
 
@@ -406,14 +1859,25 @@ def regex_extract_resume(pdf_text: str, role: str, canon: Canonicalizer) -> Resu
     roles = []
     return ResumeStruct(identity=ident, roles=roles, skills=skills, raw_text=text)
 
-def extract_resume_struct(pdf_text: str, role: str, canon: Canonicalizer, use_llm: bool) -> ResumeStruct:
-    parsed = llm_extract_resume(pdf_text, enabled=use_llm)
+def extract_resume_struct(
+    pdf_text: str,
+    config: ScoringConfig,
+    use_llm: bool,
+    parsed: Optional[ResumeStruct] = None,
+) -> ResumeStruct:
+    """
+    LLM parse (or an already-fetched `parsed` result) canonicalized, else regex fallback.
+    """
+    if parsed is None and use_llm:
+        parsed = llm_extract_resume(pdf_text, enabled=use_llm)
+        if parsed is None and LLM_ENABLED:
+            METRICS.inc("talentiq_llm_fallbacks_total")
     if parsed is not None:
         canon_skills = []
         for s in parsed.skills:
             canon_skills.append(
                 SkillItem(
-                    name=canon.canon(s.name),
+                    name=config.canon.canon(s.name),
                     level_hint=s.level_hint,
                     last_used=s.last_used,
                     years_hint=s.years_hint,
@@ -423,7 +1887,94 @@ def extract_resume_struct(pdf_text: str, role: str, canon: Canonicalizer, use_ll
         parsed.skills = canon_skills
         parsed.raw_text = pdf_text
         return parsed
-    return regex_extract_resume(pdf_text, role, canon)
+    return regex_extract_resume(pdf_text, config)
+
+# ===========================
+# 4b) NEAR-DUPLICATE RESUMES (MinHash + LSH)
+# ===========================
+DEDUPE_ENABLED = os.getenv("TALENTIQ_DEDUPE", "1") != "0"
+DEDUPE_THRESHOLD = float(os.getenv("TALENTIQ_DEDUPE_THRESHOLD", "0.9"))  # estimated Jaccard of word 3-grams
+MINHASH_PERMS = 128
+LSH_BANDS = 16  # 16 bands x 8 rows: a pair at Jaccard 0.9 shares a band with p > 0.999
+
+_MINHASH_SEEDS = random.Random(20240521)
+_MINHASH_A = [_MINHASH_SEEDS.getrandbits(64) | 1 for _ in range(MINHASH_PERMS)]
+_MINHASH_B = [_MINHASH_SEEDS.getrandbits(64) for _ in range(MINHASH_PERMS)]
+_MASK64 = (1 << 64) - 1
+
+def _shingles(text: str) -> List[int]:
+    """crc32 of every word 3-gram of the normalized text (tokens of `_tokenize_lower`)."""
+    words = _tokenize_lower(text)
+    grams = [" ".join(words[i:i + 3]) for i in range(max(1, len(words) - 2))] if words else []
+    return sorted({zlib.crc32(g.encode("utf-8")) for g in grams})
+
+@lru_cache(maxsize=1024)
+def minhash_signature(text: str) -> Tuple[int, ...]:
+    """MINHASH_PERMS minima of multiply-shift hashes over the shingles; () for an empty text."""
+    xs = _shingles(text)
+    if not xs:
+        return ()
+    if np is not None:
+        x = np.asarray(xs, dtype=np.uint64)[:, None]
+        with np.errstate(over="ignore"):
+            h = (x * np.asarray(_MINHASH_A, dtype=np.uint64) + np.asarray(_MINHASH_B, dtype=np.uint64)) >> np.uint64(32)
+        return tuple(int(v) for v in h.min(axis=0))
+    return tuple(min(((a * x + b) & _MASK64) >> 32 for x in xs) for a, b in zip(_MINHASH_A, _MINHASH_B))
+
+def near_duplicates(texts: List[str], threshold: float = DEDUPE_THRESHOLD) -> List[int]:
+    """
+    For each text, the index of the earliest text it is a near-duplicate of
+    (itself if none). Candidates come from LSH buckets (one per band of the
+    MinHash signature) and are kept if the signatures agree on >= `threshold`
+    of their positions; texts are only compared against group representatives.
+    """
+    rows = MINHASH_PERMS // LSH_BANDS
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+    sigs: Dict[int, Tuple[int, ...]] = {}
+    rep = list(range(len(texts)))
+    for i, text in enumerate(texts):
+        sig = minhash_signature(text or "")
+        if not sig:
+            continue
+        bands = [(b, sig[b * rows:(b + 1) * rows]) for b in range(LSH_BANDS)]
+        seen = set()
+        for key in bands:
+            for j in buckets.get(key, ()):
+                if j in seen:
+                    continue
+                seen.add(j)
+                if sum(x == y for x, y in zip(sig, sigs[j])) >= threshold * MINHASH_PERMS:
+                    rep[i] = j
+                    break
+            if rep[i] != i:
+                break
+        if rep[i] == i:
+            sigs[i] = sig
+            for key in bands:
+                buckets[key].append(i)
+    return rep
+
+def duplicate_groups(resumes: List[Tuple[str, str]], threshold: float = DEDUPE_THRESHOLD) -> List[List[str]]:
+    """Names of near-duplicate uploads, one list per group (representative first); singletons left out."""
+    groups: Dict[int, List[str]] = defaultdict(list)
+    for (name, _), r in zip(resumes, near_duplicates([txt for _, txt in resumes], threshold)):
+        groups[r].append(name)
+    return [names for names in groups.values() if len(names) > 1]
+
+def llm_extract_deduped(texts: List[str], enabled: bool, max_workers: int = LLM_MAX_CONCURRENCY) -> List[Optional[ResumeStruct]]:
+    """
+    `llm_extract_resumes_batch`, but near-duplicate texts (re-applications, the
+    same CV under another file name, lightly edited agency copies) are sent
+    once: the rest get a copy of their representative's parse, which
+    `extract_resume_struct` then pairs with their own text.
+    """
+    if not (enabled and LLM_ENABLED and DEDUPE_ENABLED):
+        return llm_extract_resumes_batch(texts, enabled=enabled, max_workers=max_workers)
+    rep = near_duplicates(texts)
+    reps = sorted(set(rep))
+    parsed = dict(zip(reps, llm_extract_resumes_batch([texts[i] for i in reps], enabled=enabled, max_workers=max_workers)))
+    METRICS.inc("talentiq_dedupe_reused_total", len(texts) - len(reps))
+    return [parsed[r] if r == i or parsed[r] is None else replace(parsed[r]) for i, r in enumerate(rep)]
 
 # ===========================
 # 5) SCORING FUNCTIONS
@@ -433,12 +1984,12 @@ LEVEL_MAP = {"beginner": 0.3, "intermediate": 0.6, "advanced": 1.0}
 def recency_score(last_used: Optional[str]) -> float:
     return 1.0  # hook for future
 
-def evidence_score(snips: List[str]) -> float:
-    return min(1.0, len(snips) / 3.0)
+def evidence_score(count: int) -> float:
+    return min(1.0, count / 3.0)
 
 def depth(skill: SkillItem) -> float:
     lvl = LEVEL_MAP.get(skill.level_hint, 0.6)
-    evd = evidence_score(skill.evidence_snippets)
+    evd = evidence_score(skill.evidence_count)
     rcy = recency_score(skill.last_used)
     return 0.4 * lvl + 0.3 * evd + 0.3 * rcy
 
@@ -447,8 +1998,19 @@ def negation_penalty(text: str) -> float:
     hits = sum(t.count(kw) for kw in NEGATIONS)
     return max(0.85, 1.0 - 0.03 * hits)
 
-def jd_demand_from_text(role: str, jd_text: str) -> Dict[str, float]:
-    base = ROLE_WEIGHTS[role].copy()
+def skill_depths(resume: ParsedResume) -> Iterator[Tuple[str, float]]:
+    """(lowercased skill name, depth) per skill, in order; CompactResume depths are precomputed."""
+    if isinstance(resume, CompactResume):
+        return zip(resume.skill_keys(), resume.depths)
+    return ((sk.name.lower(), depth(sk)) for sk in resume.skills)
+
+def resume_penalty(resume: ParsedResume) -> float:
+    if isinstance(resume, CompactResume):
+        return resume.penalty
+    return negation_penalty(resume.raw_text)
+
+def jd_demand_from_text(role: str, jd_text: str, weights: Dict[str, float]) -> Dict[str, float]:
+    base = weights.copy()
     if role == "frontend" and len(re.findall(r"\b(accessibility|wcag|aria|a11y)\b", jd_text.lower())) >= 3:
         base["perf_a11y"] = 0.30
         s = sum(base.values())
@@ -456,23 +2018,50 @@ def jd_demand_from_text(role: str, jd_text: str) -> Dict[str, float]:
             base[k] = base[k] / s
     return base
 
-def supply_by_area(role: str, resume: ResumeStruct) -> Dict[str, float]:
-    areas = TAXONOMY[role]
+@dataclass(frozen=True)
+class ScoringContext:
+    """
+    Everything per-resume scoring needs for one (config, JD), built once by
+    `build_scoring_context`. Read-only: scoring never mutates it.
+    """
+    config: ScoringConfig
+    role: str
+    areas: Tuple[str, ...]                    # taxonomy areas, in taxonomy order
+    weights: Dict[str, float]                 # role weights (Tech)
+    demand: Dict[str, float]                  # JD demand per area (L→R)
+    theta: Dict[str, float]                   # per-area saturation thresholds
+    skill_areas: Dict[str, Tuple[str, ...]]   # skill -> areas it counts towards
+    skillset: frozenset                       # all taxonomy skills for the role (R→L)
+
+def build_scoring_context(config: ScoringConfig, jd_text: str) -> ScoringContext:
+    role = config.role
+    weights = config.weights_for(role)
+    areas = config.areas_for(role)
     index: Dict[str, List[str]] = defaultdict(list)
     for area, skills in areas.items():
         for s in skills:
             index[s.lower()].append(area)
+    return ScoringContext(
+        config=config,
+        role=role,
+        areas=tuple(areas.keys()),
+        weights=weights,
+        demand=jd_demand_from_text(role, jd_text, weights),
+        theta=config.theta_for(role),
+        skill_areas={k: tuple(v) for k, v in index.items()},
+        skillset=frozenset(index),
+    )
 
+def supply_by_area(ctx: ScoringContext, resume: ParsedResume) -> Dict[str, float]:
+    index = ctx.skill_areas
     bucket: Dict[str, List[float]] = defaultdict(list)
-    for sk in resume.skills:
-        key = sk.name.lower()
+    for key, d in skill_depths(resume):
         if key in index:
-            d = depth(sk)
             for area in index[key]:
                 bucket[area].append(d)
 
     out = {}
-    for area in areas.keys():
+    for area in ctx.areas:
         vals = sorted(bucket.get(area, []))
         if not vals:
             out[area] = 0.0
@@ -481,10 +2070,12 @@ def supply_by_area(role: str, resume: ResumeStruct) -> Dict[str, float]:
             out[area] = vals[mid] if len(vals) % 2 == 1 else 0.5 * (vals[mid - 1] + vals[mid])
     return out
 
-def left_to_right(role: str, jd_text: str, resume: ResumeStruct) -> Tuple[float, Dict[str, float], Dict[str, float]]:
-    D = jd_demand_from_text(role, jd_text)
-    S = supply_by_area(role, resume)
-    theta = THETA[role]
+def left_to_right(
+    ctx: ScoringContext, resume: ParsedResume, supply: Optional[Dict[str, float]] = None
+) -> Tuple[float, Dict[str, float], Dict[str, float]]:
+    D = ctx.demand
+    S = supply_by_area(ctx, resume) if supply is None else supply
+    theta = ctx.theta
     cov_by_area, norm_supply = {}, {}
     for a in D:
         norm = S.get(a, 0.0) / max(1e-9, theta[a])
@@ -494,28 +2085,22 @@ def left_to_right(role: str, jd_text: str, resume: ResumeStruct) -> Tuple[float,
     l2r = 100.0 * sum(D[a] * cov_by_area[a] for a in D)
     return round(l2r, 1), cov_by_area, norm_supply
 
-def right_to_left(role: str, jd_text: str, resume: ResumeStruct) -> float:
-    jd_skillset = set()
-    for skills in TAXONOMY[role].values():
-        for s in skills:
-            jd_skillset.add(s.lower())
-
+def right_to_left(ctx: ScoringContext, resume: ParsedResume) -> float:
+    jd_skillset = ctx.skillset
     num, den = 0.0, 0.0
-    for sk in resume.skills:
-        d = depth(sk)
+    for key, d in skill_depths(resume):
         den += d
-        if sk.name.lower() in jd_skillset:
+        if key in jd_skillset:
             num += d
     if den == 0:
         return 0.0
     return round(100.0 * num / den, 1)
 
-def technical(role: str, resume: ResumeStruct) -> float:
-    weights = ROLE_WEIGHTS[role]
-    S = supply_by_area(role, resume)
-    theta = THETA[role]
+def technical(ctx: ScoringContext, resume: ParsedResume, supply: Optional[Dict[str, float]] = None) -> float:
+    S = supply_by_area(ctx, resume) if supply is None else supply
+    theta = ctx.theta
     score = 0.0
-    for a, w in weights.items():
+    for a, w in ctx.weights.items():
         cov = min(1.0, S.get(a, 0.0) / max(1e-9, theta[a]))
         score += w * cov
     return round(100.0 * score, 1)
@@ -528,91 +2113,1334 @@ def fbeta(l2r: float, r2l: float, beta: float = 1.5) -> float:
     f = (1 + beta**2) * (R * P) / (beta**2 * R + P)
     return f * 100.0
 
+@METRICS.timed("hybrid")
 def hybrid(
-    role: str,
-    jd_text: str,
-    resume: ResumeStruct,
+    ctx: ScoringContext,
+    resume: ParsedResume,
     alpha: float = 0.4,
     beta: float = 1.5,
 ) -> Tuple[float, Dict[str, float], Dict[str, float], float, float, float]:
-    l2r, coverages, norms = left_to_right(role, jd_text, resume)
-    r2l = right_to_left(role, jd_text, resume)
-    tech = technical(role, resume)
+    supply = supply_by_area(ctx, resume)
+    l2r, coverages, norms = left_to_right(ctx, resume, supply)
+    r2l = right_to_left(ctx, resume)
+    tech = technical(ctx, resume, supply)
     f = fbeta(l2r, r2l, beta=beta)
     raw = (1 - alpha) * tech + alpha * f
-    penalized = raw * negation_penalty(resume.raw_text)
+    penalized = raw * resume_penalty(resume)
     return round(penalized, 2), coverages, norms, round(tech, 1), l2r, r2l
 
-def score_all(role: str, jd_text: str, resumes: List[Tuple[str, str]], alpha=0.4, beta=1.5, use_llm=True):
-    canon = Canonicalizer(ALIASES)
-    rows = []
-    structs: Dict[str, ResumeStruct] = {}
-    for name, txt in resumes:
-        rs = extract_resume_struct(txt, role, canon, use_llm=use_llm)
-        structs[name] = rs
-        score, _, _, tech, l2r, r2l = hybrid(role, jd_text, rs, alpha=alpha, beta=beta)
-        rows.append((name, score, tech, l2r, r2l, rs))
-    rows.sort(key=lambda x: x[1], reverse=True)
-    return rows, structs
+# ===========================
+# 5b) BATCH ENGINE
+# ===========================
+DEFAULT_CONCURRENCY = int(os.getenv("TALENTIQ_CONCURRENCY", "8"))
+# executor="process" runs smaller batches serially: shipping items to a warm pool and
+# results back costs more than it saves below this (benchmarks/run.py --stages process_crossover)
+PROCESS_POOL_MIN_BATCH = int(os.getenv("TALENTIQ_PROCESS_MIN_BATCH", "512"))
+PROCESS_CHUNKS_PER_WORKER = 4
+
+def _picklable(fn):
+    """
+    Process pools pickle functions by module + name. When this file runs as the
+    Streamlit script it is `__main__`, which a worker can't import, so hand the
+    pool the same function from the importable `app` module instead.
+    """
+    if fn.__module__ != "__main__":
+        return fn
+    return getattr(importlib.import_module(Path(__file__).stem), fn.__name__)
+
+def _mp_context():
+    """forkserver where available: forking a host that already runs threads (Streamlit, the server) is unsafe."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+_SHARED: object = None  # a worker's copy of the `shared` its pool was started with (see _process_pool)
+
+def _install_shared(shared) -> None:
+    global _SHARED
+    _SHARED = shared
+
+def _call(fn, shared, item: tuple):
+    return fn(*item) if shared is None else fn(shared, *item)
+
+def _run_chunk(fn, installed: bool, shared, chunk: List[tuple], collect: bool):
+    """
+    One process-pool task; `installed`: use the worker's own copy of `shared` (which
+    was not sent). Returns (results, the worker's drained METRICS if `collect`).
+    """
+    shared = _SHARED if installed else shared
+    METRICS.enabled = collect
+    out = []
+    for item in chunk:
+        try:
+            out.append((_call(fn, shared, item), None))
+        except Exception as e:
+            out.append((None, f"{type(e).__name__}: {e}"))
+    return out, METRICS.drain() if collect else None
+
+_PROCESS_POOLS: Dict[int, Tuple[ProcessPoolExecutor, object]] = {}  # max_workers -> (pool, shared it started with)
+_PROCESS_POOL_LOCK = threading.Lock()
+
+def _process_pool(max_workers: int, shared) -> Tuple[ProcessPoolExecutor, bool]:
+    """
+    A process pool kept warm between batches, one per worker count. A new pool's
+    workers receive `shared` once, through the pool initializer. Returns
+    (pool, whether its workers already hold `shared`); if not, each chunk carries it.
+    """
+    with _PROCESS_POOL_LOCK:
+        if max_workers not in _PROCESS_POOLS:
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=_mp_context(), initializer=_picklable(_install_shared), initargs=(shared,)
+            )
+            _PROCESS_POOLS[max_workers] = (pool, shared)
+            METRICS.inc("talentiq_process_pool_starts_total")
+        pool, installed = _PROCESS_POOLS[max_workers]
+        return pool, installed is shared
+
+def run_batch(
+    fn,
+    items: List[tuple],
+    executor: str = "thread",
+    max_workers: int = DEFAULT_CONCURRENCY,
+    on_done=None,
+    shared=None,
+):
+    """
+    Apply `fn(*item)` (or `fn(shared, *item)` when `shared` is given) to every item
+    and return [(result, error), ...] in input order.
+
+    executor: "serial", "thread" (I/O-bound work) or "process" (CPU-bound work).
+    At most `max_workers` items (chunks, for "process") are in flight at once; an
+    exception raised for one item is captured as its error string and does not
+    stop the rest of the batch. `on_done(i, result, error)` is called in the
+    caller's thread as items finish.
+    "process" reuses one warm pool, sends `shared` to each worker once instead of
+    with every item, and submits items in chunks; batches smaller than
+    PROCESS_POOL_MIN_BATCH run serially.
+    """
+    out: List[Tuple[object, Optional[str]]] = [(None, None)] * len(items)
+    if executor == "process" and len(items) < PROCESS_POOL_MIN_BATCH:
+        executor = "serial"
+    if executor == "serial" or max_workers <= 1 or len(items) <= 1:
+        for i, item in enumerate(items):
+            try:
+                out[i] = (_call(fn, shared, item), None)
+            except Exception as e:
+                out[i] = (None, f"{type(e).__name__}: {e}")
+            if on_done is not None:
+                on_done(i, *out[i])
+        return out
+
+    if executor == "process":
+        pool, installed = _process_pool(max_workers, shared)
+        run_chunk, fn, ship = _picklable(_run_chunk), _picklable(fn), None if installed else shared
+        size = max(1, math.ceil(len(items) / (max_workers * PROCESS_CHUNKS_PER_WORKER)))
+        tasks = (
+            (range(at, min(at + size, len(items))), (run_chunk, fn, installed, ship, items[at:at + size], METRICS.enabled))
+            for at in range(0, len(items), size)
+        )
+        _drain(pool, tasks, max_workers, out, on_done)
+        return out
+
+    if executor != "thread":
+        raise ValueError(f"unknown executor kind: {executor!r}")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="talentiq") as pool:
+        tasks = (((i,), (_run_one, fn, shared, item)) for i, item in enumerate(items))
+        _drain(pool, tasks, max_workers, out, on_done)
+    return out
+
+def _run_one(fn, shared, item: tuple):
+    try:
+        return [(_call(fn, shared, item), None)], None
+    except Exception as e:
+        return [(None, f"{type(e).__name__}: {e}")], None
+
+def _drain(pool: Executor, tasks, max_workers: int, out: list, on_done) -> None:
+    """
+    Submit `tasks` ((indices, (fn, *args)), ...) keeping at most `max_workers` in
+    flight; fill `out`. Each task returns (results, drained worker METRICS or None).
+    """
+    pending = {}
+
+    def submit() -> bool:
+        nxt = next(tasks, None)
+        if nxt is None:
+            return False
+        indices, (call, *args) = nxt
+        pending[pool.submit(call, *args)] = indices
+        return True
+
+    while len(pending) < max_workers and submit():
+        pass
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            indices = pending.pop(fut)
+            try:
+                results, metrics = fut.result()
+            except Exception as e:  # the worker itself died, e.g. BrokenProcessPool
+                results, metrics = [(None, f"{type(e).__name__}: {e}")] * len(indices), None
+            if metrics is not None:
+                METRICS.merge(metrics)
+            for i, res in zip(indices, results):
+                out[i] = res
+                if on_done is not None:
+                    on_done(i, *res)
+            submit()
+
+class ScoredRow(NamedTuple):
+    name: str
+    score: float
+    tech: float
+    l2r: float
+    r2l: float
+    struct: ParsedResume
+    coverages: Dict[str, float]
+    norms: Dict[str, float]
+
+def resume_key(name: str, text: str) -> Tuple[str, str]:
+    """(name, content hash) of one input resume: two different files called resume.pdf get different keys."""
+    return name, content_key(text.encode("utf-8"))
+
+def _score_one(ctx: ScoringContext, name: str, txt: str, parsed: Optional[ResumeStruct], alpha: float, beta: float) -> ScoredRow:
+    rs = extract_resume_struct(txt, ctx.config, use_llm=False, parsed=parsed)
+    score, coverages, norms, tech, l2r, r2l = hybrid(ctx, rs, alpha=alpha, beta=beta)
+    return ScoredRow(name, score, tech, l2r, r2l, rs, coverages, norms)
+
+def _score_batch(ctx: ScoringContext, resumes, alpha, beta, use_llm, executor, max_workers, on_done=None):
+    """[(ScoredRow, None) | (None, error)] in input order."""
+    parsed = llm_extract_deduped([txt for _, txt in resumes], enabled=use_llm, max_workers=max_workers)
+    if use_llm and LLM_ENABLED:
+        METRICS.inc("talentiq_llm_fallbacks_total", sum(p is None for p in parsed))
+    if executor == "auto":
+        executor = "serial"  # regex scoring is CPU-bound: threads can't help, a process pool rarely pays
+    return run_batch(
+        _score_one,
+        [(name, txt, p, alpha, beta) for (name, txt), p in zip(resumes, parsed)],
+        executor=executor,
+        max_workers=max_workers,
+        on_done=on_done,
+        shared=ctx,
+    )
+
+def score_all(
+    ctx: ScoringContext,
+    resumes: List[Tuple[str, str]],
+    alpha=0.4,
+    beta=1.5,
+    use_llm=True,
+    executor: str = "auto",
+    max_workers: int = DEFAULT_CONCURRENCY,
+    on_result=None,
+    compact: bool = False,
+):
+    """
+    Parse and score every resume against `ctx`. LLM parsing runs batched on a thread pool (I/O-bound);
+    regex extraction + scoring runs on `executor` ("auto" runs it serially; see
+    `run_batch` for "process"). Rows come back sorted by score, ties in upload order.
+    Returns (rows, structs, errors): ScoredRows, `resume_key` -> ResumeStruct in
+    input order, and name -> message for resumes that could not be scored.
+    `on_result(row)` is called with each ScoredRow as soon as it is ready.
+    compact=True returns CompactResumes (in `structs` and the rows) instead, for
+    callers that keep the results around for re-ranking.
+    """
+    def done(i, row, err):
+        if on_result is not None and err is None:
+            on_result(row)
+
+    results = _score_batch(ctx, resumes, alpha, beta, use_llm, executor, max_workers, on_done=done)
+
+    rows: List[ScoredRow] = []
+    structs: Dict[Tuple[str, str], ParsedResume] = {}
+    errors: Dict[str, str] = {}
+    for (name, txt), (row, err) in zip(resumes, results):
+        if err is not None:
+            warn("score", f"scoring failed for {name}: {err}")
+            errors[name] = err
+            continue
+        if compact:
+            row = row._replace(struct=CompactResume.from_struct(row.struct))
+        structs[resume_key(name, txt)] = row.struct
+        rows.append(row)
+    rows.sort(key=lambda x: x.score, reverse=True)
+    return rows, structs, errors
+
+def rescore_all(ctx: ScoringContext, structs: Dict[Tuple[str, str], ParsedResume], alpha=0.4, beta=1.5) -> List[ScoredRow]:
+    """
+    Score already-parsed resumes (`structs` as returned by `score_all` for the same
+    config) against `ctx` without extracting again, e.g. after an alpha/beta or JD
+    edit. Same row order as `score_all`.
+    """
+    rows: List[ScoredRow] = []
+    for (name, _), rs in structs.items():
+        score, coverages, norms, tech, l2r, r2l = hybrid(ctx, rs, alpha=alpha, beta=beta)
+        rows.append(ScoredRow(name, score, tech, l2r, r2l, rs, coverages, norms))
+    rows.sort(key=lambda x: x.score, reverse=True)
+    return rows
 
 # ===========================
-# 6) LLM: JD SUGGESTIONS (4–5)
+# 5c) VECTORIZED POOL SCORING (NumPy)
+# ===========================
+def _pyround(x, ndigits: int):
+    """np.round, but near .5 ties defer to Python's round() so results match the scalar path."""
+    out = np.round(x, ndigits)
+    scaled = x * 10.0 ** ndigits
+    tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if tie.any():
+        out[tie] = [round(float(v), ndigits) for v in x[tie]]
+    return out
+
+class CandidatePool:
+    """
+    Parsed candidates packed into flat arrays so a whole pool can be scored against a
+    new JD with NumPy instead of one `hybrid` call per resume.
+
+    One entry per (candidate, skill occurrence): `cand`, `skill` (vocab id),
+    `slot` (0 for the first occurrence of a skill in a resume, 1 for a repeat, ...)
+    and `depth`. Per candidate: `total_depth` (R→L denominator, off-taxonomy skills
+    included) and `penalty` (negation penalty of the raw text).
+    Pack once with `from_structs` (ResumeStructs or CompactResumes), then call
+    `score(ctx)` per JD.
+    """
+
+    def __init__(self, names, vocab, cand, skill, slot, depths, total_depth, penalty):
+        self.names: List[str] = list(names)
+        self.vocab: List[str] = list(vocab)
+        self.cand = cand
+        self.skill = skill
+        self.slot = slot
+        self.depth = depths
+        self.total_depth = total_depth
+        self.penalty = penalty
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_structs(cls, items: List[Tuple[str, ParsedResume]]) -> "CandidatePool":
+        if np is None:
+            raise RuntimeError("Vectorized scoring needs numpy. Install numpy.")
+        vocab: Dict[str, int] = {}
+        cand, skill, slot, depths = [], [], [], []
+        total_depth, penalty = [], []
+        for i, (_, rs) in enumerate(items):
+            seen: Dict[int, int] = defaultdict(int)
+            tot = 0.0
+            for key, d in skill_depths(rs):
+                tot += d
+                sid = vocab.setdefault(key, len(vocab))
+                cand.append(i)
+                skill.append(sid)
+                slot.append(seen[sid])
+                depths.append(d)
+                seen[sid] += 1
+            total_depth.append(tot)
+            penalty.append(resume_penalty(rs))
+        return cls(
+            names=[name for name, _ in items],
+            vocab=sorted(vocab, key=vocab.get),
+            cand=np.asarray(cand, dtype=np.int64),
+            skill=np.asarray(skill, dtype=np.int64),
+            slot=np.asarray(slot, dtype=np.int64),
+            depths=np.asarray(depths, dtype=np.float64),
+            total_depth=np.asarray(total_depth, dtype=np.float64),
+            penalty=np.asarray(penalty, dtype=np.float64),
+        )
+
+    def _supply(self, ctx: ScoringContext, mask) -> "np.ndarray":
+        """Per-area median depth, candidates × ctx.areas."""
+        n = len(self.names)
+        relevant = sorted({int(s) for s in np.unique(self.skill[mask])})
+        col_of = {sid: j for j, sid in enumerate(relevant)}
+        n_slots = int(self.slot[mask].max()) + 1 if mask.any() else 1
+
+        # candidates × (skill, slot) depth matrix, NaN where absent
+        dense = np.full((n, max(1, len(relevant) * n_slots)), np.nan)
+        if mask.any():
+            cols = np.fromiter((col_of[int(s)] for s in self.skill[mask]), dtype=np.int64, count=int(mask.sum()))
+            dense[self.cand[mask], cols * n_slots + self.slot[mask]] = self.depth[mask]
+
+        # (skill, slot) × areas incidence matrix
+        area_idx = {a: k for k, a in enumerate(ctx.areas)}
+        incidence = np.zeros((dense.shape[1], len(ctx.areas)), dtype=bool)
+        for sid, j in col_of.items():
+            for a in ctx.skill_areas[self.vocab[sid]]:
+                incidence[j * n_slots:(j + 1) * n_slots, area_idx[a]] = True
+
+        supply = np.zeros((n, len(ctx.areas)))
+        rows = np.arange(n)
+        for k in range(len(ctx.areas)):
+            sub = dense[:, incidence[:, k]]
+            if sub.shape[1] == 0:
+                continue
+            cnt = (~np.isnan(sub)).sum(axis=1)
+            srt = np.sort(sub, axis=1)  # NaN sorts last
+            lo = np.maximum((cnt - 1) // 2, 0)
+            hi = np.minimum(cnt // 2, sub.shape[1] - 1)
+            med = 0.5 * (srt[rows, lo] + srt[rows, hi])
+            supply[:, k] = np.where(cnt > 0, med, 0.0)
+        return supply
+
+    def score(self, ctx: ScoringContext, alpha: float = 0.4, beta: float = 1.5) -> Dict[str, "np.ndarray"]:
+        """
+        Vectorized `hybrid` for every candidate. Returns arrays keyed by
+        score, tech, l2r, r2l, coverage and norm (the last two candidates × areas,
+        columns in `areas` order), matching the scalar functions up to float rounding.
+        """
+        relevant_ids = [i for i, name in enumerate(self.vocab) if name in ctx.skillset]
+        mask = np.isin(self.skill, relevant_ids)
+        supply = self._supply(ctx, mask)
+
+        n = len(self.names)
+        area_idx = {a: k for k, a in enumerate(ctx.areas)}
+        zeros = np.zeros(n)
+        cov: Dict[str, "np.ndarray"] = {}
+        norm: Dict[str, "np.ndarray"] = {}
+        for a in {**ctx.demand, **ctx.weights}:
+            norm[a] = (supply[:, area_idx[a]] if a in area_idx else zeros) / max(1e-9, ctx.theta[a])
+            cov[a] = np.minimum(1.0, norm[a])
+
+        # accumulate area by area, in the scalar code's order, so rounding agrees
+        l2r_raw, tech_raw = np.zeros(n), np.zeros(n)
+        for a, d in ctx.demand.items():
+            l2r_raw = l2r_raw + d * cov[a]
+        for a, w in ctx.weights.items():
+            tech_raw = tech_raw + w * cov[a]
+        l2r = _pyround(100.0 * l2r_raw, 1)
+        tech = _pyround(100.0 * tech_raw, 1)
+
+        num = np.bincount(self.cand[mask], weights=self.depth[mask], minlength=len(self.names))
+        den = self.total_depth
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r2l = np.where(den == 0, 0.0, _pyround(100.0 * num / np.where(den == 0, 1.0, den), 1))
+            R, P = l2r / 100.0, r2l / 100.0
+            f_den = beta * beta * R + P
+            f = np.where(f_den == 0, 0.0, (1 + beta ** 2) * (R * P) / f_den * 100.0)
+        raw = (1 - alpha) * tech + alpha * f
+        areas = list(ctx.demand)
+        return {
+            "areas": areas,
+            "score": _pyround(raw * self.penalty, 2),
+            "tech": tech,
+            "l2r": l2r,
+            "r2l": r2l,
+            "coverage": np.column_stack([cov[a] for a in areas]) if areas else np.zeros((n, 0)),
+            "norm": np.column_stack([norm[a] for a in areas]) if areas else np.zeros((n, 0)),
+        }
+
+    def rank(self, ctx: ScoringContext, alpha: float = 0.4, beta: float = 1.5) -> List[Tuple[str, float, float, float, float]]:
+        """(name, score, tech, l2r, r2l) sorted by score, ties in pool order."""
+        out = self.score(ctx, alpha=alpha, beta=beta)
+        order = np.argsort(-out["score"], kind="stable")
+        return [
+            (self.names[i], float(out["score"][i]), float(out["tech"][i]), float(out["l2r"][i]), float(out["r2l"][i]))
+            for i in order
+        ]
+
+# ===========================
+# 5d) CANDIDATE STORE (SQLite + skill inverted index)
 # ===========================
-def llm_suggest_jds_from_resumes(resume_texts: List[str]) -> List[Dict[str, str]]:
+STORE_PATH = Path(os.getenv("TALENTIQ_STORE", str(CACHE_DIR / "candidates.sqlite3")))
+
+class CandidateStore:
     """
-    Take combined resume text(s) and ask LLM to propose 4–5 roles + JDs.
-    Returns list of {"role": ..., "jd": ...}.
+    Persistent ResumeStructs with an inverted index canonical skill -> (candidate, depth).
+    Re-ranking against a new JD reads only the index rows for the JD's taxonomy
+    skills, so candidates that hit none of them are never loaded.
+
+    A candidate is identified by (name, content hash), not by name alone: two
+    applicants who both upload "resume.pdf" get a row each.
     """
-    if not LLM_ENABLED or not resume_texts:
-        return []
 
-    combined = "\n\n---\n\n".join(resume_texts)[:16000]
-    system_prompt = """
-You are a hiring assistant. You receive one or more resumes.
-Propose 4–5 suitable software roles (e.g., Frontend Engineer, Backend Engineer, Data Scientist, Product Manager)
-and short job descriptions for each role.
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            old = db.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'candidates'").fetchone()
+            if old is not None and "name TEXT UNIQUE" in old[0]:
+                # keyed on name alone; the store only holds parses, so rebuild it from the next scoring run
+                db.execute("DROP TABLE candidates")
+                db.execute("DROP TABLE IF EXISTS skill_index")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS candidates ("
+                " id INTEGER PRIMARY KEY, name TEXT NOT NULL, content_hash TEXT NOT NULL,"
+                " struct TEXT NOT NULL, total_depth REAL NOT NULL, penalty REAL NOT NULL, added REAL NOT NULL,"
+                " UNIQUE (name, content_hash))"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS skill_index ("
+                " skill TEXT NOT NULL, candidate_id INTEGER NOT NULL, slot INTEGER NOT NULL, depth REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS skill_index_skill ON skill_index(skill)")
+            db.execute("CREATE INDEX IF NOT EXISTS skill_index_candidate ON skill_index(candidate_id)")
+
+    @staticmethod
+    def content_hash(rs: ResumeStruct) -> str:
+        return content_key((rs.raw_text or "").encode("utf-8"))
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def __len__(self) -> int:
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def add_many(self, items: List[Tuple[str, ResumeStruct]], canon: Optional[Canonicalizer] = None) -> None:
+        """
+        Insert candidates, canonicalizing skill names for the index. Adding the same
+        resume under the same name again refreshes its row; a different resume under
+        an existing name is stored next to it (see `replace` to drop the old one).
+        """
+        canon = canon or Canonicalizer(DEFAULT_ALIASES)
+        with self._connect() as db:
+            for name, rs in items:
+                self._insert(db, name, rs, canon)
+
+    def add(self, name: str, rs: ResumeStruct, canon: Optional[Canonicalizer] = None) -> None:
+        self.add_many([(name, rs)], canon)
+
+    def replace(self, name: str, rs: ResumeStruct, canon: Optional[Canonicalizer] = None) -> None:
+        """Store `rs` as the only resume under `name`, dropping every earlier one."""
+        with self._connect() as db:
+            self._delete(db, "name = ?", (name,))
+            self._insert(db, name, rs, canon or Canonicalizer(DEFAULT_ALIASES))
+
+    def _insert(self, db: sqlite3.Connection, name: str, rs: ResumeStruct, canon: Canonicalizer) -> None:
+        skills = [replace(sk, name=canon.canon(sk.name)) for sk in rs.skills]
+        rs = replace(rs, skills=skills)
+        key = self.content_hash(rs)
+        self._delete(db, "name = ? AND content_hash = ?", (name, key))
+        depths = [depth(sk) for sk in skills]
+        cur = db.execute(
+            "INSERT INTO candidates (name, content_hash, struct, total_depth, penalty, added)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (name, key, struct_to_json(rs), sum(depths), negation_penalty(rs.raw_text), time.time()),
+        )
+        seen: Dict[str, int] = defaultdict(int)
+        index_rows = []
+        for sk, d in zip(skills, depths):
+            skill = sk.name.lower()
+            index_rows.append((skill, cur.lastrowid, seen[skill], d))
+            seen[skill] += 1
+        db.executemany("INSERT INTO skill_index (skill, candidate_id, slot, depth) VALUES (?, ?, ?, ?)", index_rows)
+
+    @staticmethod
+    def _delete(db: sqlite3.Connection, where: str, args: Tuple) -> int:
+        ids = [r[0] for r in db.execute(f"SELECT id FROM candidates WHERE {where}", args).fetchall()]
+        for cid in ids:
+            db.execute("DELETE FROM skill_index WHERE candidate_id = ?", (cid,))
+            db.execute("DELETE FROM candidates WHERE id = ?", (cid,))
+        return len(ids)
+
+    def get(self, name: str, content_hash: Optional[str] = None) -> Optional[ResumeStruct]:
+        """The resume stored under `name` with `content_hash`, or the latest one under `name`."""
+        with self._connect() as db:
+            if content_hash is None:
+                row = db.execute(
+                    "SELECT struct FROM candidates WHERE name = ? ORDER BY id DESC LIMIT 1", (name,)
+                ).fetchone()
+            else:
+                row = db.execute(
+                    "SELECT struct FROM candidates WHERE name = ? AND content_hash = ?", (name, content_hash)
+                ).fetchone()
+        return struct_from_json(row[0]) if row else None
+
+    def get_all(self, name: str) -> List[ResumeStruct]:
+        """Every resume stored under `name`, oldest first."""
+        with self._connect() as db:
+            rows = db.execute("SELECT struct FROM candidates WHERE name = ? ORDER BY id", (name,)).fetchall()
+        return [struct_from_json(r[0]) for r in rows]
+
+    def remove(self, name: str, content_hash: Optional[str] = None) -> bool:
+        """Drop one resume under `name`, or all of them when no hash is given."""
+        with self._connect() as db:
+            if content_hash is None:
+                return self._delete(db, "name = ?", (name,)) > 0
+            return self._delete(db, "name = ? AND content_hash = ?", (name, content_hash)) > 0
+
+    def candidates_for(self, skills) -> List[str]:
+        """Names of candidates holding at least one of `skills`."""
+        skills = sorted({s.lower() for s in skills})
+        if not skills:
+            return []
+        marks = ",".join("?" * len(skills))
+        with self._connect() as db:
+            rows = db.execute(
+                f"SELECT name FROM candidates WHERE id IN"
+                f" (SELECT candidate_id FROM skill_index WHERE skill IN ({marks})) ORDER BY id",
+                skills,
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def rank(self, ctx: ScoringContext, alpha: float = 0.4, beta: float = 1.5) -> List[Tuple[str, float, float, float, float]]:
+        """
+        (name, score, tech, l2r, r2l) for every stored candidate with at least one
+        of the JD's taxonomy skills, best first. Everyone else scores 0.
+        """
+        skills = sorted(ctx.skillset)
+        if not skills:
+            return []
+        marks = ",".join("?" * len(skills))
+        with self._connect() as db:
+            meta = db.execute(
+                f"SELECT id, name, total_depth, penalty FROM candidates WHERE id IN"
+                f" (SELECT candidate_id FROM skill_index WHERE skill IN ({marks})) ORDER BY id",
+                skills,
+            ).fetchall()
+            if np is None:
+                return self._rank_scalar(db, meta, ctx, alpha, beta)
+            hits = db.execute(
+                f"SELECT candidate_id, skill, slot, depth FROM skill_index WHERE skill IN ({marks})"
+                f" ORDER BY candidate_id, rowid",
+                skills,
+            ).fetchall()
+
+        pos = {cid: i for i, (cid, *_rest) in enumerate(meta)}
+        vocab = {s: i for i, s in enumerate(skills)}
+        pool = CandidatePool(
+            names=[m[1] for m in meta],
+            vocab=skills,
+            cand=np.fromiter((pos[h[0]] for h in hits), dtype=np.int64, count=len(hits)),
+            skill=np.fromiter((vocab[h[1]] for h in hits), dtype=np.int64, count=len(hits)),
+            slot=np.fromiter((h[2] for h in hits), dtype=np.int64, count=len(hits)),
+            depths=np.fromiter((h[3] for h in hits), dtype=np.float64, count=len(hits)),
+            total_depth=np.fromiter((m[2] for m in meta), dtype=np.float64, count=len(meta)),
+            penalty=np.fromiter((m[3] for m in meta), dtype=np.float64, count=len(meta)),
+        )
+        return pool.rank(ctx, alpha=alpha, beta=beta)
+
+    @staticmethod
+    def _rank_scalar(db: sqlite3.Connection, meta, ctx: ScoringContext, alpha: float, beta: float):
+        """Same ranking without numpy: hydrate the matching structs and call `hybrid`."""
+        rows = []
+        for cid, name, _, _ in meta:
+            raw = db.execute("SELECT struct FROM candidates WHERE id = ?", (cid,)).fetchone()[0]
+            score, _, _, tech, l2r, r2l = hybrid(ctx, struct_from_json(raw), alpha=alpha, beta=beta)
+            rows.append((name, score, tech, l2r, r2l))
+        rows.sort(key=lambda x: x[1], reverse=True)
+        return rows
+
+_CANDIDATE_STORE: Optional[CandidateStore] = None
+
+def get_candidate_store() -> CandidateStore:
+    global _CANDIDATE_STORE
+    if _CANDIDATE_STORE is None:
+        _CANDIDATE_STORE = CandidateStore()
+    return _CANDIDATE_STORE
+
+# ===========================
+# 5e) TOP-K SHORTLIST (bounded heap + score upper bounds)
+# ===========================
+BOUND_SLACK = 0.1  # covers the 1-decimal rounding of Tech/L→R/R→L inside `hybrid`
+
+def score_upper_bound(ctx: ScoringContext, text: str, use_llm: bool, alpha: float = 0.4, beta: float = 1.5) -> float:
+    """
+    Cheap ceiling on `hybrid` for a resume, from one matcher pass over its text.
+
+    Each area's supply is a median of skill depths, so it can't exceed the best
+    depth among the area's skills found in the text: with the regex parser that
+    depth is fixed by the hit count (same whole-word matching as the parser);
+    with the LLM it is taken as 1.0 (any level), and taxonomy terms and their
+    aliases are matched as plain substrings, since the LLM may well read
+    "python3" as python or "continuous integration" as ci/cd.
+    R→L is at most 100 once anything matched; Fβ grows with both inputs.
+    Exact for the regex parser. For the LLM it assumes every reported skill is
+    written in the text under some known spelling, which an LLM need not respect.
+    """
+    lowered = (text or "").lower()
+    canon = ctx.config.canon
+    terms = ctx.config.alias_terms if use_llm else ctx.config.terms
+    hits = skill_matcher(terms, words=not use_llm).find(lowered, limit=3)
+    best: Dict[str, float] = defaultdict(float)
+    for term, spans in hits.items():
+        d = 1.0 if use_llm else depth(SkillItem(name=term, evidence_spans=spans))
+        for key in {term, canon.canon(term)}:
+            for area in ctx.skill_areas.get(key, ()):
+                best[area] = max(best[area], d)
+    if not best:
+        return 0.0
+    cov = {a: min(1.0, best.get(a, 0.0) / max(1e-9, ctx.theta[a])) for a in {**ctx.demand, **ctx.weights}}
+    l2r = 100.0 * sum(w * cov[a] for a, w in ctx.demand.items())
+    tech = 100.0 * sum(w * cov[a] for a, w in ctx.weights.items())
+    raw = (1 - alpha) * tech + alpha * fbeta(l2r, 100.0, beta=beta)
+    return raw * negation_penalty(text or "") + BOUND_SLACK
+
+def shortlist(
+    ctx: ScoringContext,
+    resumes: List[Tuple[str, str]],
+    cutoff: float,
+    k: int,
+    alpha: float = 0.4,
+    beta: float = 1.5,
+    use_llm: bool = True,
+    executor: str = "auto",
+    max_workers: int = DEFAULT_CONCURRENCY,
+):
+    """
+    Top `k` resumes scoring >= `cutoff`, without fully scoring the whole pool.
+
+    Resumes are visited in order of `score_upper_bound`, a wave of `max_workers`
+    at a time (parsed + scored with the batch engine). A bounded min-heap keeps
+    the best k so far; as soon as the next bound is below max(cutoff, k-th score)
+    nobody left can make the list and the rest are skipped unparsed.
+    With the regex parser: same result as filtering `score_all` rows by cutoff
+    and taking the first k. With the LLM parser it can be inexact: a candidate
+    whose parse credits skills that are not written in the text may be skipped
+    (see `score_upper_bound`).
+    Returns (rows, stats) with stats counting scored/skipped/failed resumes.
+    """
+    bounds = [score_upper_bound(ctx, txt, use_llm and LLM_ENABLED, alpha, beta) for _, txt in resumes]
+    order = sorted(range(len(resumes)), key=lambda i: -bounds[i])  # stable: ties keep upload order
+    heap: List[Tuple[float, int, ScoredRow]] = []  # (score, -index, row); heap[0] is the current k-th best
+    stats = {"total": len(resumes), "scored": 0, "skipped": 0, "failed": 0}
+
+    pos = 0
+    while pos < len(order) and k > 0:
+        floor = max(cutoff, heap[0][0] if len(heap) >= k else float("-inf"))
+        wave = []
+        while pos < len(order) and len(wave) < max(1, max_workers) and bounds[order[pos]] >= floor:
+            wave.append(order[pos])
+            pos += 1
+        if not wave:
+            break
+        results = _score_batch(ctx, [resumes[i] for i in wave], alpha, beta, use_llm, executor, max_workers)
+        for i, (row, err) in zip(wave, results):
+            if err is not None:
+                warn("score", f"scoring failed for {resumes[i][0]}: {err}")
+                stats["failed"] += 1
+                continue
+            stats["scored"] += 1
+            if row.score < cutoff:
+                continue
+            item = (row.score, -i, row)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+    stats["skipped"] = len(resumes) - stats["scored"] - stats["failed"]
+    rows = [row for _, _, row in sorted(heap, key=lambda x: x[:2], reverse=True)]
+    return rows, stats
+
+# ===========================
+# 5f) ALPHA / BETA SENSITIVITY (vectorized re-blend)
+# ===========================
+SWEEP_ALPHAS = tuple(round(0.05 * i, 2) for i in range(21))       # the sidebar slider range / step
+SWEEP_BETAS = tuple(round(0.5 + 0.1 * i, 1) for i in range(26))
+
+def _blend(tech, l2r, r2l, penalty, alpha, beta):
+    """`hybrid`'s final score from its alpha/beta-independent parts, op for op, over broadcast arrays."""
+    R, P = l2r / 100.0, r2l / 100.0
+    den = beta ** 2 * R + P
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f = np.where(den == 0, 0.0, (1 + beta ** 2) * (R * P) / np.where(den == 0, 1.0, den) * 100.0)
+    return _pyround(((1 - alpha) * tech + alpha * f) * penalty, 2)
+
+class ScoreSheet:
+    """
+    Scored candidates' alpha/beta-independent components as arrays: Tech, L→R
+    and R→L (rounded as in `hybrid`) and the negation penalty, in candidate
+    order. `ranked(alpha, beta)` re-blends them into exactly the rows
+    `rescore_all` would return without scoring again; `sweep` ranks a whole
+    alpha × beta grid in one pass.
+    """
+
+    def __init__(self, rows: List[ScoredRow]):
+        if np is None:
+            raise RuntimeError("Score sweeps need numpy. Install numpy.")
+        self.rows = list(rows)
+        self.names = [r.name for r in self.rows]
+        self.tech = np.array([r.tech for r in self.rows], dtype=np.float64)
+        self.l2r = np.array([r.l2r for r in self.rows], dtype=np.float64)
+        self.r2l = np.array([r.r2l for r in self.rows], dtype=np.float64)
+        self.penalty = np.array([resume_penalty(r.struct) for r in self.rows], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def scores(self, alpha: float, beta: float) -> "np.ndarray":
+        return _blend(self.tech, self.l2r, self.r2l, self.penalty, alpha, beta)
+
+    def ranked(self, alpha: float, beta: float) -> List[ScoredRow]:
+        """Rows re-scored for (alpha, beta), sorted by score, ties in sheet order."""
+        scores = self.scores(alpha, beta)
+        order = np.argsort(-scores, kind="stable")
+        return [self.rows[i]._replace(score=float(scores[i])) for i in order]
+
+    def sweep(self, k: int, alphas=SWEEP_ALPHAS, betas=SWEEP_BETAS, cutoff: float = float("-inf")) -> Dict[str, object]:
+        """
+        Rank every candidate at every (alpha, beta) of the grid and report how
+        stable the top `k` (scores >= `cutoff`) is. Per candidate, in sheet
+        order: `top_share` (fraction of grid points where it makes the top k),
+        `best_rank` / `worst_rank` (1-based). `always` / `sometimes` name the
+        candidates in the top k at every / only some grid points, the latter
+        sorted by top_share; `top_sets` counts distinct top-k lists.
+        """
+        a = np.asarray(alphas, dtype=np.float64)[:, None, None]
+        b = np.asarray(betas, dtype=np.float64)[None, :, None]
+        scores = _blend(self.tech, self.l2r, self.r2l, self.penalty, a, b)  # alphas × betas × candidates
+        grid = scores.reshape(-1, len(self))
+        order = np.argsort(-grid, axis=1, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(len(self))[None, :], axis=1)
+        in_top = (ranks < k) & (grid >= cutoff)
+        top_share = in_top.mean(axis=0) if len(grid) else np.zeros(len(self))
+        sometimes = [i for i in np.argsort(-top_share, kind="stable") if 0 < top_share[i] < 1]
+        return {
+            "alphas": list(alphas),
+            "betas": list(betas),
+            "k": k,
+            "top_share": top_share,
+            "best_rank": ranks.min(axis=0) + 1,
+            "worst_rank": ranks.max(axis=0) + 1,
+            "always": [self.names[i] for i in np.flatnonzero(top_share == 1)],
+            "sometimes": [self.names[i] for i in sometimes],
+            "top_sets": len({tuple(row[:k][in_top[g, row[:k]]]) for g, row in enumerate(order)}),
+        }
+
+# ===========================
+# 5g) RUN JOURNAL (checkpointed, resumable batches)
+# ===========================
+JOURNAL_PATH = Path(os.getenv("TALENTIQ_JOURNAL", str(CACHE_DIR / "runs.sqlite3")))
+JOURNAL_CHUNK = int(os.getenv("TALENTIQ_JOURNAL_CHUNK", "64"))   # resumes parsed between checkpoints
+JOURNAL_MAX_ATTEMPTS = 3
+
+def journal_keys(resumes: List[Tuple[str, str]], seen: Optional[Dict[str, int]] = None) -> List[Tuple[str, int]]:
+    """
+    (name, dup) per resume: dup counts earlier resumes with the same name. Pass the
+    same `seen` dict for every chunk of one run so numbering carries across chunks.
+    """
+    seen = defaultdict(int) if seen is None else seen
+    keys = []
+    for name, _ in resumes:
+        keys.append((name, seen.get(name, 0)))
+        seen[name] = seen.get(name, 0) + 1
+    return keys
+
+def run_signature(ctx: ScoringContext, alpha: float, beta: float, use_llm: bool) -> str:
+    """Everything a run's scores depend on besides the resumes; a run only resumes under the same signature."""
+    cfg = ctx.config
+    payload = [cfg.role, cfg.role_weights, cfg.taxonomy, cfg.aliases, cfg.theta, sorted(ctx.demand.items()), alpha, beta, bool(use_llm)]
+    return content_key(json.dumps(payload).encode("utf-8"), LLM_MODEL, RESUME_PROMPT_VERSION)
+
+class RunJournal:
+    """
+    Per-resume checkpoints of long scoring runs, on SQLite. Each resume's parse and
+    scores are committed as soon as it finishes, so a crashed or restarted run
+    resumes where it stopped: finished resumes are read back, failed ones retried.
+    Another process can read a run's partial ranking while it is still writing.
+
+    An item is keyed on (name, dup): the dup-th resume called `name` in the run's
+    input, so same-named uploads are checkpointed separately.
+    """
+
+    def __init__(self, path: Path = JOURNAL_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " run_id TEXT PRIMARY KEY, signature TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            cols = [c[1] for c in db.execute("PRAGMA table_info(items)")]
+            if cols and "dup" not in cols:
+                db.execute("ALTER TABLE items RENAME TO items_by_name")  # journals from before `dup`
+                db.execute("DROP INDEX IF EXISTS items_rank")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                " run_id TEXT NOT NULL, name TEXT NOT NULL, dup INTEGER NOT NULL, seq INTEGER NOT NULL,"
+                " content_hash TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL,"
+                " score REAL, tech REAL, l2r REAL, r2l REAL,"
+                " struct TEXT, coverages TEXT, norms TEXT, error TEXT, updated REAL NOT NULL,"
+                " PRIMARY KEY (run_id, name, dup))"
+            )
+            if cols and "dup" not in cols:
+                keep = ", ".join(cols)
+                db.execute(f"INSERT INTO items (dup, {keep}) SELECT 0, {keep} FROM items_by_name")
+                db.execute("DROP TABLE items_by_name")
+            db.execute("CREATE INDEX IF NOT EXISTS items_rank ON items(run_id, status, score)")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(str(self.path), timeout=30)
+        db.execute("PRAGMA synchronous=NORMAL")   # WAL: a power cut may lose the last commits, never corrupt
+        return db
+
+    def open_run(self, run_id: str, signature: str) -> bool:
+        """Create `run_id`, or check an existing one was started with the same signature. True if resuming."""
+        with self._connect() as db:
+            created = db.execute(
+                "INSERT OR IGNORE INTO runs (run_id, signature, created) VALUES (?, ?, ?)", (run_id, signature, time.time())
+            ).rowcount > 0
+            # re-read even after our insert: whichever process created the run fixed its signature
+            row = db.execute("SELECT signature FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row[0] != signature:
+            raise ValueError(f"run {run_id!r} was started with a different JD, config or alpha/beta; use a new run id")
+        return not created
+
+    def plan(
+        self,
+        run_id: str,
+        resumes: List[Tuple[str, str]],
+        max_attempts: int = JOURNAL_MAX_ATTEMPTS,
+        keys: Optional[List[Tuple[str, int]]] = None,
+    ) -> List[int]:
+        """
+        Register `resumes` with the run and return the indices still to score: new or
+        changed resumes, and failed ones with attempts left. Done ones are skipped.
+        `keys`: each resume's (name, dup), by default `journal_keys(resumes)`.
+        """
+        keys = keys or journal_keys(resumes)
+        todo: List[int] = []
+        now = time.time()
+        with self._connect() as db:
+            known = {
+                (name, dup): (seq, h, status, attempts)
+                for name, dup, seq, h, status, attempts in db.execute(
+                    "SELECT name, dup, seq, content_hash, status, attempts FROM items WHERE run_id = ?", (run_id,)
+                )
+            }
+            next_seq = max((k[0] for k in known.values()), default=-1) + 1
+            for i, ((_, txt), key) in enumerate(zip(resumes, keys)):
+                h = content_key(txt.encode("utf-8"))
+                old = known.get(key)
+                if old is not None and old[1] == h:
+                    if old[2] == "pending" or (old[2] == "failed" and old[3] < max_attempts):
+                        todo.append(i)
+                    continue
+                seq = old[0] if old is not None else next_seq
+                next_seq += old is None
+                db.execute(
+                    "INSERT OR REPLACE INTO items (run_id, name, dup, seq, content_hash, status, attempts, updated)"
+                    " VALUES (?, ?, ?, ?, ?, 'pending', 0, ?)",
+                    (run_id, *key, seq, h, now),
+                )
+                known[key] = (seq, h, "pending", 0)
+                todo.append(i)
+        return todo
+
+    def record(
+        self, run_id: str, name: str, row: Optional["ScoredRow"] = None, error: Optional[str] = None, dup: int = 0
+    ) -> None:
+        """Checkpoint one finished resume: its ScoredRow, or the error it failed with."""
+        with self._connect() as db:
+            if row is not None:
+                db.execute(
+                    "UPDATE items SET status = 'done', attempts = attempts + 1, score = ?, tech = ?, l2r = ?, r2l = ?,"
+                    " struct = ?, coverages = ?, norms = ?, error = NULL, updated = ?"
+                    " WHERE run_id = ? AND name = ? AND dup = ?",
+                    (
+                        row.score, row.tech, row.l2r, row.r2l, struct_to_json(as_struct(row.struct)),
+                        json.dumps(row.coverages), json.dumps(row.norms), time.time(), run_id, name, dup,
+                    ),
+                )
+            else:
+                db.execute(
+                    "UPDATE items SET status = 'failed', attempts = attempts + 1, error = ?, updated = ?"
+                    " WHERE run_id = ? AND name = ? AND dup = ?",
+                    (error, time.time(), run_id, name, dup),
+                )
+
+    def rows(self, run_id: str, limit: Optional[int] = None) -> List["ScoredRow"]:
+        """
+        Finished resumes of the run as ScoredRows, best first, ties in the order they
+        joined the run: the partial ranking while the run is in progress.
+        """
+        with self._connect() as db:
+            raw = db.execute(
+                "SELECT name, score, tech, l2r, r2l, struct, coverages, norms FROM items"
+                " WHERE run_id = ? AND status = 'done' ORDER BY score DESC, seq" + (" LIMIT ?" if limit else ""),
+                (run_id, limit) if limit else (run_id,),
+            ).fetchall()
+        return [self._row(*r) for r in raw]
+
+    def finished(self, run_id: str, keys: List[Tuple[str, int]]) -> Dict[Tuple[str, int], Union["ScoredRow", str]]:
+        """(name, dup) -> ScoredRow for the done ones among `keys`, -> error message for the failed ones."""
+        out: Dict[Tuple[str, int], Union[ScoredRow, str]] = {}
+        wanted = set(keys)
+        with self._connect() as db:
+            for name, dup, status, error, *row in db.execute(
+                "SELECT name, dup, status, error, name, score, tech, l2r, r2l, struct, coverages, norms FROM items"
+                " WHERE run_id = ? AND status IN ('done', 'failed')",
+                (run_id,),
+            ):
+                if (name, dup) in wanted:
+                    out[(name, dup)] = self._row(*row) if status == "done" else error
+        return out
+
+    @staticmethod
+    def _row(name, score, tech, l2r, r2l, struct, coverages, norms) -> "ScoredRow":
+        return ScoredRow(name, score, tech, l2r, r2l, struct_from_json(struct), json.loads(coverages), json.loads(norms))
+
+    def progress(self, run_id: str) -> Dict[str, int]:
+        """{"total", "pending", "done", "failed"} item counts for the run."""
+        with self._connect() as db:
+            counts = dict(db.execute("SELECT status, COUNT(*) FROM items WHERE run_id = ? GROUP BY status", (run_id,)))
+        out = {s: counts.get(s, 0) for s in ("pending", "done", "failed")}
+        return {"total": sum(out.values()), **out}
+
+    def delete(self, run_id: str) -> bool:
+        with self._connect() as db:
+            db.execute("DELETE FROM items WHERE run_id = ?", (run_id,))
+            return db.execute("DELETE FROM runs WHERE run_id = ?", (run_id,)).rowcount > 0
+
+_RUN_JOURNAL: Optional[RunJournal] = None
+
+def get_run_journal() -> RunJournal:
+    global _RUN_JOURNAL
+    if _RUN_JOURNAL is None:
+        _RUN_JOURNAL = RunJournal()
+    return _RUN_JOURNAL
+
+def score_all_journaled(
+    ctx: ScoringContext,
+    resumes: List[Tuple[str, str]],
+    journal: RunJournal,
+    run_id: str,
+    alpha=0.4,
+    beta=1.5,
+    use_llm=True,
+    executor: str = "auto",
+    max_workers: int = DEFAULT_CONCURRENCY,
+    on_result=None,
+    compact: bool = False,
+    chunk: int = JOURNAL_CHUNK,
+    max_attempts: int = JOURNAL_MAX_ATTEMPTS,
+    seen_names: Optional[Dict[str, int]] = None,
+):
+    """
+    `score_all`, checkpointed to `journal` under `run_id`; same return value.
+    Resumes the run already finished are read back instead of parsed again
+    (`on_result` still sees them), failed ones are retried up to `max_attempts`
+    times in all. LLM parsing runs `chunk` resumes at a time, so an
+    interruption loses at most the chunk in flight.
+    When a run is fed in several calls, pass one `seen_names` dict to all of them
+    (see `journal_keys`) so same-named resumes in different calls stay apart.
+    Raises ValueError if `run_id` was started with a different JD, config or alpha/beta.
+    """
+    journal.open_run(run_id, run_signature(ctx, alpha, beta, use_llm))
+    keys = journal_keys(resumes, seen_names)
+    todo = journal.plan(run_id, resumes, max_attempts, keys)
+    fresh = set(todo)
+    found: Dict[int, ScoredRow] = {}
+    errors: Dict[int, str] = {}
+
+    restored = [i for i in range(len(resumes)) if i not in fresh]
+    if restored:
+        finished = journal.finished(run_id, [keys[i] for i in restored])
+        for i in restored:
+            got = finished.get(keys[i])
+            if isinstance(got, str):
+                errors[i] = got
+            elif got is not None:
+                found[i] = got
+                if on_result is not None:
+                    on_result(got)
+        METRICS.inc("talentiq_journal_restored_total", len(found))
+
+    for start in range(0, len(todo), max(1, chunk)):
+        part = todo[start:start + max(1, chunk)]
+        batch = [resumes[i] for i in part]
+
+        def done(j, row, err):
+            name, dup = keys[part[j]]
+            journal.record(run_id, name, row, err, dup=dup)
+            if on_result is not None and err is None:
+                on_result(row)
+
+        for i, (row, err) in zip(part, _score_batch(ctx, batch, alpha, beta, use_llm, executor, max_workers, on_done=done)):
+            if err is None:
+                found[i] = row
+            else:
+                errors[i] = err
+
+    rows: List[ScoredRow] = []
+    structs: Dict[Tuple[str, str], ParsedResume] = {}
+    for i, (name, txt) in enumerate(resumes):
+        row = found.get(i)
+        if row is None:
+            if i in errors:
+                warn("score", f"scoring failed for {name}: {errors[i]}")
+            continue
+        if compact:
+            row = row._replace(struct=CompactResume.from_struct(row.struct))
+        structs[resume_key(name, txt)] = row.struct
+        rows.append(row)
+    rows.sort(key=lambda x: x.score, reverse=True)
+    return rows, structs, {resumes[i][0]: err for i, err in errors.items()}
+
+# ===========================
+# 6) LLM: JD SUGGESTIONS (4–5)
+# ===========================
+SUGGEST_PROMPT_VERSION = "suggest-v2"   # bump whenever the JD suggestion prompt changes
+SUGGEST_MAX_ROLES = 5
+SUGGEST_MAX_CLUSTERS = int(os.getenv("TALENTIQ_SUGGEST_CLUSTERS", "6"))
+SUGGEST_TOP_SKILLS = 12                 # skills per cluster summary: bounds every prompt
+SUGGEST_KMEANS_ITERS = 25
+
+def skill_profile(text: str, config: ScoringConfig) -> Dict[str, float]:
+    """Canonical taxonomy skill -> depth for one resume (regex parser: no LLM calls)."""
+    return dict(skill_depths(regex_extract_resume(text, config)))
+
+def _kmeans_np(profiles: List[Dict[str, float]], k: int, iters: int, seed: int) -> List[int]:
+    vocab = {s: j for j, s in enumerate(sorted({s for p in profiles for s in p}))}
+    x = np.zeros((len(profiles), len(vocab)))
+    for i, p in enumerate(profiles):
+        for s, d in p.items():
+            x[i, vocab[s]] = d
+    norms = np.linalg.norm(x, axis=1)
+    live = np.flatnonzero(norms > 0)
+    labels = np.full(len(profiles), -1)
+    if not len(live):
+        return labels.tolist()
+    x = x[live] / norms[live, None]
+    rng = np.random.default_rng(seed)
+    centers = [x[rng.integers(len(x))]]
+    while len(centers) < k:  # k-means++ on cosine distance
+        far = np.clip(1.0 - (x @ np.array(centers).T).max(axis=1), 0.0, None) ** 2
+        if far.sum() <= 1e-12:
+            break
+        centers.append(x[rng.choice(len(x), p=far / far.sum())])
+    c = np.array(centers)
+    assign = None
+    for _ in range(iters):
+        new = (x @ c.T).argmax(axis=1)
+        if assign is not None and np.array_equal(new, assign):
+            break
+        assign = new
+        for j in range(len(c)):
+            total = x[assign == j].sum(axis=0)
+            if total.any():
+                c[j] = total / np.linalg.norm(total)
+    labels[live] = assign
+    return labels.tolist()
+
+def _kmeans_py(profiles: List[Dict[str, float]], k: int, iters: int, seed: int) -> List[int]:
+    def unit(v: Dict[str, float]) -> Dict[str, float]:
+        n = math.sqrt(sum(d * d for d in v.values()))
+        return {s: d / n for s, d in v.items()} if n > 0 else {}
+
+    def dot(a: Dict[str, float], b: Dict[str, float]) -> float:
+        return sum(d * b.get(s, 0.0) for s, d in a.items())
+
+    rows = [unit(p) for p in profiles]
+    live = [i for i, r in enumerate(rows) if r]
+    labels = [-1] * len(profiles)
+    if not live:
+        return labels
+    rng = random.Random(seed)
+    centers = [rows[rng.choice(live)]]
+    while len(centers) < k:
+        far = [max(0.0, 1.0 - max(dot(rows[i], c) for c in centers)) ** 2 for i in live]
+        if sum(far) <= 1e-12:
+            break
+        centers.append(rows[rng.choices(live, weights=far)[0]])
+    for _ in range(iters):
+        new = [max(range(len(centers)), key=lambda j: dot(rows[i], centers[j])) for i in live]
+        if all(labels[i] == a for i, a in zip(live, new)):
+            break
+        for i, a in zip(live, new):
+            labels[i] = a
+        for j in range(len(centers)):
+            total: Dict[str, float] = defaultdict(float)
+            for i, a in zip(live, new):
+                if a == j:
+                    for s, d in rows[i].items():
+                        total[s] += d
+            if total:
+                centers[j] = unit(total)
+    return labels
+
+def cluster_skill_profiles(profiles: List[Dict[str, float]], k: int, iters: int = SUGGEST_KMEANS_ITERS, seed: int = 0) -> List[List[int]]:
+    """
+    Spherical k-means (cosine, k-means++ seeding) over skill-depth vectors.
+    Member indices per cluster, largest first; resumes without any taxonomy skill are left out.
+    """
+    k = max(1, min(k, len(profiles)))
+    labels = (_kmeans_np if np is not None else _kmeans_py)(profiles, k, iters, seed)
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i, label in enumerate(labels):
+        if label >= 0:
+            groups[label].append(i)
+    return sorted(groups.values(), key=lambda g: (-len(g), g[0]))
+
+def cluster_summary(profiles: List[Dict[str, float]], members: List[int], top: int = SUGGEST_TOP_SKILLS) -> List[Tuple[str, float, float]]:
+    """(skill, share of members listing it, mean depth) for the cluster's `top` most common skills."""
+    counts: Dict[str, int] = defaultdict(int)
+    depth_sum: Dict[str, float] = defaultdict(float)
+    for i in members:
+        for s, d in profiles[i].items():
+            counts[s] += 1
+            depth_sum[s] += d
+    best = sorted(counts, key=lambda s: (-counts[s], -depth_sum[s], s))[:top]
+    return [(s, round(counts[s] / len(members), 1), round(depth_sum[s] / counts[s], 1)) for s in best]
+
+def _suggest_for_cluster(summary: List[Tuple[str, float, float]], n_roles: int) -> List[Dict[str, str]]:
+    """Ask the LLM for `n_roles` roles + JDs fitting one cluster; cached by the summary's signature."""
+    payload = json.dumps([n_roles, summary])
+    key = content_key(payload.encode("utf-8"), "jd-suggest", LLM_MODEL, SUGGEST_PROMPT_VERSION)
+    cache = get_resume_cache()
+    if cache is not None:
+        hit = cache.get(key)
+        METRICS.inc("talentiq_cache_lookups_total", kind="jd-suggest", result="miss" if hit is None else "hit")
+        if hit is not None:
+            return json.loads(hit)
+
+    system_prompt = f"""
+You are a hiring assistant. You receive the skill profile of a group of similar candidates:
+for each skill, the share of the group that has it (0-1) and their average depth of evidence (0-1).
+Propose {n_roles} suitable software role(s) for this group (e.g., Frontend Engineer, Backend Engineer,
+Data Scientist, Product Manager) and a short job description for each, built around the group's skills.
 
 Return STRICT JSON like:
 [
-  {
-    "role": "Frontend Engineer",
-    "jd": "Job description text..."
-  },
-  {
+  {{
     "role": "Backend Engineer",
     "jd": "Job description text..."
-  }
+  }}
 ]
 Only JSON, no explanation.
 """.strip()
-
-    user_prompt = f"RESUMES:\n\"\"\"{combined}\"\"\""
+    lines = "\n".join(f"- {s}: share {share}, depth {d}" for s, share, d in summary)
+    user_prompt = f"CANDIDATE GROUP SKILLS:\n{lines}"
 
     try:
-        resp = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[
+        resp = llm_chat(
+            [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
             temperature=0.3,
         )
-        raw_json = resp["choices"][0]["message"]["content"]
-        data = json.loads(raw_json)
+        data = json.loads(resp["choices"][0]["message"]["content"])
         out = []
-        for item in data:
-            r = item.get("role", "").strip()
-            jd = item.get("jd", "").strip()
+        for item in data if isinstance(data, list) else []:
+            r = str(item.get("role", "")).strip()
+            jd = str(item.get("jd", "")).strip()
             if r and jd:
                 out.append({"role": r, "jd": jd})
-        return out
     except Exception as e:
-        print(f"[warn] LLM JD suggestion failed: {e}")
+        warn("llm_suggest", f"LLM JD suggestion failed: {e}")
+        return []
+    if cache is not None and out:
+        cache.put(key, json.dumps(out, ensure_ascii=False), kind="jd-suggest")
+    return out
+
+@METRICS.timed("llm_suggest_jds_from_resumes")
+def llm_suggest_jds_from_resumes(resume_texts: List[str], max_clusters: int = SUGGEST_MAX_CLUSTERS) -> List[Dict[str, object]]:
+    """
+    Propose 4–5 roles + JDs for the whole pool: cluster the resumes locally by
+    their canonical skill vectors, ask the LLM once per cluster with a compact
+    skill summary (never raw resume text, so prompts stay the same size however
+    large the pool), then merge, largest clusters first, dropping duplicate roles.
+    Returns list of {"role": ..., "jd": ..., "candidates": cluster size}.
+    """
+    if not LLM_ENABLED or not resume_texts:
+        return []
+
+    config = resolve_config(next(iter(DEFAULT_TAXONOMY)), "")
+    profiles = [skill_profile(t, config) for t in resume_texts]
+    k = min(max_clusters, max(1, round(math.sqrt(len(profiles) / 2))))   # small pools: fewer, fuller clusters
+    clusters = cluster_skill_profiles(profiles, k)
+    if not clusters:
+        warn("llm_suggest", "no taxonomy skills found in the resumes; nothing to suggest from")
         return []
+    n_roles = max(1, math.ceil(SUGGEST_MAX_ROLES / len(clusters)))
+    answers = run_batch(
+        _suggest_for_cluster,
+        [(cluster_summary(profiles, members), n_roles) for members in clusters],
+        executor="thread",
+    )
+
+    # round-robin over clusters (largest first) so every group gets a role before any gets two
+    out: List[Dict[str, object]] = []
+    seen = set()
+    for rank in range(n_roles):
+        for members, (suggested, _) in zip(clusters, answers):
+            if rank < len(suggested or []) and len(out) < SUGGEST_MAX_ROLES:
+                item = suggested[rank]
+                norm = re.sub(r"[^a-z0-9]+", " ", item["role"].lower()).strip()
+                if norm not in seen:
+                    seen.add(norm)
+                    out.append({**item, "candidates": len(members)})
+    return out
 
 # ===========================
 # 7) STREAMLIT APP
 # ===========================
+def _metrics_delta(stages_before: Dict[str, Tuple[int, float]], counters_before: Dict[str, float]) -> Dict[str, object]:
+    """Stage timings and counters accumulated since the given METRICS snapshots."""
+    stages = []
+    for stage, (calls, secs) in sorted(METRICS.stage_totals().items()):
+        calls0, secs0 = stages_before.get(stage, (0, 0.0))
+        if calls > calls0:
+            n, total = calls - calls0, secs - secs0
+            stages.append({"Stage": stage, "Calls": n, "Total ms": round(1000 * total, 1), "Mean ms": round(1000 * total / n, 2)})
+    counters = {
+        name: value - counters_before.get(name, 0.0)
+        for name, value in sorted(METRICS.counter_totals().items())
+        if value != counters_before.get(name, 0.0)
+    }
+    return {"stages": stages, "counters": counters}
+
+def _render_timings(panel, timings: Optional[Dict[str, object]]) -> None:
+    with panel.container():
+        st.markdown("**Last run timings**")
+        if not timings:
+            st.caption("Run scoring to see per-stage timings.")
+        else:
+            st.dataframe(timings["stages"], use_container_width=True)
+            if timings["counters"]:
+                st.caption(" · ".join(f"{k.replace('talentiq_', '')}: {v:g}" for k, v in timings["counters"].items()))
+        st.download_button("Download metrics (Prometheus)", METRICS.render(), file_name="talentiq_metrics.prom")
+
+def _table_rows(rows: List[ScoredRow]) -> List[Dict[str, object]]:
+    return [
+        {"Rank": i, "Candidate": r.name, "Hybrid%": r.score, "Tech": r.tech, "L→R": r.l2r, "R→L": r.r2l}
+        for i, r in enumerate(rows, 1)
+    ]
+
+def _details_markdown(ctx: ScoringContext, row: ScoredRow, show_reasoning: bool) -> str:
+    """Scores, area coverage and why-cards for one candidate as a single markdown block."""
+    lines = [
+        f"**Tech**: {row.tech:.1f} &nbsp;&nbsp; "
+        f"**L→R**: {row.l2r:.1f} &nbsp;&nbsp; "
+        f"**R→L**: {row.r2l:.1f} &nbsp;&nbsp; "
+        f"**Hybrid**: {row.score:.2f}%",
+        "",
+        "**Area coverage (weight, supply/θ → coverage)**",
+        "",
+    ]
+    for a, w in ctx.weights.items():
+        cov = row.coverages.get(a, 0.0)
+        norm = row.norms.get(a, 0.0)
+        lines.append(f"- `{a}` — weight={w:.2f}, supply/θ={norm:.2f}, covered={cov:.2f}")
+
+    if show_reasoning:
+        lines += ["", "**Why-cards (evidence snippets)**", ""]
+        rs = as_struct(row.struct)
+        area_skills: Dict[str, List[SkillItem]] = defaultdict(list)
+        for sk in rs.skills:
+            for a in ctx.skill_areas.get(sk.name.lower(), ()):
+                area_skills[a].append(sk)
+
+        for a in ctx.weights.keys():
+            lines.append(f"- **{a}**")
+            if not area_skills[a]:
+                lines.append("  - (no evidence)")
+                continue
+            for sk in area_skills[a][:3]:
+                lines.append(f"  - `{sk.name}` (depth={depth(sk):.2f})")
+                for s_snip in skill_snippets(sk, rs.raw_text)[:2]:
+                    lines += ["    ```", "    " + s_snip.replace("`", "'"), "    ```"]
+    return "\n".join(lines)
+
+def _score_sheet(rows: List[ScoredRow], structs: Dict[Tuple[str, str], ParsedResume]) -> Optional[ScoreSheet]:
+    """ScoreSheet of the rows in upload order (the tie order of `rescore_all`); None without numpy."""
+    if np is None:
+        return None
+    order = {id(rs): i for i, rs in enumerate(structs.values())}  # rows carry these very struct objects
+    return ScoreSheet(sorted(rows, key=lambda r: order.get(id(r.struct), len(order))))
+
 def main():
     st.set_page_config(page_title="TalentIQ Hybrid Scorer", layout="wide")
     st.title("🧠 TalentIQ Hybrid Scorer")
@@ -631,12 +3459,35 @@ def main():
     beta = st.sidebar.slider("Beta (Fβ weighting)", 0.5, 3.0, 1.5, 0.1)
     show_reasoning = st.sidebar.checkbox("Show weakest areas / why-cards", value=True)
     use_llm_parser = st.sidebar.checkbox("Use LLM to parse resumes", value=True)
+    save_to_store = st.sidebar.checkbox("Save scored candidates to the candidate store", value=False)
+    rank_store = st.sidebar.checkbox("Also rank stored candidates against the JD", value=False)
+    checkpoint = st.sidebar.checkbox(
+        "Checkpoint scoring runs", value=False,
+        help="Journal every scored resume so a restarted app picks the run up where it stopped.",
+    )
 
     st.sidebar.markdown("---")
     st.sidebar.markdown(
         "LLM status: " +
         ("✅ enabled" if LLM_ENABLED else "⚠️ disabled (no OPENAI_API_KEY)")
     )
+    cache = get_resume_cache()
+    if cache is not None:
+        stats = cache.stats()
+        st.sidebar.caption(f"Parse cache: {stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB")
+        if st.sidebar.button("Clear parse cache"):
+            cache.invalidate()
+    if METRICS_PORT:
+        serve_metrics(METRICS_PORT)
+    # per session (st.session_state via the key); METRICS is process-wide, so set it on every rerun
+    show_timings = st.sidebar.checkbox("Show timing panel", value=METRICS_ENABLED, key="show_timings")
+    METRICS.enabled = show_timings or METRICS_ENABLED or _METRICS_SERVER is not None
+    if show_timings:
+        timing_panel = st.sidebar.empty()
+        _render_timings(timing_panel, st.session_state.get("timings"))
+    else:
+        timing_panel = None
+    metrics_before = (METRICS.stage_totals(), METRICS.counter_totals())
 
     # 1) Upload resumes
     st.subheader("1. Upload resumes (PDF or TXT)")
@@ -648,24 +3499,63 @@ def main():
 
     resumes_in: List[Tuple[str, str]] = []
 
-    if uploaded_files:
-        # Use OS-safe temp directory (works on Windows, Mac, Linux)
-        temp_dir = Path(tempfile.gettempdir())  # cross-platform temp dir
+    upload_key: List[Tuple[str, str]] = []
 
+    if uploaded_files:
+        # Extracted texts live in session state keyed by file hash, so reruns
+        # (every widget change) don't extract again; dropped files are pruned.
+        if "extracted" not in st.session_state:
+            st.session_state.extracted = {}
+        previous = st.session_state.extracted
+        failed_before: Dict[str, str] = st.session_state.get("extract_failed", {})
+        extracted: Dict[str, Tuple[str, Optional[PdfExtraction]]] = {}
+        failed: Dict[str, str] = {}  # unreadable PDFs by file hash: not extracted or warned about again
+        skipped: List[str] = []
+        extractions: List[Tuple[str, PdfExtraction]] = []
         for f in uploaded_files:
-            if f.name.lower().endswith(".pdf"):
-                # Save uploaded PDF to a temp file
-                tmp_path = temp_dir / f.name
-                tmp_path.write_bytes(f.read())
-                # Extract text from that temp file
-                text = load_pdf_text(str(tmp_path))
+            data = f.getvalue()
+            is_pdf = f.name.lower().endswith(".pdf")
+            key = content_key(data, "pdf" if is_pdf else "txt")
+            if key in previous:
+                text, ext = previous[key]
+            elif key in failed_before or key in failed:
+                failed[key] = failed.get(key) or failed_before[key]
+                skipped.append(f.name)
+                continue
+            elif is_pdf:
+                # Extract straight from the uploaded bytes (no temp files)
+                try:
+                    ext = load_pdf_bytes(data)
+                except Exception as e:
+                    failed[key] = str(e)
+                    st.warning(f"Could not read {f.name}: {e}")
+                    continue
+                text = ext.text
             else:
                 # TXT file – read directly as text
-                text = f.read().decode("utf-8", errors="ignore")
-
+                text, ext = data.decode("utf-8", errors="ignore"), None
+            extracted[key] = (text, ext)
+            if ext is not None:
+                extractions.append((f.name, ext))
             resumes_in.append((f.name, text))
-
-
+            upload_key.append((f.name, key))
+        st.session_state.extracted = extracted
+        st.session_state.extract_failed = failed
+        if skipped:
+            st.caption("Skipped unreadable file(s): " + ", ".join(f"`{n}`" for n in skipped))
+
+        if extractions:
+            with st.expander(f"PDF extraction ({len(extractions)} file(s))"):
+                for name, ext in extractions:
+                    note = ", truncated" if ext.truncated else ""
+                    st.write(f"- `{name}` — {ext.backend}, {ext.pages} page(s), {ext.seconds:.2f}s{note}")
+
+        groups = duplicate_groups(resumes_in) if DEDUPE_ENABLED else []
+        if groups:
+            with st.expander(f"Near-duplicate uploads ({len(groups)} group(s))"):
+                st.caption("With the LLM parser each group is parsed once; the copies reuse that parse.")
+                for names in groups:
+                    st.write("- " + " ≈ ".join(f"`{n}`" for n in names))
 
     if not resumes_in:
         st.info("Please upload at least one resume to continue.")
@@ -695,7 +3585,9 @@ def main():
         idx = st.selectbox(
             "Select a suggested role",
             options=list(range(len(roles_list))),
-            format_func=lambda i: roles_list[i],
+            format_func=lambda i: (
+                f"{roles_list[i]} ({suggestions[i]['candidates']} candidates)" if "candidates" in suggestions[i] else roles_list[i]
+            ),
             index=st.session_state.selected_jd_index,
         )
         st.session_state.selected_jd_index = idx
@@ -721,124 +3613,163 @@ def main():
 
     # 3) Run scoring button
     st.subheader("3. Run hybrid scoring")
+    config = resolve_config(role_choice, jd_text)
+    role = config.role
+    ctx = build_scoring_context(config, jd_text)
+    # parsing depends on the files, config and parser; ranking also on the JD and alpha/beta
+    parse_key = (tuple(upload_key), config, use_llm_parser)
+    rank_key = (parse_key, jd_text, alpha, beta)
+
     if st.button("🚀 Score all candidates"):
         with st.spinner("Scoring candidates..."):
-            global ROLE_WEIGHTS, TAXONOMY, ALIASES
-
-            # Role & config
-            if role_choice == "auto":
-                inferred_role, ROLE_WEIGHTS_AUTO, TAXONOMY_AUTO, ALIASES_AUTO = config_from_jd(jd_text)
-                role = inferred_role
-                ROLE_WEIGHTS = ROLE_WEIGHTS_AUTO
-                TAXONOMY = TAXONOMY_AUTO
-                ALIASES = ALIASES_AUTO
-                st.success(f"Inferred role from JD: **{role}** (label: {jd_role_label})")
+            progress = st.progress(0.0)
+            live = st.empty()
+            partial: List[ScoredRow] = []
+            last_draw = [0.0]
+
+            def on_result(row: ScoredRow) -> None:
+                partial.append(row)
+                progress.progress(len(partial) / len(resumes_in))
+                if time.monotonic() - last_draw[0] >= 0.5:
+                    last_draw[0] = time.monotonic()
+                    live.dataframe(_table_rows(sorted(partial, key=lambda r: r.score, reverse=True)), use_container_width=True)
+
+            if checkpoint:
+                journal = get_run_journal()
+                signature = run_signature(ctx, alpha, beta, use_llm_parser)
+                run_id = content_key(json.dumps(upload_key).encode("utf-8"), signature)[:16]
+                done_before = journal.progress(run_id)["done"]
+                if done_before:
+                    st.caption(f"Resuming run `{run_id}`: {done_before} resume(s) already scored.")
+                scored, structs, errors = score_all_journaled(
+                    ctx, resumes_in, journal, run_id, alpha=alpha, beta=beta, use_llm=use_llm_parser,
+                    on_result=on_result, compact=True,
+                )
             else:
-                role = role_choice
-                ROLE_WEIGHTS = {k: v.copy() for k, v in DEFAULT_ROLE_WEIGHTS.items()}
-                TAXONOMY = {
-                    k: {ka: list(vv) for ka, vv in va.items()}
-                    for k, va in DEFAULT_TAXONOMY.items()
-                }
-                ALIASES = {k: list(v) for k, v in DEFAULT_ALIASES.items()}
-                st.info(f"Using fixed role: **{role}** (label: {jd_role_label})")
-
-            # Score all resumes
-            scored, structs = score_all(
-                role, jd_text, resumes_in, alpha=alpha, beta=beta, use_llm=use_llm_parser
-            )
-
-            # Overview table
-            st.subheader("4. Ranked candidates")
-            table_rows = []
-            for i, (name, score, tech, l2r, r2l, _) in enumerate(scored, 1):
-                table_rows.append(
-                    {
-                        "Rank": i,
-                        "Candidate": name,
-                        "Hybrid%": score,
-                        "Tech": tech,
-                        "L→R": l2r,
-                        "R→L": r2l,
-                    }
+                scored, structs, errors = score_all(
+                    ctx, resumes_in, alpha=alpha, beta=beta, use_llm=use_llm_parser, on_result=on_result, compact=True
                 )
-            st.dataframe(table_rows, use_container_width=True)
-
-            # Shortlist vs rejected
-            shortlist = [(n, s, t, r1, r2) for (n, s, t, r1, r2, _) in scored if s >= cutoff][:topk]
-            shortlisted_names = {n for (n, *_rest) in shortlist}
-            rejected = [(n, s, t, r1, r2) for (n, s, t, r1, r2, _) in scored if n not in shortlisted_names]
+            progress.empty()
+            live.empty()
+        st.session_state.parsed = {"key": parse_key, "structs": structs, "errors": errors}
+        st.session_state.ranked = {"key": rank_key, "rows": scored, "sheet": _score_sheet(scored, structs)}
+        if save_to_store and structs:
+            get_candidate_store().add_many([(name, c.to_struct()) for (name, _), c in structs.items()], config.canon)
+        if timing_panel is not None:
+            st.session_state.timings = _metrics_delta(*metrics_before)
+            _render_timings(timing_panel, st.session_state.timings)
+
+    parsed = st.session_state.get("parsed")
+    if parsed is None:
+        return
+    if parsed["key"] != parse_key:
+        st.info("Resumes, role or parser changed since the last run. Click **Score all candidates** to update.")
+        return
+    ranked = st.session_state.get("ranked")
+    if ranked is not None and ranked["key"] != rank_key and ranked["key"][:2] == rank_key[:2] and ranked["sheet"] is not None:
+        # only alpha / beta moved: re-blend the cached score components
+        ranked = {**ranked, "key": rank_key, "rows": ranked["sheet"].ranked(alpha, beta)}
+        st.session_state.ranked = ranked
+    elif ranked is None or ranked["key"] != rank_key:
+        # same parses, new JD: re-rank without extracting again
+        rows = rescore_all(ctx, parsed["structs"], alpha=alpha, beta=beta)
+        ranked = {"key": rank_key, "rows": rows, "sheet": _score_sheet(rows, parsed["structs"])}
+        st.session_state.ranked = ranked
+    scored: List[ScoredRow] = ranked["rows"]
+    errors: Dict[str, str] = parsed["errors"]
+
+    if role_choice == "auto":
+        st.success(f"Inferred role from JD: **{role}** (label: {jd_role_label})")
+    else:
+        st.info(f"Using fixed role: **{role}** (label: {jd_role_label})")
+    if errors:
+        st.warning(
+            f"{len(errors)} resume(s) could not be scored: " + ", ".join(sorted(errors))
+        )
 
-            st.markdown(f"### ✅ Interview shortlist (Hybrid ≥ {cutoff:.0f}%, top {topk})")
-            if not shortlist:
-                st.write("_No candidates reached the threshold._")
-            else:
-                for i, (name, score, tech, l2r, r2l) in enumerate(shortlist, 1):
-                    st.write(
-                        f"{i}. **{name}** — Hybrid: {score:.2f}% | "
-                        f"Tech: {tech:.1f} | L→R: {l2r:.1f} | R→L: {r2l:.1f}"
-                    )
+    # Overview table
+    st.subheader("4. Ranked candidates")
+    st.dataframe(_table_rows(scored), use_container_width=True)
+
+    if rank_store:
+        store = get_candidate_store()
+        stored = store.rank(ctx, alpha=alpha, beta=beta)
+        st.markdown(f"**Stored candidates matching this JD** ({len(stored)} of {len(store)})")
+        st.dataframe(
+            [
+                {"Rank": i, "Candidate": n, "Hybrid%": sc, "Tech": t, "L→R": a, "R→L": b}
+                for i, (n, sc, t, a, b) in enumerate(stored, 1)
+            ],
+            use_container_width=True,
+        )
 
-            st.markdown("### ❌ Rejected")
-            if not rejected:
-                st.write("_None_")
-            else:
-                for name, score, tech, l2r, r2l in rejected:
-                    weakest = "L→R" if l2r < r2l else "R→L"
-                    st.write(
-                        f"- **{name}** — Hybrid: {score:.2f}% "
-                        f"(Tech: {tech:.1f}, L→R: {l2r:.1f}, R→L: {r2l:.1f}; weakest={weakest})"
-                    )
+    # Shortlist vs rejected: the bounded top-k search, kept until the ranking, cutoff or k change
+    picked = st.session_state.get("shortlist")
+    if picked is None or picked["key"] != (rank_key, cutoff, topk):
+        top_rows, _ = shortlist(ctx, resumes_in, cutoff, topk, alpha=alpha, beta=beta, use_llm=use_llm_parser)
+        picked = {"key": (rank_key, cutoff, topk), "rows": [(r.name, r.score, r.tech, r.l2r, r.r2l) for r in top_rows]}
+        st.session_state.shortlist = picked
+    top_rows = picked["rows"]
+    left = Counter(top_rows)  # by value, not by name: same-named candidates stay apart
+    rejected = []
+    for (n, s, t, r1, r2, *_) in scored:
+        if left[(n, s, t, r1, r2)] > 0:
+            left[(n, s, t, r1, r2)] -= 1
+        else:
+            rejected.append((n, s, t, r1, r2))
 
-            # Candidate details
-            st.subheader("5. Candidate details & why-cards")
-            for (name, score, tech, l2r, r2l, rs) in scored:
-                with st.expander(f"{name} — Hybrid {score:.2f}%"):
-                    score2, covers, norms, tech2, l2r2, r2l2 = hybrid(
-                        role, jd_text, rs, alpha=alpha, beta=beta
-                    )
-                    st.markdown(
-                        f"**Tech**: {tech2:.1f} &nbsp;&nbsp; "
-                        f"**L→R**: {l2r2:.1f} &nbsp;&nbsp; "
-                        f"**R→L**: {r2l2:.1f} &nbsp;&nbsp; "
-                        f"**Hybrid**: {score2:.2f}%"
-                    )
+    st.markdown(f"### ✅ Interview shortlist (Hybrid ≥ {cutoff:.0f}%, top {topk})")
+    if not top_rows:
+        st.write("_No candidates reached the threshold._")
+    else:
+        st.markdown("\n".join(
+            f"{i}. **{name}** — Hybrid: {score:.2f}% | "
+            f"Tech: {tech:.1f} | L→R: {l2r:.1f} | R→L: {r2l:.1f}"
+            for i, (name, score, tech, l2r, r2l) in enumerate(top_rows, 1)
+        ))
+
+    st.markdown("### ❌ Rejected")
+    if not rejected:
+        st.write("_None_")
+    else:
+        st.markdown("\n".join(
+            f"- **{name}** — Hybrid: {score:.2f}% "
+            f"(Tech: {tech:.1f}, L→R: {l2r:.1f}, R→L: {r2l:.1f}; weakest={'L→R' if l2r < r2l else 'R→L'})"
+            for name, score, tech, l2r, r2l in rejected
+        ))
+
+    sheet: Optional[ScoreSheet] = ranked["sheet"]
+    if sheet is not None and len(sheet) > 1:
+        with st.expander("Alpha / β sensitivity of the shortlist"):
+            if st.checkbox("Sweep the alpha × β grid", key="sweep"):
+                sweep = sheet.sweep(topk, cutoff=cutoff)
+                st.caption(
+                    f"{len(sweep['alphas'])} α × {len(sweep['betas'])} β values: "
+                    f"{sweep['top_sets']} distinct top-{topk} shortlist(s)."
+                )
+                st.markdown("**Shortlisted at every setting:** " + (", ".join(sweep["always"]) or "_nobody_"))
+                st.markdown("**Enter or leave the shortlist:** " + (", ".join(sweep["sometimes"]) or "_nobody_"))
+                st.dataframe(
+                    [
+                        {
+                            "Candidate": sheet.names[i],
+                            "Shortlisted (share of grid)": round(float(sweep["top_share"][i]), 3),
+                            "Best rank": int(sweep["best_rank"][i]),
+                            "Worst rank": int(sweep["worst_rank"][i]),
+                        }
+                        for i in np.argsort(sweep["best_rank"], kind="stable")
+                    ],
+                    use_container_width=True,
+                )
 
-                    st.markdown("**Area coverage (weight, supply/θ → coverage)**")
-                    weights = ROLE_WEIGHTS[role]
-                    for a, w in weights.items():
-                        cov = covers.get(a, 0.0)
-                        norm = norms.get(a, 0.0)
-                        st.write(
-                            f"- `{a}` — weight={w:.2f}, supply/θ={norm:.2f}, covered={cov:.2f}"
-                        )
-
-                    if show_reasoning:
-                        st.markdown("**Why-cards (evidence snippets)**")
-                        area_skills: Dict[str, List[SkillItem]] = defaultdict(list)
-                        area_map = TAXONOMY[role]
-                        rev = defaultdict(list)
-                        for area, skills in area_map.items():
-                            for s in skills:
-                                rev[s.lower()].append(area)
-                        for sk in rs.skills:
-                            if sk.name.lower() in rev:
-                                for a in rev[sk.name.lower()]:
-                                    area_skills[a].append(sk)
-
-                        for a in ROLE_WEIGHTS[role].keys():
-                            st.write(f"- **{a}**")
-                            if not area_skills[a]:
-                                st.write("  - (no evidence)")
-                                continue
-                            shown = 0
-                            for sk in area_skills[a]:
-                                st.write(f"  - `{sk.name}` (depth={depth(sk):.2f})")
-                                for s_snip in sk.evidence_snippets[:2]:
-                                    st.code(s_snip)
-                                shown += 1
-                                if shown >= 3:
-                                    break
+    # Candidate details: an expander only builds its body once "Show details" is ticked
+    st.subheader("5. Candidate details & why-cards")
+    seen: Dict[str, int] = defaultdict(int)
+    for row in scored:
+        seen[row.name] += 1
+        with st.expander(f"{row.name} — Hybrid {row.score:.2f}%"):
+            if st.checkbox("Show details", key=f"details::{row.name}::{seen[row.name]}"):
+                st.markdown(_details_markdown(ctx, row, show_reasoning))
 
 if __name__ == "__main__":
     main()
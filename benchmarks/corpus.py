@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Deterministic synthetic resumes / JDs for the four DEFAULT_TAXONOMY roles.
+
+Same seed + parameters -> byte-identical corpus, so benchmark runs are comparable.
+
+Run:
+    python benchmarks/corpus.py --out /tmp/corpus --resumes 200 --density 0.4 --size 20 --pdf
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import DEFAULT_TAXONOMY, ROLE_HINTS  # noqa: E402
+
+ROLES = list(DEFAULT_TAXONOMY)
+
+FIRST = ["Ada", "Grace", "Alan", "Linus", "Barbara", "Ken", "Margaret", "Dennis", "Radia", "Guido", "Frances", "Edsger"]
+LAST = ["Lovelace", "Hopper", "Turing", "Torvalds", "Liskov", "Thompson", "Hamilton", "Ritchie", "Perlman", "Rossum"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Soylent"]
+VERBS = ["Built", "Led", "Owned", "Shipped", "Designed", "Migrated", "Maintained", "Scaled", "Improved", "Introduced"]
+FILLER = [
+    "Worked closely with design and product to deliver features on a two week cadence.",
+    "Mentored junior engineers and ran weekly knowledge-sharing sessions.",
+    "Reduced operating costs by consolidating duplicated services.",
+    "Wrote internal documentation and onboarding guides for new hires.",
+    "Participated in on-call rotation and post-incident reviews.",
+    "Presented quarterly results to leadership and partner teams.",
+    "Partnered with customer support to triage and resolve escalations.",
+    "Drove hiring for the team, interviewing more than fifty candidates.",
+]
+NEGATED = ["no experience with", "not familiar with", "beginner in", "basic knowledge of"]
+
+class Resume(NamedTuple):
+    name: str
+    role: str
+    lines: List[str]
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+def _role_skills(role: str) -> List[str]:
+    return sorted({s for skills in DEFAULT_TAXONOMY[role].values() for s in skills})
+
+def make_resume(rng: random.Random, idx: int, role: str, density: float = 0.4, size: int = 20) -> Resume:
+    """
+    One resume for `role`: `density` is the share of the role's taxonomy skills it
+    mentions, `size` the number of experience bullets (roughly 80 chars each).
+    """
+    skills = _role_skills(role)
+    chosen = rng.sample(skills, max(1, round(density * len(skills))))
+    others = [s for r in ROLES if r != role for s in _role_skills(r) if s not in skills]
+    off_role = rng.sample(others, min(2, len(others)))
+    person = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+
+    lines = [
+        person,
+        f"{person.lower().replace(' ', '.')}{idx}@example.com",
+        f"Summary: {role.replace('_', ' ')} professional with {rng.randint(1, 15)} years of experience.",
+        "Experience",
+    ]
+    year = 2024
+    for bullet in range(size):
+        if bullet % 5 == 0:
+            start = year - rng.randint(1, 4)
+            lines.append(f"{rng.choice(COMPANIES)} - {start}-{year}")
+            year = start
+        if rng.random() < 0.6:
+            used = rng.sample(chosen + off_role, min(len(chosen + off_role), rng.randint(1, 3)))
+            lines.append(f"- {rng.choice(VERBS)} services using {', '.join(used)} in production.")
+        else:
+            lines.append(f"- {rng.choice(FILLER)}")
+    if rng.random() < 0.2:
+        lines.append(f"Note: {rng.choice(NEGATED)} {rng.choice(others)}.")
+    lines.append("Skills: " + ", ".join(chosen))
+    lines.append("Education: B.Sc. Computer Science")
+    return Resume(f"resume_{idx:05d}_{role}", role, lines)
+
+def make_jd(rng: random.Random, role: str, density: float = 0.4) -> str:
+    hints = [h for h in ROLE_HINTS[role] if " " in h or len(h) > 3]
+    wanted = rng.sample(_role_skills(role), max(1, round(density * len(_role_skills(role)))))
+    lines = [
+        f"We are hiring a {rng.choice(hints)} to join our team.",
+        "Responsibilities:",
+        *[f"- {rng.choice(VERBS)} systems with {s}." for s in wanted[: len(wanted) // 2]],
+        "Requirements:",
+        *[f"- Hands-on experience with {s}." for s in wanted[len(wanted) // 2:]],
+        f"- {rng.choice(FILLER)}",
+    ]
+    return "\n".join(lines)
+
+def make_corpus(n: int, seed: int = 0, density: float = 0.4, size: int = 20) -> Tuple[Dict[str, str], List[Resume]]:
+    """One JD per role and `n` resumes spread round-robin over the roles."""
+    rng = random.Random(seed)
+    jds = {role: make_jd(rng, role, density) for role in ROLES}
+    resumes = [make_resume(rng, i, ROLES[i % len(ROLES)], density, size) for i in range(n)]
+    return jds, resumes
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode("latin-1", errors="replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def pdf_bytes(lines: List[str], lines_per_page: int = 50) -> bytes:
+    """Minimal uncompressed PDF (Helvetica, one text line per row) that pdfminer / PyPDF2 can read."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objs: List[bytes] = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    pages_id = 1 + 2 * len(pages) + 1
+    page_ids = []
+    for page in pages:
+        stream = ("BT /F1 10 Tf 50 780 Td 14 TL " + " ".join(f"({_pdf_escape(l)}) '" for l in page) + " ET").encode("latin-1")
+        objs.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objs.append(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R"
+            b" /Resources << /Font << /F1 1 0 R >> >> >>" % (pages_id, len(objs))
+        )
+        page_ids.append(len(objs))
+    objs.append(b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % p for p in page_ids) + b"] /Count %d >>" % len(page_ids))
+    objs.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, len(objs), xref)
+    return bytes(out)
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Write a synthetic resume/JD corpus to disk.")
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--resumes", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--density", type=float, default=0.4, help="share of role skills per resume / JD")
+    ap.add_argument("--size", type=int, default=20, help="experience bullets per resume")
+    ap.add_argument("--pdf", action="store_true", help="write resumes as PDF instead of TXT")
+    args = ap.parse_args(argv)
+
+    out = Path(args.out)
+    (out / "resumes").mkdir(parents=True, exist_ok=True)
+    jds, resumes = make_corpus(args.resumes, args.seed, args.density, args.size)
+    for role, jd in jds.items():
+        (out / f"jd_{role}.txt").write_text(jd, encoding="utf-8")
+    for r in resumes:
+        if args.pdf:
+            (out / "resumes" / f"{r.name}.pdf").write_bytes(pdf_bytes(r.lines))
+        else:
+            (out / "resumes" / f"{r.name}.txt").write_text(r.text, encoding="utf-8")
+    print(f"wrote {len(resumes)} resumes and {len(jds)} JDs to {out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
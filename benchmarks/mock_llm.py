@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Local stand-in for the OpenAI chat completions endpoint, for benchmarking the LLM path.
+
+Answers resume-parsing prompts (single and batched, plain and streamed) with the
+taxonomy skills that literally occur in each resume, and JD-suggestion prompts
+with one role per requested slot built from the group's top skills, after a
+fixed latency.
+Failures can be injected: scripted (`fail_next`) or at random (`fail_rate`),
+as an HTTP error status with an optional Retry-After header.
+
+Run:
+    python benchmarks/mock_llm.py --port 8089 --latency 0.2
+    python benchmarks/mock_llm.py --fail-rate 0.2 --fail-status 429 --retry-after 1
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 ...
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import DEFAULT_TAXONOMY  # noqa: E402
+
+SKILLS = sorted({s for areas in DEFAULT_TAXONOMY.values() for skills in areas.values() for s in skills})
+BATCH_RE = re.compile(r"<<<RESUME id=(\d+)>>>\n(.*?)\n<<<END id=\1>>>", re.S)
+SUGGEST_RE = re.compile(r"^CANDIDATE GROUP SKILLS:\n")
+
+def parse_resume(text: str) -> Dict[str, object]:
+    lowered = text.lower()
+    skills = []
+    for s in SKILLS:
+        at = lowered.find(s)
+        if at >= 0:
+            snippet = text[max(0, at - 40):at + len(s) + 40].replace("\n", " ")
+            skills.append({"name": s, "level_hint": "intermediate", "evidence_snippets": [snippet]})
+    return {"identity": {"name": [text.split("\n", 1)[0]], "emails": []}, "roles": [], "skills": skills}
+
+def suggest_roles(system: str, user: str) -> List[Dict[str, str]]:
+    m = re.search(r"Propose (\d+) suitable", system)
+    n = int(m.group(1)) if m else 1
+    skills = re.findall(r"^- ([^:]+):", user, re.M)
+    lead = skills[0] if skills else "software"
+    return [
+        {"role": f"{lead.title()} Engineer {i + 1}", "jd": "We are hiring for: " + ", ".join(skills) + "."}
+        for i in range(n)
+    ]
+
+def completion_for(messages: List[Dict[str, str]]) -> str:
+    user = messages[-1]["content"]
+    if SUGGEST_RE.match(user):
+        return json.dumps(suggest_roles(messages[0]["content"], user))
+    blocks = BATCH_RE.findall(user)
+    if blocks:
+        return json.dumps([dict(parse_resume(text), id=int(i)) for i, text in blocks])
+    return json.dumps(parse_resume(user))
+
+class MockLLM:
+    """
+    Threaded server; `stats` counts requests, injected failures and total completion
+    characters. Requests answered with an injected failure count as requests too.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        stream_chunk: int = 64,
+        fail_rate: float = 0.0,
+        fail_status: int = 429,
+        retry_after: Optional[str] = None,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.stream_chunk = stream_chunk
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.stats = {"requests": 0, "failures": 0, "chars": 0}
+        self._faults: "deque[Tuple[int, Optional[str]]]" = deque()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def fail_next(self, status: int, times: int = 1, retry_after: Optional[str] = None) -> None:
+        """Answer the next `times` requests with HTTP `status` (and Retry-After, if given)."""
+        with self._lock:
+            self._faults.extend([(status, retry_after)] * times)
+
+    def _fault(self) -> Optional[Tuple[int, Optional[str]]]:
+        with self._lock:
+            self.stats["requests"] += 1
+            if self._faults:
+                fault = self._faults.popleft()
+            elif self.fail_rate and self._rng.random() < self.fail_rate:
+                fault = (self.fail_status, self.retry_after)
+            else:
+                return None
+            self.stats["failures"] += 1
+            return fault
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                fault = mock._fault()
+                if fault is not None:
+                    status, retry_after = fault
+                    out = json.dumps({"error": {"message": f"injected failure {status}"}}).encode("utf-8")
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(out)))
+                    if retry_after is not None:
+                        self.send_header("Retry-After", retry_after)
+                    self.end_headers()
+                    self.wfile.write(out)
+                    return
+                content = completion_for(body.get("messages", []))
+                with mock._lock:
+                    mock.stats["chars"] += len(content)
+                time.sleep(mock.latency)
+                if body.get("stream"):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    for k in range(0, len(content), mock.stream_chunk):
+                        delta = {"choices": [{"delta": {"content": content[k:k + mock.stream_chunk]}}]}
+                        self.wfile.write(b"data: " + json.dumps(delta).encode("utf-8") + b"\n\n")
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.close_connection = True
+                    return
+                out = json.dumps({
+                    "choices": [{"message": {"role": "assistant", "content": content}}],
+                    "usage": {"total_tokens": len(content) // 4},
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+        return Handler
+
+    def __enter__(self) -> "MockLLM":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Serve a mock chat completions API.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="share of requests answered with --fail-status")
+    ap.add_argument("--fail-status", type=int, default=429)
+    ap.add_argument("--retry-after", help="Retry-After header sent with injected failures")
+    args = ap.parse_args(argv)
+    with MockLLM(
+        args.host, args.port, args.latency,
+        fail_rate=args.fail_rate, fail_status=args.fail_status, retry_after=args.retry_after,
+    ) as mock:
+        print(f"mock LLM on {mock.base_url}", file=sys.stderr)
+        try:
+            mock.thread.join()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+TalentIQ benchmark harness - times each scoring stage on a synthetic corpus.
+
+Stages: load_pdf_text, config_from_jd, regex_extract_resume, hybrid, score_all,
+and the LLM path (single + batched parsing) against a local mock server.
+The parse cache is disabled so every run does the real work.
+
+Run:
+    python benchmarks/run.py --resumes 400 --out bench.json
+    python benchmarks/run.py --resumes 400 --baseline bench.json --fail-over 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+os.environ["TALENTIQ_CACHE"] = "0"  # before app is imported: time real work, not cache hits
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import app  # noqa: E402
+from corpus import make_corpus, pdf_bytes  # noqa: E402
+from mock_llm import MockLLM  # noqa: E402
+
+STAGES = ["load_pdf_text", "config_from_jd", "regex_extract_resume", "hybrid", "score_all", "llm_single", "llm_batch"]
+OPT_IN_STAGES = ["process_crossover"]  # slow; run with --stages process_crossover
+CROSSOVER_SIZES = [32, 64, 128, 256, 512, 1024]
+
+def timed(fn: Callable[[], object], items: int, repeat: int, warmup: int = 1) -> Dict[str, object]:
+    for _ in range(warmup):
+        fn()
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    median = statistics.median(runs)
+    return {
+        "items": items,
+        "runs_s": [round(r, 6) for r in runs],
+        "min_s": round(min(runs), 6),
+        "median_s": round(median, 6),
+        "per_item_ms": round(1000.0 * median / max(1, items), 4),
+        "items_per_s": round(items / median, 1) if median > 0 else None,
+    }
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def run_stages(args) -> Dict[str, Dict[str, object]]:
+    jds, corpus = make_corpus(args.resumes, args.seed, args.density, args.size)
+    jd_text = jds[args.role]
+    resumes = [(r.name, r.text) for r in corpus]
+    config = app.resolve_config("auto", jd_text)
+    ctx = app.build_scoring_context(config, jd_text)
+    wanted = set(args.stages)
+    results: Dict[str, Dict[str, object]] = {}
+
+    def log(stage: str) -> None:
+        r = results[stage]
+        print(f"{stage:<22} {r['median_s'] * 1000:10.2f} ms  {r['per_item_ms']:9.3f} ms/item  ({r['items']} items)", file=sys.stderr)
+
+    if "load_pdf_text" in wanted:
+        with tempfile.TemporaryDirectory(prefix="talentiq-bench-") as tmp:
+            paths = []
+            for r in corpus[: args.pdfs]:
+                path = Path(tmp) / f"{r.name}.pdf"
+                path.write_bytes(pdf_bytes(r.lines))
+                paths.append(str(path))
+            results["load_pdf_text"] = timed(lambda: [app.load_pdf_text(p) for p in paths], len(paths), args.repeat)
+        log("load_pdf_text")
+
+    if "config_from_jd" in wanted:
+        texts = list(jds.values())
+        clear = getattr(app, "_analyze_jd_line", None)
+
+        def derive():
+            for jd in texts:
+                if clear is not None:
+                    clear.cache_clear()  # measure a cold JD, not the per-line memo
+                app.config_from_jd(jd)
+
+        results["config_from_jd"] = timed(derive, len(texts), args.repeat)
+        log("config_from_jd")
+
+    structs = [app.regex_extract_resume(txt, config) for _, txt in resumes]
+    if "regex_extract_resume" in wanted:
+        results["regex_extract_resume"] = timed(
+            lambda: [app.regex_extract_resume(txt, config) for _, txt in resumes], len(resumes), args.repeat
+        )
+        log("regex_extract_resume")
+
+    if "hybrid" in wanted:
+        results["hybrid"] = timed(
+            lambda: [app.hybrid(ctx, rs, alpha=0.4, beta=1.5) for rs in structs], len(structs), args.repeat
+        )
+        log("hybrid")
+
+    if "score_all" in wanted:
+        results["score_all"] = timed(
+            lambda: app.score_all(ctx, resumes, use_llm=False, executor=args.executor, max_workers=args.workers),
+            len(resumes),
+            args.repeat,
+        )
+        log("score_all")
+
+    if "process_crossover" in wanted:
+        results["process_crossover"] = process_crossover(args)
+
+    llm_stages = wanted & {"llm_single", "llm_batch"}
+    if llm_stages and app.httpx is None:
+        print("[warn] httpx not installed: skipping the LLM stages", file=sys.stderr)
+    elif llm_stages:
+        subset = resumes[: args.llm_resumes]
+        with MockLLM(latency=args.llm_latency) as mock:
+            enabled, client = app.LLM_ENABLED, app._LLM_CLIENT
+            app.LLM_ENABLED = True
+            app._LLM_CLIENT = app.LLMClient(api_key="bench", base_url=mock.base_url, rpm=10 ** 6, tpm=10 ** 9)
+            try:
+                if "llm_single" in wanted:
+                    results["llm_single"] = timed(
+                        lambda: [app.llm_extract_resume(txt, enabled=True) for _, txt in subset], len(subset), args.repeat
+                    )
+                    log("llm_single")
+                if "llm_batch" in wanted:
+                    before = mock.stats["requests"]
+                    results["llm_batch"] = timed(
+                        lambda: app.score_all(ctx, subset, use_llm=True, executor="serial", max_workers=args.workers),
+                        len(subset),
+                        args.repeat,
+                    )
+                    results["llm_batch"]["requests_per_run"] = (mock.stats["requests"] - before) / (args.repeat + 1)
+                    log("llm_batch")
+            finally:
+                app.LLM_ENABLED, app._LLM_CLIENT = enabled, client
+    return results
+
+def process_crossover(args) -> Dict[str, object]:
+    """
+    score_all on a warm process pool vs serially, per batch size. `crossover` is the
+    smallest size at which the pool wins; PROCESS_POOL_MIN_BATCH is set from it.
+    """
+    jds, corpus = make_corpus(max(args.crossover_sizes), args.seed, args.density, args.size)
+    jd_text = jds[args.role]
+    ctx = app.build_scoring_context(app.resolve_config("auto", jd_text), jd_text)
+    resumes = [(r.name, r.text) for r in corpus]
+    min_batch, app.PROCESS_POOL_MIN_BATCH = app.PROCESS_POOL_MIN_BATCH, 0  # always use the pool here
+    sizes: Dict[str, Dict[str, float]] = {}
+    crossover = None
+    try:
+        for n in sorted(args.crossover_sizes):
+            batch = resumes[:n]
+            row = {}
+            for executor in ("serial", "process"):
+                t = timed(
+                    lambda: app.score_all(ctx, batch, use_llm=False, executor=executor, max_workers=args.workers),
+                    n,
+                    args.repeat,
+                )
+                row[f"{executor}_median_s"] = t["median_s"]
+            row["speedup"] = round(row["serial_median_s"] / row["process_median_s"], 3)
+            sizes[str(n)] = row
+            if crossover is None and row["speedup"] > 1.0:
+                crossover = n
+            print(f"process_crossover n={n:<6} serial {row['serial_median_s'] * 1000:9.2f} ms"
+                  f"  process {row['process_median_s'] * 1000:9.2f} ms  x{row['speedup']:.2f}", file=sys.stderr)
+    finally:
+        app.PROCESS_POOL_MIN_BATCH = min_batch
+    return {"workers": args.workers, "cpus": os.cpu_count(), "sizes": sizes, "crossover": crossover}
+
+def compare(results: Dict[str, Dict[str, object]], baseline: Dict[str, object], fail_over: float) -> Dict[str, Dict[str, object]]:
+    """median(current) / median(baseline) per stage; > 1 + fail_over counts as a regression."""
+    out: Dict[str, Dict[str, object]] = {}
+    base_stages = baseline.get("stages", {})
+    for stage, cur in results.items():
+        base = base_stages.get(stage)
+        if not base or not base.get("per_item_ms") or "per_item_ms" not in cur:
+            continue
+        ratio = cur["per_item_ms"] / base["per_item_ms"]
+        out[stage] = {
+            "baseline_per_item_ms": base["per_item_ms"],
+            "per_item_ms": cur["per_item_ms"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1.0 + fail_over,
+        }
+    return out
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the TalentIQ scoring pipeline.")
+    ap.add_argument("--resumes", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--density", type=float, default=0.4, help="share of role skills per resume / JD")
+    ap.add_argument("--size", type=int, default=20, help="experience bullets per resume")
+    ap.add_argument("--role", default="backend", choices=list(app.DEFAULT_TAXONOMY), help="JD to score against")
+    ap.add_argument("--pdfs", type=int, default=50, help="resumes rendered to PDF for load_pdf_text")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--executor", default="serial", choices=["auto", "serial", "thread", "process"])
+    ap.add_argument("--workers", type=int, default=app.DEFAULT_CONCURRENCY)
+    ap.add_argument("--llm-resumes", type=int, default=32)
+    ap.add_argument("--llm-latency", type=float, default=0.05, help="mock server seconds per request")
+    ap.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES + OPT_IN_STAGES)
+    ap.add_argument("--crossover-sizes", type=int, nargs="+", default=CROSSOVER_SIZES, help="batch sizes for process_crossover")
+    ap.add_argument("--out", help="write results JSON here (default stdout)")
+    ap.add_argument("--baseline", help="results JSON of an earlier run to compare against")
+    ap.add_argument("--fail-over", type=float, default=0.15, help="exit 1 if a stage is this much slower per item")
+    args = ap.parse_args(argv)
+
+    report: Dict[str, object] = {
+        "meta": {
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": getattr(app.np, "__version__", None),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "params": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+        },
+        "stages": run_stages(args),
+    }
+
+    regressions: List[str] = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        report["baseline"] = {"git": baseline.get("meta", {}).get("git"), "file": args.baseline}
+        report["comparison"] = compare(report["stages"], baseline, args.fail_over)
+        for stage, c in report["comparison"].items():
+            flag = "  REGRESSION" if c["regression"] else ""
+            print(f"{stage:<22} x{c['ratio']:.3f} vs baseline{flag}", file=sys.stderr)
+            if c["regression"]:
+                regressions.append(stage)
+
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+TalentIQ headless batch scorer - rank directories / tarballs of resumes against a JD.
+
+Run:
+    python cli.py --jd jd.txt resumes/ > ranked.jsonl
+    python cli.py --jd jd.txt archive.tar.gz --format csv --top 20 --cutoff 70 -o shortlist.csv
+    python cli.py --jd jd.txt resumes/ --journal runs.sqlite3 --run-id nightly   # rerun to resume after a crash
+    python cli.py --journal runs.sqlite3 --run-id nightly --status --top 20      # ranking so far
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import tarfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import app
+
+RESUME_SUFFIXES = (".pdf", ".txt")
+FIELDS = ["rank", "candidate", "hybrid", "tech", "l2r", "r2l", "skills"]
+
+def iter_resume_files(paths: List[str]) -> Iterator[Tuple[str, bytes]]:
+    """(name, bytes) for every PDF/TXT under the given directories, tarballs and files."""
+    for p in paths:
+        path = Path(p)
+        if path.is_dir():
+            for f in sorted(path.rglob("*")):
+                if f.is_file() and f.suffix.lower() in RESUME_SUFFIXES:
+                    yield str(f.relative_to(path)), f.read_bytes()
+        elif path.is_file() and tarfile.is_tarfile(path):
+            with tarfile.open(path) as tar:
+                for member in tar:
+                    if member.isfile() and member.name.lower().endswith(RESUME_SUFFIXES):
+                        yield member.name, tar.extractfile(member).read()
+        elif path.is_file() and path.suffix.lower() in RESUME_SUFFIXES:
+            yield path.name, path.read_bytes()
+        else:
+            print(f"[warn] skipping {p}: not a directory, tarball, PDF or TXT", file=sys.stderr)
+
+def resume_text(name: str, data: bytes) -> str:
+    if name.lower().endswith(".pdf"):
+        return app.load_pdf_bytes(data).text
+    return data.decode("utf-8", errors="ignore")
+
+def chunked(items: Iterator, size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def record(row: "app.ScoredRow") -> Dict[str, object]:
+    return {
+        "candidate": row.name,
+        "hybrid": row.score,
+        "tech": row.tech,
+        "l2r": row.l2r,
+        "r2l": row.r2l,
+        "skills": sorted({sk.name for sk in row.struct.skills}),
+    }
+
+class RecordWriter:
+    """JSONL or CSV output, flushed per record so results stream to the consumer."""
+
+    def __init__(self, out, fmt: str):
+        self.out = out
+        self.fmt = fmt
+        self.csv = None
+        if fmt == "csv":
+            self.csv = csv.DictWriter(out, fieldnames=FIELDS)
+            self.csv.writeheader()
+
+    def write(self, rec: Dict[str, object]) -> None:
+        if self.csv is not None:
+            self.csv.writerow({**rec, "skills": ";".join(rec["skills"])})
+        else:
+            self.out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self.out.flush()
+
+def parse_args(argv=None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Rank resumes against a job description without the Streamlit UI.")
+    ap.add_argument("inputs", nargs="*", help="directories, .tar/.tar.gz archives or single PDF/TXT files")
+    ap.add_argument("--jd", help="job description text file")
+    ap.add_argument("--role", default="auto", choices=["auto", "frontend", "backend", "data_science", "product"])
+    ap.add_argument("--alpha", type=float, default=0.4, help="blend Tech vs Fβ (default 0.4)")
+    ap.add_argument("--beta", type=float, default=1.5, help="Fβ weighting (default 1.5)")
+    ap.add_argument("--cutoff", type=float, default=0.0, help="drop candidates scoring below this")
+    ap.add_argument(
+        "--top", type=int, default=0,
+        help="keep only the best K (uses the early-terminating shortlist: exact with --no-llm; with the LLM parser"
+        " a candidate credited with skills not written in the resume can be missed)",
+    )
+    ap.add_argument("--no-llm", action="store_true", help="regex parsing only")
+    ap.add_argument("--executor", default="auto", choices=["auto", "serial", "thread", "process"])
+    ap.add_argument("--workers", type=int, default=app.DEFAULT_CONCURRENCY)
+    ap.add_argument("--chunk", type=int, default=256, help="resumes held in memory at once")
+    ap.add_argument("--format", default="jsonl", choices=["jsonl", "csv"])
+    ap.add_argument("--unordered", action="store_true", help="write each result as soon as it is scored (no rank)")
+    ap.add_argument("-o", "--output", default="-", help="output file (default stdout)")
+    ap.add_argument("--metrics", help="write Prometheus-format stage timings/counters here at the end ('-' = stderr)")
+    ap.add_argument("--journal", help="checkpoint every scored resume to this SQLite file; rerunning resumes the run")
+    ap.add_argument("--run-id", help="journal run to create or resume (default: derived from the JD, settings and inputs)")
+    ap.add_argument("--status", action="store_true", help="print the journal run's progress and ranking so far, then exit")
+    args = ap.parse_args(argv)
+    if args.status and not (args.journal and args.run_id):
+        ap.error("--status needs --journal and --run-id")
+    if not args.status and not (args.inputs and args.jd):
+        ap.error("inputs and --jd are required")
+    if args.top and args.unordered:
+        ap.error("--top needs the whole ranking before it can write anything; drop --unordered")
+    return args
+
+def default_run_id(signature: str, inputs: List[str]) -> str:
+    """Same JD, settings and input paths -> same run, so rerunning after a crash resumes it."""
+    paths = [str(Path(p).resolve()) for p in inputs]
+    return app.content_key(signature.encode("utf-8"), *paths)[:16]
+
+def print_status(args: argparse.Namespace) -> int:
+    journal = app.RunJournal(Path(args.journal))
+    progress = journal.progress(args.run_id)
+    print(f"[talentiq] run {args.run_id}: " + ", ".join(f"{k} {v}" for k, v in progress.items()), file=sys.stderr)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    writer = RecordWriter(out, args.format)
+    try:
+        rank = 0
+        for row in journal.rows(args.run_id, limit=args.top or None):
+            if row.score >= args.cutoff:
+                rank += 1
+                writer.write({"rank": rank, **record(row)})
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.status:
+        return print_status(args)
+    if args.metrics:
+        app.METRICS.enabled = True
+    jd_text = Path(args.jd).read_text(encoding="utf-8", errors="ignore")
+    config = app.resolve_config(args.role, jd_text)
+    ctx = app.build_scoring_context(config, jd_text)
+    use_llm = not args.no_llm
+    print(f"[talentiq] role={config.role} llm={'on' if use_llm and app.LLM_ENABLED else 'off'}", file=sys.stderr)
+    journal = app.RunJournal(Path(args.journal)) if args.journal else None
+    if journal is not None:
+        signature = app.run_signature(ctx, args.alpha, args.beta, use_llm)
+        run_id = args.run_id or default_run_id(signature, args.inputs)
+        try:
+            journal.open_run(run_id, signature)
+        except ValueError as e:
+            print(f"[error] {e}", file=sys.stderr)
+            return 2
+        done = journal.progress(run_id)["done"]
+        print(f"[talentiq] journal run {run_id}" + (f": resuming, {done} already scored" if done else ""), file=sys.stderr)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    writer = RecordWriter(out, args.format)
+    ranked: List[Tuple[float, int, Dict[str, object]]] = []
+    seen_names: Dict[str, int] = {}  # journal: same-named files in different chunks are different items
+    n_in, n_failed, extract_s, score_s = 0, 0, 0.0, 0.0
+    t_start = time.perf_counter()
+
+    def emit(row):
+        if row.score >= args.cutoff:
+            writer.write({"rank": None, **record(row)})
+
+    try:
+        # app reports [warn]s on stdout; keep them out of the JSONL/CSV stream
+        with contextlib.redirect_stdout(sys.stderr):
+            for chunk in chunked(iter_resume_files(args.inputs), max(1, args.chunk)):
+                t0 = time.perf_counter()
+                resumes = []
+                for name, data in chunk:
+                    try:
+                        resumes.append((name, resume_text(name, data)))
+                    except Exception as e:
+                        print(f"[warn] could not read {name}: {e}", file=sys.stderr)
+                        n_failed += 1
+                t1 = time.perf_counter()
+                if args.top and journal is None:
+                    # later chunks only need to beat the current global k-th best
+                    floor = ranked[-1][0] if len(ranked) >= args.top else args.cutoff
+                    rows, stats = app.shortlist(
+                        ctx, resumes, max(args.cutoff, floor), args.top, alpha=args.alpha, beta=args.beta,
+                        use_llm=use_llm, executor=args.executor, max_workers=args.workers,
+                    )
+                    n_failed += stats["failed"]
+                elif journal is not None:
+                    rows, _, errors = app.score_all_journaled(
+                        ctx, resumes, journal, run_id, alpha=args.alpha, beta=args.beta, use_llm=use_llm,
+                        executor=args.executor, max_workers=args.workers,
+                        on_result=emit if args.unordered else None, seen_names=seen_names,
+                    )
+                    n_failed += len(errors)
+                else:
+                    rows, _, errors = app.score_all(
+                        ctx, resumes, alpha=args.alpha, beta=args.beta, use_llm=use_llm,
+                        executor=args.executor, max_workers=args.workers,
+                        on_result=emit if args.unordered else None,
+                    )
+                    n_failed += len(errors)
+                t2 = time.perf_counter()
+                extract_s += t1 - t0
+                score_s += t2 - t1
+
+                if not args.unordered:
+                    for i, row in enumerate(rows):
+                        if row.score >= args.cutoff:
+                            ranked.append((row.score, n_in + i, record(row)))
+                    if args.top:
+                        ranked = sorted(ranked, key=lambda x: (-x[0], x[1]))[:args.top]
+                n_in += len(chunk)
+                elapsed = time.perf_counter() - t_start
+                print(f"[talentiq] {n_in} resumes, {n_in / max(elapsed, 1e-9):.1f}/s", file=sys.stderr)
+
+            if not args.unordered:
+                ranked.sort(key=lambda x: (-x[0], x[1]))
+                for rank, (_, _, rec) in enumerate(ranked, 1):
+                    writer.write({"rank": rank, **rec})
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    total = time.perf_counter() - t_start
+    print(
+        f"[talentiq] done: {n_in} resumes ({n_failed} failed) in {total:.2f}s"
+        f" = {n_in / max(total, 1e-9):.1f} resumes/s (extract {extract_s:.2f}s, score {score_s:.2f}s)",
+        file=sys.stderr,
+    )
+    if args.metrics == "-":
+        sys.stderr.write(app.METRICS.render())
+    elif args.metrics:
+        Path(args.metrics).write_text(app.METRICS.render(), encoding="utf-8")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
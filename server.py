@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+TalentIQ scoring service - a local JSON/HTTP API around the scoring pipeline, for the React app.
+
+Scoring runs on a small pool of worker threads fed by a bounded queue; request
+threads only validate, enqueue and report. A full queue answers 429.
+
+Endpoints:
+    POST /resumes?name=cv.pdf              raw PDF/TXT body -> {"id", "name", "bytes"}
+    POST /jobs                             {"jd", "resumes": [ids], "role", "alpha", "beta", "use_llm"}
+                                           -> 202 {"id", "status", ...} | 429 when the queue is full
+    GET  /jobs/<id>                        status and progress
+    GET  /jobs/<id>/events                 server-sent events: "progress", then "done" / "failed"
+    GET  /jobs/<id>/results?offset=&limit= ranked candidates, one page (partial while running)
+    GET  /health, GET /metrics
+
+Run:
+    python server.py --port 8000 --workers 2 --queue 16
+"""
+
+import argparse
+import json
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import app
+from cli import RESUME_SUFFIXES, record, resume_text
+
+MAX_UPLOAD_BYTES = int(os.getenv("TALENTIQ_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_STORE_BYTES = 512 * 1024 * 1024
+MAX_JOB_RESUMES = 5000
+JOB_HISTORY = 200      # finished jobs kept for polling / results
+PAGE_LIMIT = 200
+SSE_KEEPALIVE_S = 15.0
+ROLES = ("auto", "frontend", "backend", "data_science", "product")
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+class UploadStore:
+    """Uploaded resume bytes by content hash, least recently used evicted past `max_bytes`."""
+
+    def __init__(self, max_bytes: int = UPLOAD_STORE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, name: str, data: bytes) -> str:
+        rid = app.content_key(data, name.rsplit(".", 1)[-1].lower())[:24]
+        with self._lock:
+            if rid in self._items:
+                self._items.move_to_end(rid)
+                return rid
+            self._items[rid] = (name, data)
+            self.size += len(data)
+            while self.size > self.max_bytes and len(self._items) > 1:
+                _, (_, old) = self._items.popitem(last=False)
+                self.size -= len(old)
+        return rid
+
+    def get(self, rid: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            item = self._items.get(rid)
+            if item is not None:
+                self._items.move_to_end(rid)
+            return item
+
+class Job:
+    """One scoring request. Workers update it under `cond`; readers wait on `cond` for changes."""
+
+    def __init__(self, params: Dict[str, object], resumes: List[Tuple[str, bytes]]):
+        self.id = secrets.token_hex(8)
+        self.params = params
+        self.resumes = resumes
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.role: Optional[str] = None
+        self.done = 0
+        self.errors: Dict[str, str] = {}
+        self.records: List[Dict[str, object]] = []   # ranked once finished, arrival order before
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.version = 0
+        self.cond = threading.Condition()
+
+    def _changed(self) -> None:
+        self.version += 1
+        self.cond.notify_all()
+
+    def snapshot(self) -> Dict[str, object]:
+        with self.cond:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "role": self.role,
+                "total": len(self.resumes),
+                "done": self.done,
+                "failed": len(self.errors),
+                "error": self.error,
+                "created": self.created,
+                "started": self.started,
+                "finished": self.finished,
+            }
+
+    def page(self, offset: int, limit: int) -> Dict[str, object]:
+        with self.cond:
+            complete = self.status == "done"
+            ranked = self.records if complete else sorted(self.records, key=lambda r: -r["hybrid"])
+            items = [{"rank": i, **rec} for i, rec in enumerate(ranked[offset:offset + limit], offset + 1)]
+            return {"id": self.id, "status": self.status, "complete": complete, "total": len(ranked),
+                    "offset": offset, "limit": limit, "items": items, "errors": dict(self.errors)}
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in ("done", "failed")
+
+class JobService:
+    """Bounded job queue drained by `workers` threads; finished jobs kept for JOB_HISTORY submissions."""
+
+    def __init__(self, workers: int = 2, queue_size: int = 16, executor: str = "auto"):
+        self.uploads = UploadStore()
+        self.executor = executor
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._queue: "queue.Queue[Job]" = queue.Queue(maxsize=queue_size)
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"talentiq-job-{i}", daemon=True) for i in range(max(1, workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, body: Dict[str, object]) -> Job:
+        jd = body.get("jd")
+        ids = body.get("resumes")
+        if not isinstance(jd, str) or not jd.strip():
+            raise ApiError(400, "'jd' must be a non-empty string")
+        if not isinstance(ids, list) or not ids or len(ids) > MAX_JOB_RESUMES:
+            raise ApiError(400, f"'resumes' must be a list of 1..{MAX_JOB_RESUMES} upload ids")
+        role = body.get("role", "auto")
+        if role not in ROLES:
+            raise ApiError(400, f"'role' must be one of {', '.join(ROLES)}")
+        try:
+            alpha = float(body.get("alpha", 0.4))
+            beta = float(body.get("beta", 1.5))
+        except (TypeError, ValueError):
+            raise ApiError(400, "'alpha' and 'beta' must be numbers")
+        resumes = []
+        for rid in ids:
+            item = self.uploads.get(rid) if isinstance(rid, str) else None
+            if item is None:
+                raise ApiError(400, f"unknown resume id: {rid!r} (upload it to /resumes first)")
+            resumes.append(item)
+        params = {"jd": jd, "role": role, "alpha": alpha, "beta": beta, "use_llm": bool(body.get("use_llm", True))}
+        job = Job(params, resumes)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            app.METRICS.inc("talentiq_service_rejected_total")
+            raise ApiError(429, "job queue is full, retry later", {"Retry-After": "5"})
+        with self._jobs_lock:
+            self.jobs[job.id] = job
+            while len(self.jobs) > JOB_HISTORY:
+                oldest = next(iter(self.jobs.values()))
+                if not oldest.terminal:
+                    break
+                self.jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        with self._jobs_lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            raise ApiError(404, f"no such job: {job_id}")
+        return job
+
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            except Exception as e:
+                with job.cond:
+                    job.status, job.error, job.finished = "failed", f"{type(e).__name__}: {e}", time.time()
+                    job._changed()
+                app.warn("service", f"job {job.id} failed: {job.error}")
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job) -> None:
+        p = job.params
+        with job.cond:
+            job.status, job.started = "running", time.time()
+            job._changed()
+        config = app.resolve_config(p["role"], p["jd"])
+        ctx = app.build_scoring_context(config, p["jd"])
+        resumes = []
+        for name, data in job.resumes:
+            try:
+                resumes.append((name, resume_text(name, data)))
+            except Exception as e:
+                with job.cond:
+                    job.errors[name] = f"could not read: {e}"
+                    job.done += 1
+                    job._changed()
+        with job.cond:
+            job.role = config.role
+            job._changed()
+
+        def on_result(row: app.ScoredRow) -> None:
+            rec = record(row)
+            with job.cond:
+                job.records.append(rec)
+                job.done += 1
+                job._changed()
+
+        rows, _, errors = app.score_all(
+            ctx, resumes, alpha=p["alpha"], beta=p["beta"], use_llm=p["use_llm"],
+            executor=self.executor, on_result=on_result,
+        )
+        with job.cond:
+            job.records = [record(row) for row in rows]
+            job.errors.update(errors)
+            job.done = len(job.resumes)
+            job.status, job.finished = "done", time.time()
+            job._changed()
+
+def make_handler(service: JobService, cors_origin: str):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, payload: object, headers: Optional[Dict[str, str]] = None) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", cors_origin)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self) -> bytes:
+            raw = (self.headers.get("Content-Length") or "0").strip()
+            if not (raw.isascii() and raw.isdigit()):
+                self.close_connection = True   # the unread body would be taken for the next request
+                raise ApiError(400, f"Content-Length must be a non-negative integer, got {raw!r}")
+            length = int(raw)
+            if length > MAX_UPLOAD_BYTES:
+                self.close_connection = True
+                raise ApiError(413, f"body larger than {MAX_UPLOAD_BYTES} bytes")
+            return self.rfile.read(length)
+
+        def _dispatch(self, method: str) -> None:
+            url = urlparse(self.path)
+            parts = [p for p in url.path.split("/") if p]
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                data = self._body() if method == "POST" else b""
+                if method == "POST" and parts == ["resumes"]:
+                    name = query.get("name") or self.headers.get("X-Filename") or ""
+                    if not name.lower().endswith(RESUME_SUFFIXES):
+                        raise ApiError(400, "pass ?name=<file>.pdf or .txt")
+                    self._send(201, {"id": service.uploads.put(name, data), "name": name, "bytes": len(data)})
+                elif method == "POST" and parts == ["jobs"]:
+                    try:
+                        body = json.loads(data or b"{}")
+                    except ValueError:
+                        raise ApiError(400, "body must be JSON")
+                    job = service.submit(body if isinstance(body, dict) else {})
+                    self._send(202, {**job.snapshot(), "queued": service.queued()}, {"Location": f"/jobs/{job.id}"})
+                elif method == "GET" and len(parts) == 2 and parts[0] == "jobs":
+                    self._send(200, service.get(parts[1]).snapshot())
+                elif method == "GET" and len(parts) == 3 and parts[0] == "jobs" and parts[2] == "results":
+                    try:
+                        offset = max(0, int(query.get("offset", 0)))
+                        limit = min(PAGE_LIMIT, max(1, int(query.get("limit", 50))))
+                    except ValueError:
+                        raise ApiError(400, "'offset' and 'limit' must be integers")
+                    self._send(200, service.get(parts[1]).page(offset, limit))
+                elif method == "GET" and len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+                    self._events(service.get(parts[1]))
+                elif method == "GET" and parts == ["health"]:
+                    self._send(200, {"ok": True, "queued": service.queued(), "llm": app.LLM_ENABLED})
+                elif method == "GET" and parts == ["metrics"]:
+                    body = app.METRICS.render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    raise ApiError(404, f"no route for {method} {url.path}")
+            except ApiError as e:
+                self._send(e.status, {"error": str(e)}, e.headers)
+
+        def _events(self, job: Job) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.send_header("Access-Control-Allow-Origin", cors_origin)
+            self.end_headers()
+            self.close_connection = True
+            seen = -1
+            try:
+                while True:
+                    with job.cond:
+                        if job.version == seen:
+                            job.cond.wait(SSE_KEEPALIVE_S)
+                        changed, seen = job.version != seen, job.version
+                    if not changed:
+                        self.wfile.write(b": keepalive\n\n")
+                        self.wfile.flush()
+                        continue
+                    snap = job.snapshot()
+                    event = snap["status"] if job.terminal else "progress"
+                    self.wfile.write(f"event: {event}\ndata: {json.dumps(snap)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    if job.terminal:
+                        return
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_OPTIONS(self):
+            self.send_response(204)
+            self.send_header("Access-Control-Allow-Origin", cors_origin)
+            self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "Content-Type, X-Filename")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    return Handler
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Serve the TalentIQ scoring pipeline over HTTP.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--workers", type=int, default=2, help="jobs scored concurrently")
+    ap.add_argument("--queue", type=int, default=16, help="jobs waiting before submissions get 429")
+    ap.add_argument("--executor", default="auto", choices=["auto", "serial", "thread", "process"])
+    ap.add_argument("--cors-origin", default="*", help="Access-Control-Allow-Origin for the React dev server")
+    ap.add_argument("--metrics", action="store_true", help="collect stage timings / counters for GET /metrics")
+    args = ap.parse_args(argv)
+
+    if args.metrics:
+        app.METRICS.enabled = True
+    service = JobService(args.workers, args.queue, args.executor)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service, args.cors_origin))
+    server.daemon_threads = True
+    print(f"[talentiq] serving on http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
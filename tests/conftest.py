@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+# before app is imported: no shared on-disk cache or store between test runs
+_TMP = tempfile.mkdtemp(prefix="talentiq-tests-")
+os.environ["TALENTIQ_CACHE"] = "0"
+os.environ["TALENTIQ_CACHE_DIR"] = _TMP
+
+import app  # noqa: E402
+from mock_llm import MockLLM  # noqa: E402
+
+@pytest.fixture
+def mock_llm():
+    with MockLLM(latency=0.0) as mock:
+        yield mock
+
+@pytest.fixture
+def llm_client(mock_llm):
+    client = app.LLMClient(
+        api_key="test", base_url=mock_llm.base_url, rpm=10 ** 6, tpm=10 ** 9,
+        max_retries=3, backoff_base=0.01, backoff_cap=2.0,
+    )
+    yield client
+    client.close()
+
+@pytest.fixture
+def llm_enabled(llm_client, monkeypatch):
+    """Route the app's LLM calls to the mock server."""
+    monkeypatch.setattr(app, "LLM_ENABLED", True)
+    monkeypatch.setattr(app, "_LLM_CLIENT", llm_client)
+    return llm_client
+
+@pytest.fixture
+def resume_cache(tmp_path, monkeypatch):
+    """A fresh on-disk parse cache for one test."""
+    cache = app.ResumeCache(tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(app, "CACHE_ENABLED", True)
+    monkeypatch.setattr(app, "_RESUME_CACHE", cache)
+    return cache
@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+
+import pytest
+
+import app
+
+JD = "Backend engineer: Python, Django, PostgreSQL, Redis, Docker and Kubernetes on AWS. Pytest, CI/CD."
+RESUMES = [
+    ("ana", "Backend engineer. Python, Django, PostgreSQL and Redis. Docker, Kubernetes, AWS. Pytest."),
+    ("ben", "Frontend developer. React, TypeScript, Redux, Jest, Webpack."),
+    ("cleo", "Python and PostgreSQL. No experience with Kubernetes."),
+    ("dev", "Java, Spring, MySQL, Docker, Jenkins, GCP."),
+    ("eli", "Data scientist: Python, pandas, scikit-learn, SQL, AWS."),
+    ("fay", ""),
+]
+
+def _square(x, delay=0.0):
+    time.sleep(delay)
+    if x == 3:
+        raise ValueError("three")
+    return x * x
+
+def _offset_pid(base, x):
+    return base + x, os.getpid()
+
+@pytest.fixture
+def any_batch_size(monkeypatch):
+    """Let executor="process" use the pool for the small batches here."""
+    monkeypatch.setattr(app, "PROCESS_POOL_MIN_BATCH", 0)
+
+@pytest.mark.parametrize("executor", ["serial", "thread", "process"])
+def test_results_in_input_order_with_errors_captured(executor, any_batch_size):
+    # later items finish first on the pools
+    items = [(x, 0.02 * (5 - x) if executor == "thread" else 0.0) for x in range(6)]
+    out = app.run_batch(_square, items, executor=executor, max_workers=3)
+    assert [r for r, _ in out] == [0, 1, 4, None, 16, 25]
+    assert [e for _, e in out] == [None, None, None, "ValueError: three", None, None]
+
+def test_on_done_runs_in_caller_thread_once_per_item():
+    seen = []
+    caller = threading.get_ident()
+
+    def on_done(i, result, error):
+        seen.append((i, result, error, threading.get_ident()))
+
+    app.run_batch(_square, [(x,) for x in range(8)], executor="thread", max_workers=4, on_done=on_done)
+    assert sorted(i for i, *_ in seen) == list(range(8))
+    assert all(tid == caller for *_, tid in seen)
+    assert next(err for i, _, err, _ in seen if i == 3) == "ValueError: three"
+
+def test_process_pool_is_reused_and_shared_reaches_every_item(any_batch_size):
+    items = [(x,) for x in range(40)]
+    first = app.run_batch(_offset_pid, items, executor="process", max_workers=2, shared=1000)
+    pool = app._PROCESS_POOLS[2][0]
+    assert [r[0] for r, _ in first] == [1000 + x for x in range(40)]
+    assert os.getpid() not in {r[1] for r, _ in first}
+    # another `shared` than the pool started with: same pool, value sent with the chunks
+    second = app.run_batch(_offset_pid, items, executor="process", max_workers=2, shared=5)
+    assert app._PROCESS_POOLS[2][0] is pool
+    assert [r[0] for r, _ in second] == [5 + x for x in range(40)]
+
+def test_small_process_batches_run_serially(monkeypatch):
+    monkeypatch.setattr(app, "PROCESS_POOL_MIN_BATCH", 10)
+    out = app.run_batch(_offset_pid, [(x,) for x in range(5)], executor="process", max_workers=2, shared=0)
+    assert {pid for (_, pid), _ in out} == {os.getpid()}
+
+def test_auto_scores_serially(monkeypatch):
+    used = []
+    run_batch = app.run_batch
+    monkeypatch.setattr(app, "run_batch", lambda *a, **kw: used.append(kw["executor"]) or run_batch(*a, **kw))
+    ctx = app.build_scoring_context(app.resolve_config("backend", JD), JD)
+    app.score_all(ctx, RESUMES * 200, use_llm=False, executor="auto")
+    assert used == ["serial"]
+
+def test_in_flight_is_bounded_by_max_workers():
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+
+    def work(x):
+        with lock:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        time.sleep(0.01)
+        with lock:
+            state["now"] -= 1
+        return x
+
+    out = app.run_batch(work, [(x,) for x in range(20)], executor="thread", max_workers=3)
+    assert [r for r, _ in out] == list(range(20))
+    assert state["peak"] <= 3
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_pooled_scoring_matches_serial(executor, any_batch_size):
+    ctx = app.build_scoring_context(app.resolve_config("backend", JD), JD)
+    serial = app.score_all(ctx, RESUMES, use_llm=False, executor="serial")
+    assert app.score_all(ctx, RESUMES, use_llm=False, executor=executor, max_workers=3) == serial
+    rows, structs, errors = serial
+    assert rows[0].name == "ana" and not errors
+    assert list(structs) == [app.resume_key(name, txt) for name, txt in RESUMES]
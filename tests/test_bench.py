@@ -0,0 +1,42 @@
+import json
+
+import app
+import run
+
+SMALL = ["--resumes", "12", "--pdfs", "2", "--repeat", "1", "--llm-resumes", "4", "--llm-latency", "0"]
+
+def _bench(tmp_path, *extra):
+    out = tmp_path / "bench.json"
+    code = run.main(SMALL + ["--out", str(out), *extra])
+    return code, json.loads(out.read_text(encoding="utf-8"))
+
+def test_smoke_run_against_mock_llm(tmp_path):
+    before = (app.LLM_ENABLED, app._LLM_CLIENT)
+    code, report = _bench(tmp_path)
+    assert code == 0
+    expected = set(run.STAGES) if app.httpx is not None else set(run.STAGES) - {"llm_single", "llm_batch"}
+    assert set(report["stages"]) == expected
+    assert all(s["per_item_ms"] >= 0 for s in report["stages"].values())
+    assert report["meta"]["params"]["resumes"] == 12
+    assert (app.LLM_ENABLED, app._LLM_CLIENT) == before  # the mock client does not leak out of the run
+
+def test_slower_than_baseline_exits_1(tmp_path):
+    base = tmp_path / "base.json"
+    base.write_text(json.dumps({"stages": {"hybrid": {"per_item_ms": 1e-9}}}), encoding="utf-8")
+    code, report = _bench(tmp_path, "--stages", "hybrid", "--baseline", str(base))
+    assert code == 1
+    assert report["comparison"]["hybrid"]["regression"]
+
+def test_within_baseline_exits_0(tmp_path):
+    base = tmp_path / "base.json"
+    base.write_text(json.dumps({"stages": {"hybrid": {"per_item_ms": 1e9}}}), encoding="utf-8")
+    code, report = _bench(tmp_path, "--stages", "hybrid", "--baseline", str(base))
+    assert code == 0 and not report["comparison"]["hybrid"]["regression"]
+
+def test_process_crossover_reports_each_size(tmp_path):
+    code, report = _bench(tmp_path, "--stages", "process_crossover", "--crossover-sizes", "4", "8", "--workers", "2")
+    out = report["stages"]["process_crossover"]
+    assert code == 0 and set(out["sizes"]) == {"4", "8"}
+    assert all(row["serial_median_s"] > 0 and row["process_median_s"] > 0 for row in out["sizes"].values())
+    assert out["crossover"] in (None, 4, 8)
+    assert app.PROCESS_POOL_MIN_BATCH == int(app.os.getenv("TALENTIQ_PROCESS_MIN_BATCH", "512"))  # restored
@@ -0,0 +1,62 @@
+import time
+
+import app
+
+def _put(cache, key, size, kind="struct"):
+    cache.put(key, "x" * size, kind=kind)
+    time.sleep(0.005)  # distinct last_used stamps
+
+def test_evicts_least_recently_used_first(tmp_path):
+    cache = app.ResumeCache(tmp_path / "c.sqlite3", max_bytes=300)
+    _put(cache, "a", 100)
+    _put(cache, "b", 100)
+    _put(cache, "c", 100)
+    assert cache.get("a") is not None  # a is now the most recently used
+    time.sleep(0.005)
+    _put(cache, "d", 100)
+    assert cache.get("b") is None
+    assert all(cache.get(k) is not None for k in "acd")
+    assert cache.stats()["bytes"] <= 300
+
+def test_invalidate_by_key_kind_or_all(tmp_path):
+    cache = app.ResumeCache(tmp_path / "c.sqlite3")
+    _put(cache, "s1", 5)
+    _put(cache, "s2", 5)
+    _put(cache, "l1", 5, kind="llm")
+    assert cache.invalidate(key="s1") == 1
+    assert cache.invalidate(kind="llm") == 1
+    assert cache.get("s2") is not None
+    assert cache.invalidate() == 1
+    assert cache.stats()["entries"] == 0
+
+def test_cache_is_off_by_default_in_tests():
+    assert app.get_resume_cache() is None
+
+def test_pdf_text_is_served_from_cache(resume_cache, monkeypatch):
+    calls = []
+
+    def pages(data, max_pages):
+        calls.append(data)
+        yield "Jane Doe\nPython"
+
+    monkeypatch.setattr(app, "PDF_BACKENDS", (("fake", pages),))
+    first = app.load_pdf_bytes(b"%PDF-1.4 same bytes")
+    again = app.load_pdf_bytes(b"%PDF-1.4 same bytes")
+    assert (first.backend, again.backend) == ("fake", "cache")
+    assert first.text == again.text == "Jane Doe\nPython"
+    assert len(calls) == 1
+    # the extraction settings are part of the key
+    assert app.load_pdf_bytes(b"%PDF-1.4 same bytes", max_pages=1).backend == "fake"
+
+def test_llm_parse_is_served_from_cache(resume_cache, monkeypatch):
+    text = "Jane Doe\nBackend engineer with Python and PostgreSQL on AWS for six years."
+    rs = app.ResumeStruct(
+        identity={"name": ["Jane Doe"]},
+        roles=[],
+        skills=[app.SkillItem("python", "advanced", None, 6.0, ["Python"])],
+        raw_text="",
+    )
+    resume_cache.put(app.llm_cache_key(text), app.struct_to_json(rs), kind="llm")
+    monkeypatch.setattr(app, "LLM_ENABLED", True)  # no client: only a cache hit can answer
+    parsed = app.llm_extract_resume(text, enabled=True)
+    assert parsed.skills == rs.skills and parsed.raw_text == text
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+import app
+import cli
+from corpus import make_corpus
+
+@pytest.fixture(scope="module")
+def workdir(tmp_path_factory):
+    root = tmp_path_factory.mktemp("cli")
+    jds, corpus = make_corpus(40, seed=3)
+    (root / "resumes").mkdir()
+    for r in corpus:
+        (root / "resumes" / f"{r.name}.txt").write_text(r.text, encoding="utf-8")
+    (root / "jd.txt").write_text(jds["backend"], encoding="utf-8")
+    return root
+
+def _run(workdir, *argv):
+    out = workdir / "out.jsonl"
+    assert cli.main([str(workdir / "resumes"), "--jd", str(workdir / "jd.txt"), "--no-llm", "-o", str(out), *argv]) == 0
+    return [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+
+def test_ranked_output_matches_score_all(workdir):
+    jd = (workdir / "jd.txt").read_text(encoding="utf-8")
+    ctx = app.build_scoring_context(app.resolve_config("auto", jd), jd)
+    resumes = [(n, cli.resume_text(n, d)) for n, d in cli.iter_resume_files([str(workdir / "resumes")])]
+    rows, _, _ = app.score_all(ctx, resumes, use_llm=False, executor="serial")
+    recs = _run(workdir, "--chunk", "7")
+    assert [(r["rank"], r["candidate"], r["hybrid"]) for r in recs] == [
+        (i, row.name, row.score) for i, row in enumerate(rows, 1)
+    ]
+
+def test_top_matches_the_head_of_the_full_ranking(workdir):
+    full = _run(workdir)
+    top = _run(workdir, "--top", "5", "--chunk", "9", "--cutoff", "20")
+    assert top == [r for r in full if r["hybrid"] >= 20][:5]
+
+def test_unordered_writes_every_candidate(workdir):
+    recs = _run(workdir, "--unordered")
+    assert len(recs) == 40 and all(r["rank"] is None for r in recs)
+
+def test_top_with_unordered_is_rejected(workdir, capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli.parse_args([str(workdir / "resumes"), "--jd", str(workdir / "jd.txt"), "--top", "3", "--unordered"])
+    assert exc.value.code == 2
+    assert "--unordered" in capsys.readouterr().err
+
+def test_inputs_and_jd_are_required(capsys):
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--no-llm"])
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--status", "--journal", "runs.sqlite3"])
+
+def test_default_run_id_depends_on_the_inputs(tmp_path):
+    sig = "0" * 64
+    assert cli.default_run_id(sig, ["a", "b"]) == cli.default_run_id(sig, ["a", "b"])
+    assert cli.default_run_id(sig, ["a"]) != cli.default_run_id(sig, ["b"])
+    assert cli.default_run_id(sig, ["a"]) != cli.default_run_id("1" * 64, ["a"])
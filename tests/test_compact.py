@@ -0,0 +1,58 @@
+import pickle
+
+import app
+from corpus import make_corpus
+
+JDS, CORPUS = make_corpus(80, seed=9)
+RESUMES = [(r.name, r.text) for r in CORPUS]
+CONFIG = app.resolve_config("backend", "")
+
+def _ctx(role):
+    return app.build_scoring_context(app.resolve_config("auto", JDS[role]), JDS[role])
+
+def _llm_style(text):
+    """A struct with the fields only an LLM parse fills: levels, dates, years, snippets."""
+    return app.ResumeStruct(
+        identity={"name": ["Jane Doe"], "emails": ["jane@example.com"]},
+        roles=[{"title": "Engineer", "company": "Acme"}],
+        skills=[
+            app.SkillItem("python", "advanced", "2024-01", 5.0, ["Python daily", "not in the text"]),
+            app.SkillItem("docker", "beginner", None, None, [], [(0, 4)]),
+        ],
+        education=[{"degree": "BSc", "institution": "Uni", "year": "2015"}],
+        raw_text=text,
+    )
+
+def test_round_trip_is_lossless():
+    structs = [app.regex_extract_resume(t, CONFIG) for _, t in RESUMES] + [_llm_style("Jane Doe. Python daily.")]
+    for rs in structs:
+        compact = app.CompactResume.from_struct(rs)
+        assert compact.to_struct() == rs
+        assert pickle.loads(pickle.dumps(compact)).to_struct() == rs
+
+def test_compact_rankings_match():
+    for role in sorted(JDS):
+        ctx = _ctx(role)
+        plain, _, _ = app.score_all(ctx, RESUMES, use_llm=False, executor="serial")
+        compact, structs, _ = app.score_all(ctx, RESUMES, use_llm=False, executor="serial", compact=True)
+        assert all(isinstance(s, app.CompactResume) for s in structs.values())
+        assert [(r.name, r.score, r.coverages) for r in compact] == [(r.name, r.score, r.coverages) for r in plain]
+        again = app.rescore_all(ctx, structs)
+        assert [(r.name, r.score) for r in again] == [(r.name, r.score) for r in plain]
+
+def test_evidence_matches_the_struct():
+    rs = _llm_style("Docker and Python daily at Acme.")
+    compact = app.CompactResume.from_struct(rs)
+    for i, sk in enumerate(rs.skills):
+        assert compact.snippets(i) == sk.evidence_snippets
+        assert compact.match_spans(i) == sk.evidence_spans
+
+def test_regex_evidence_snippets_come_from_match_offsets():
+    text = "Senior engineer.\nBuilt services in Python and Django; Python daily."
+    rs = app.regex_extract_resume(text, CONFIG)
+    python = next(sk for sk in rs.skills if sk.name == "python")
+    assert python.evidence_count == 2
+    snippets = app.skill_snippets(python, text)
+    lowered = text.lower()
+    assert snippets == [app.match_snippet(lowered, s, e) for s, e in python.evidence_spans]
+    assert all("python" in s for s in snippets)
@@ -0,0 +1,68 @@
+import dataclasses
+import pickle
+import random
+
+import pytest
+
+import app
+
+JD = "Backend engineer: Python, Django, PostgreSQL, Redis, Docker and Kubernetes on AWS. Pytest, CI/CD."
+DS_JD = """Data Scientist
+We run experiments (A/B tests) and build ML models in Python: pandas, scikit-learn, PyTorch.
+Airflow + Spark pipelines on GCP; dashboards in Tableau."""
+TERMS = sorted(app.JD_TERMS)
+
+def _random_jds(n, seed=0):
+    rng = random.Random(seed)
+    filler = ["we", "build", "and", "with", "team", "the", "(remote)", "-", "/", "5+ years"]
+    jds = [JD, DS_JD]
+    for _ in range(n):
+        words = [rng.choice(TERMS) if rng.random() < 0.4 else rng.choice(filler) for _ in range(rng.randint(5, 80))]
+        jds.append("".join(w + rng.choice([" ", " ", ", ", "\n", ""]) for w in words))
+    return jds
+
+def test_equal_inputs_give_equal_hashable_configs():
+    a = app.resolve_config("auto", JD)
+    b = app.resolve_config("auto", JD)
+    assert a == b and hash(a) == hash(b)
+    assert {a: 1}[b] == 1
+    assert app.resolve_config("frontend", JD) != a
+    assert pickle.loads(pickle.dumps(a)) == a
+
+def test_config_is_frozen_and_detached_from_its_inputs():
+    weights = {role: dict(ws) for role, ws in app.DEFAULT_ROLE_WEIGHTS.items()}
+    taxonomy = {role: {a: list(s) for a, s in areas.items()} for role, areas in app.DEFAULT_TAXONOMY.items()}
+    config = app.ScoringConfig.create("backend", weights, taxonomy, app.DEFAULT_ALIASES)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.role = "frontend"
+    weights["backend"]["databases"] = 0.9
+    taxonomy["backend"]["databases"].append("cobol")
+    config.areas_for("backend")["databases"].append("fortran")
+    assert config == app.resolve_config("backend", "")
+    assert "cobol" not in config.terms and "fortran" not in config.terms
+
+def test_derived_values_are_memoized():
+    config = app.resolve_config("backend", "")
+    assert config.terms is config.terms
+    assert config.canon is config.canon
+    assert config.canon.canon("Postgres") == "postgresql"
+    # equal configs share one compiled matcher
+    twin = app.resolve_config("backend", "")
+    assert app.skill_matcher(config.terms) is app.skill_matcher(twin.terms)
+
+def test_one_pass_counts_match_str_count():
+    for jd in _random_jds(300):
+        lowered = jd.lower()
+        expected = {t: lowered.count(t) for t in TERMS if t in lowered}
+        assert app.analyze_jd(jd).counts == expected
+
+def test_config_is_memoized_by_fingerprint():
+    config = app.resolve_config("auto", DS_JD)
+    assert app.resolve_config("auto", "  " + DS_JD.upper() + "\n") is config
+    assert app.resolve_config("auto", DS_JD + " Kubernetes") is not config
+    assert app.resolve_config("backend", DS_JD) is app.resolve_config("backend", "")
+
+def test_edited_jd_derives_the_same_config_as_a_fresh_one():
+    app.resolve_config("auto", JD)
+    edited = JD + "\nTerraform, Kubernetes and Kafka."
+    assert app.resolve_config("auto", edited) == app.ScoringConfig.create(*app.config_from_jd(edited))
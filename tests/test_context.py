@@ -0,0 +1,63 @@
+import dataclasses
+import random
+import statistics
+
+import pytest
+
+import app
+
+JD = "Backend engineer: Python, Django, PostgreSQL, Redis, Docker and Kubernetes on AWS. Pytest, CI/CD."
+A11Y_JD = "Frontend: React. Accessibility first - WCAG, ARIA and a11y audits."
+
+def _ctx(role, jd_text):
+    return app.build_scoring_context(app.resolve_config(role, jd_text), jd_text)
+
+def _reference(config, jd_text, rs, alpha, beta):
+    """Scoring straight from the config tables, rebuilding every derived value per call."""
+    role = config.role
+    areas = config.areas_for(role)
+    theta = config.theta_for(role)
+    weights = config.weights_for(role)
+    demand = app.jd_demand_from_text(role, jd_text, dict(weights))
+    skillset = {s.lower() for skills in areas.values() for s in skills}
+    supply = {}
+    for area, skills in areas.items():
+        vals = [app.depth(sk) for sk in rs.skills if sk.name.lower() in {s.lower() for s in skills}]
+        supply[area] = statistics.median(vals) if vals else 0.0
+    cov = {a: min(1.0, supply.get(a, 0.0) / max(1e-9, theta[a])) for a in demand}
+    l2r = round(100.0 * sum(demand[a] * cov[a] for a in demand), 1)
+    den = sum(app.depth(sk) for sk in rs.skills)
+    num = sum(app.depth(sk) for sk in rs.skills if sk.name.lower() in skillset)
+    r2l = round(100.0 * num / den, 1) if den else 0.0
+    tech = round(100.0 * sum(w * min(1.0, supply.get(a, 0.0) / max(1e-9, theta[a])) for a, w in weights.items()), 1)
+    raw = (1 - alpha) * tech + alpha * app.fbeta(l2r, r2l, beta=beta)
+    return round(raw * app.negation_penalty(rs.raw_text), 2), tech, l2r, r2l
+
+def _random_struct(rng, role):
+    pool = [s for skills in app.DEFAULT_TAXONOMY[role].values() for s in skills] + ["cobol", "fortran", "excel"]
+    skills = [
+        app.SkillItem(rng.choice(pool), rng.choice(["beginner", "intermediate", "advanced", None]), None, None,
+                      ["x"] * rng.randint(0, 4))
+        for _ in range(rng.randint(0, 12))
+    ]
+    text = " ".join(rng.choice(["python", "no experience with", "go", "sql"]) for _ in range(rng.randint(0, 6)))
+    return app.ResumeStruct(identity={}, roles=[], skills=skills, raw_text=text)
+
+@pytest.mark.parametrize("role,jd", [(role, JD) for role in app.DEFAULT_TAXONOMY] + [("frontend", A11Y_JD)])
+def test_context_scores_match_per_call_scoring(role, jd):
+    rng = random.Random(role)
+    ctx = _ctx(role, jd)
+    for _ in range(200):
+        rs = _random_struct(rng, role)
+        alpha, beta = rng.choice([0.0, 0.4, 1.0]), rng.choice([0.5, 1.5, 3.0])
+        score, _, _, tech, l2r, r2l = app.hybrid(ctx, rs, alpha=alpha, beta=beta)
+        assert (score, tech, l2r, r2l) == _reference(ctx.config, jd, rs, alpha, beta)
+
+def test_context_is_frozen_and_not_changed_by_scoring():
+    ctx = _ctx("backend", JD)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        ctx.role = "frontend"
+    rng = random.Random(1)
+    for _ in range(50):
+        app.hybrid(ctx, _random_struct(rng, "backend"))
+    assert ctx == _ctx("backend", JD)
@@ -0,0 +1,40 @@
+import app
+from corpus import make_corpus
+
+_, CORPUS = make_corpus(30, seed=11, size=40)
+TEXTS = [r.text for r in CORPUS]
+
+def _edited(text):
+    """An agency copy: same CV, one extra line at the bottom."""
+    return text + "\nReferences available on request."
+
+def test_near_duplicates_point_at_the_earliest_copy():
+    texts = TEXTS[:10] + [_edited(TEXTS[3]), TEXTS[7], _edited(TEXTS[3])]
+    rep = app.near_duplicates(texts)
+    assert rep[:10] == list(range(10))
+    assert rep[10:] == [3, 7, 3]
+
+def test_distinct_resumes_are_not_merged():
+    assert app.near_duplicates(TEXTS) == list(range(len(TEXTS)))
+
+def test_duplicate_groups():
+    resumes = [("a", TEXTS[0]), ("b", TEXTS[1]), ("a2", _edited(TEXTS[0])), ("", "")]
+    assert app.duplicate_groups(resumes) == [["a", "a2"]]
+
+def test_each_group_is_parsed_once(llm_enabled, monkeypatch):
+    sent = []
+    batch = app.llm_extract_resumes_batch
+
+    def spy(texts, **kwargs):
+        sent.extend(texts)
+        return batch(texts, **kwargs)
+
+    monkeypatch.setattr(app, "llm_extract_resumes_batch", spy)
+    texts = [TEXTS[0], TEXTS[1], _edited(TEXTS[0]), TEXTS[0]]
+    parsed = app.llm_extract_deduped(texts, enabled=True)
+    assert sent == TEXTS[:2]
+    assert all(p is not None for p in parsed)
+    assert parsed[2] == parsed[0] and parsed[2] is not parsed[0]
+    # the copy is scored against its own text
+    rs = app.extract_resume_struct(texts[2], app.resolve_config("auto", ""), use_llm=False, parsed=parsed[2])
+    assert rs.raw_text == texts[2]
@@ -0,0 +1,133 @@
+import pytest
+
+import app
+from corpus import make_corpus
+
+JDS, CORPUS = make_corpus(20, seed=8)
+RESUMES = [(r.name, r.text) for r in CORPUS]
+CTX = app.build_scoring_context(app.resolve_config("backend", JDS["backend"]), JDS["backend"])
+
+class Crash(Exception):
+    pass
+
+@pytest.fixture
+def journal(tmp_path):
+    return app.RunJournal(tmp_path / "runs.sqlite3")
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Names handed to the scoring batch, in order."""
+    seen = []
+    batch = app._score_batch
+
+    def spy(ctx, resumes, *args, **kwargs):
+        seen.extend(name for name, _ in resumes)
+        return batch(ctx, resumes, *args, **kwargs)
+
+    monkeypatch.setattr(app, "_score_batch", spy)
+    return seen
+
+def _run(journal, resumes=RESUMES, run_id="r1", **kwargs):
+    kwargs.setdefault("chunk", 4)
+    return app.score_all_journaled(CTX, resumes, journal, run_id, use_llm=False, executor="serial", **kwargs)
+
+def _key(rows):
+    return [(r.name, r.score, r.tech, r.l2r, r.r2l, r.coverages) for r in rows]
+
+def test_crashed_run_resumes_where_it_stopped(journal, parsed):
+    expected, _, _ = app.score_all(CTX, RESUMES, use_llm=False, executor="serial")
+    count = []
+
+    def crash_after_seven(row):
+        count.append(row.name)
+        if len(count) == 7:
+            raise Crash()
+
+    with pytest.raises(Crash):
+        _run(journal, on_result=crash_after_seven)
+    assert journal.progress("r1") == {"total": 20, "pending": 13, "done": 7, "failed": 0}
+    assert len(journal.rows("r1")) == 7  # the partial ranking is readable
+
+    parsed.clear()
+    seen = []
+    rows, structs, errors = _run(journal, on_result=lambda row: seen.append(row.name))
+    assert parsed == [name for name, _ in RESUMES[7:]]
+    assert sorted(seen) == sorted(name for name, _ in RESUMES)
+    assert _key(rows) == _key(expected) and not errors
+    assert list(structs) == [app.resume_key(name, txt) for name, txt in RESUMES]
+    assert _key(journal.rows("r1")) == _key(expected)
+
+def test_failed_resumes_are_retried_up_to_max_attempts(journal, monkeypatch):
+    score_one = app._score_one
+    bad = RESUMES[3][0]
+    calls = []
+
+    def flaky(ctx, name, *args):
+        if name == bad:
+            calls.append(name)
+            raise RuntimeError("boom")
+        return score_one(ctx, name, *args)
+
+    monkeypatch.setattr(app, "_score_one", flaky)
+    for attempt in range(1, 5):
+        rows, _, errors = _run(journal, max_attempts=3)
+        assert errors == {bad: "RuntimeError: boom"}
+        assert len(calls) == min(attempt, 3) and len(rows) == 19
+    monkeypatch.setattr(app, "_score_one", score_one)
+    changed = [(name, txt + "\nPython" if name == bad else txt) for name, txt in RESUMES]
+    rows, _, errors = _run(journal, changed, max_attempts=3)  # new content: a fresh set of attempts
+    assert not errors and len(rows) == 20
+
+def test_changed_resume_is_scored_again(journal, parsed):
+    _run(journal)
+    edited = list(RESUMES)
+    edited[5] = (edited[5][0], edited[5][1] + "\nKubernetes and Terraform on AWS")
+    parsed.clear()
+    _run(journal, edited)
+    assert parsed == [edited[5][0]]
+
+def test_signature_mismatch_is_refused(journal):
+    _run(journal, RESUMES[:2])
+    with pytest.raises(ValueError, match="different JD"):
+        _run(journal, RESUMES[:2], alpha=0.9)
+    assert journal.delete("r1")
+    _run(journal, RESUMES[:2], alpha=0.9)
+
+def test_same_named_resumes_are_separate_items(journal):
+    resumes = [("resume.pdf", RESUMES[0][1]), ("resume.pdf", RESUMES[1][1]), RESUMES[2]]
+    rows, _, _ = _run(journal, resumes)
+    expected, _, _ = app.score_all(CTX, resumes, use_llm=False, executor="serial")
+    assert _key(rows) == _key(expected)
+    assert journal.progress("r1")["done"] == 3
+    assert _key(journal.rows("r1")) == _key(expected)
+    # resumed: both are read back, neither is returned twice
+    again, _, _ = _run(journal, resumes)
+    assert _key(again) == _key(expected)
+
+def test_same_names_across_calls_stay_apart_with_shared_seen_names(journal):
+    seen = {}
+    _run(journal, [("resume.pdf", RESUMES[0][1])], seen_names=seen)
+    _run(journal, [("resume.pdf", RESUMES[1][1])], seen_names=seen)
+    assert journal.progress("r1") == {"total": 2, "pending": 0, "done": 2, "failed": 0}
+
+def test_open_run_is_idempotent_and_checks_the_signature(tmp_path):
+    a, b = app.RunJournal(tmp_path / "runs.sqlite3"), app.RunJournal(tmp_path / "runs.sqlite3")
+    assert a.open_run("r", "sig") is False
+    assert b.open_run("r", "sig") is True
+    with pytest.raises(ValueError):
+        b.open_run("r", "other")
+
+def test_journal_keyed_on_name_is_migrated(tmp_path):
+    path = tmp_path / "runs.sqlite3"
+    with app.sqlite3.connect(str(path)) as db:
+        db.execute("CREATE TABLE runs (run_id TEXT PRIMARY KEY, signature TEXT NOT NULL, created REAL NOT NULL)")
+        db.execute(
+            "CREATE TABLE items (run_id TEXT NOT NULL, name TEXT NOT NULL, seq INTEGER NOT NULL, content_hash TEXT NOT NULL,"
+            " status TEXT NOT NULL, attempts INTEGER NOT NULL, score REAL, tech REAL, l2r REAL, r2l REAL,"
+            " struct TEXT, coverages TEXT, norms TEXT, error TEXT, updated REAL NOT NULL, PRIMARY KEY (run_id, name))"
+        )
+        db.execute("INSERT INTO items (run_id, name, seq, content_hash, status, attempts, updated) VALUES ('r1', 'a', 0, 'h', 'pending', 0, 0)")
+    journal = app.RunJournal(path)
+    assert journal.progress("r1") == {"total": 1, "pending": 1, "done": 0, "failed": 0}
+    _run(journal, [("a", RESUMES[0][1])], run_id="r2")
+    assert journal.progress("r2")["done"] == 1
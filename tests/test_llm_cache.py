@@ -0,0 +1,36 @@
+import app
+from corpus import make_corpus
+
+def _texts(n):
+    _, corpus = make_corpus(n, seed=7)
+    return [r.text for r in corpus]
+
+def test_batch_and_single_parses_have_separate_keys():
+    text = _texts(1)[0]
+    assert app.llm_cache_key(text) != app.llm_cache_key(text, batch=True)
+
+def test_batched_parses_are_cached_under_the_batch_key(llm_enabled, mock_llm, resume_cache):
+    texts = _texts(4)
+    first = app.llm_extract_resumes_batch(texts, enabled=True)
+    assert all(first) and mock_llm.stats["requests"] == 1
+    for t in texts:
+        assert resume_cache.get(app.llm_cache_key(t, batch=True)) is not None
+        assert resume_cache.get(app.llm_cache_key(t)) is None
+    assert resume_cache.invalidate(kind="llm-batch") == len(texts)
+
+def test_cached_parses_are_reused(llm_enabled, mock_llm, resume_cache):
+    texts = _texts(4)
+    first = app.llm_extract_resumes_batch(texts, enabled=True)
+    again = app.llm_extract_resumes_batch(texts, enabled=True)
+    assert mock_llm.stats["requests"] == 1
+    assert [p.skills for p in again] == [p.skills for p in first]
+
+def test_older_prompt_versions_are_never_read(llm_enabled, mock_llm, resume_cache):
+    text = _texts(1)[0]
+    stale = app.ResumeStruct(identity={}, roles=[], skills=[app.SkillItem(name="cobol")])
+    old_key = app.content_key(text.encode("utf-8"), "llm", app.LLM_MODEL, "resume-v1")
+    resume_cache.put(old_key, app.struct_to_json(stale), kind="llm")
+    parsed = app.llm_extract_resume(text, enabled=True)
+    assert mock_llm.stats["requests"] == 1
+    assert "cobol" not in {sk.name for sk in parsed.skills}
+    assert resume_cache.get(app.llm_cache_key(text)) is not None
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+
+import app
+
+MESSAGES = [{"role": "user", "content": "Jane Doe\nPython and Docker on AWS"}]
+
+def test_plain_request(llm_client, mock_llm):
+    resp = llm_client.chat(MESSAGES)
+    assert "python" in resp["choices"][0]["message"]["content"]
+    assert mock_llm.stats["requests"] == 1
+
+def test_retries_429_then_5xx(llm_client, mock_llm):
+    mock_llm.fail_next(429)
+    mock_llm.fail_next(503)
+    resp = llm_client.chat(MESSAGES)
+    assert resp["choices"][0]["message"]["content"]
+    assert mock_llm.stats["requests"] == 3
+    assert mock_llm.stats["failures"] == 2
+
+def test_honours_retry_after(llm_client, mock_llm):
+    mock_llm.fail_next(429, retry_after="0.3")
+    t0 = time.perf_counter()
+    llm_client.chat(MESSAGES)
+    assert time.perf_counter() - t0 >= 0.3
+    assert mock_llm.stats["requests"] == 2
+
+def test_4xx_fails_fast(llm_client, mock_llm):
+    mock_llm.fail_next(400)
+    with pytest.raises(app.LLMError, match="HTTP 400"):
+        llm_client.chat(MESSAGES)
+    assert mock_llm.stats["requests"] == 1
+
+def test_gives_up_after_max_retries(llm_client, mock_llm):
+    mock_llm.fail_next(503, times=llm_client.max_retries + 1)
+    with pytest.raises(app.LLMError, match="after 4 attempts"):
+        llm_client.chat(MESSAGES)
+    assert mock_llm.stats["requests"] == llm_client.max_retries + 1
+
+def test_stream_retries_before_first_delta(llm_client, mock_llm):
+    mock_llm.fail_next(502)
+    text = "".join(llm_client.stream_chat(MESSAGES))
+    assert "docker" in text
+    assert mock_llm.stats["requests"] == 2
+
+def test_random_failures_are_all_retried(mock_llm, llm_client):
+    mock_llm.fail_rate = 0.3
+    for _ in range(10):
+        llm_client.chat(MESSAGES)
+    assert mock_llm.stats["requests"] == 10 + mock_llm.stats["failures"]
+
+def test_token_bucket_paces_requests():
+    bucket = app.TokenBucket(capacity=2, period=0.2)   # 10 units/s
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire(1)
+
+    t0 = time.perf_counter()
+    asyncio.run(take(4))   # 2 from the full bucket, 2 more at 10/s
+    assert 0.15 <= time.perf_counter() - t0 < 1.0
+
+def test_token_bucket_refund():
+    bucket = app.TokenBucket(capacity=100, period=60.0)
+    asyncio.run(bucket.acquire(80))
+    bucket.refund(50)
+    assert 69 <= bucket.tokens <= 71
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+import app
+import mock_llm as mock_module
+
+RESUME = "Jane Doe\\nBackend engineer. Python, Docker and PostgreSQL on AWS for six years.\\n"
+DOC = {
+    "identity": {"name": ["Jane Doe"], "emails": []},
+    "roles": [{"title": "Backend Engineer", "company": "Acme"}],
+    "skills": [
+        {"name": "python", "level_hint": "advanced", "evidence_snippets": ["Python"]},
+        {"name": "docker", "level_hint": "intermediate", "evidence_snippets": ["Docker"]},
+    ],
+    "education": [],
+}
+
+def _answer(monkeypatch, single, batch=None):
+    """Make the mock answer single-resume prompts with `single` and batched ones with `batch`."""
+    original = mock_module.completion_for
+
+    def completion_for(messages):
+        if mock_module.BATCH_RE.search(messages[-1]["content"]):
+            return batch if batch is not None else original(messages)
+        return single
+
+    monkeypatch.setattr(mock_module, "completion_for", completion_for)
+
+def test_parser_emits_items_as_they_complete():
+    parser = app.ResumeStreamParser()
+    text = json.dumps(DOC)
+    events = []
+    for k in range(0, len(text), 7):
+        events += [kind for kind, _ in parser.feed(text[k:k + 7])]
+    assert events == ["identity", "role", "skill", "skill"]
+    data, complete = parser.result()
+    assert complete and data == DOC
+
+def test_parser_salvages_a_truncated_document():
+    parser = app.ResumeStreamParser()
+    text = json.dumps(DOC)
+    parser.feed(text[: text.index('"docker"') + 20])
+    data, complete = parser.result()
+    assert not complete
+    assert [s["name"] for s in data["skills"]] == ["python"]
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_malformed_skill_is_skipped(streaming, llm_enabled, monkeypatch):
+    doc = dict(DOC, skills=DOC["skills"] + [{"name": None}, "not an object"])
+    _answer(monkeypatch, json.dumps(doc))
+    monkeypatch.setattr(app, "LLM_STREAMING", streaming)
+    parsed = app.llm_extract_resume(RESUME * 3, enabled=True)
+    assert [sk.name for sk in parsed.skills] == ["python", "docker"]
+
+def test_truncated_stream_keeps_the_skills_that_arrived(llm_enabled, monkeypatch):
+    text = json.dumps(DOC)
+    _answer(monkeypatch, text[: text.index('"docker"') - 5])
+    parsed = app.llm_extract_resume(RESUME * 3, enabled=True)
+    assert [sk.name for sk in parsed.skills] == ["python"]
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_nothing_usable_returns_none(streaming, llm_enabled, monkeypatch):
+    _answer(monkeypatch, json.dumps(dict(DOC, skills=[{"name": None}])))
+    monkeypatch.setattr(app, "LLM_STREAMING", streaming)
+    assert app.llm_extract_resume(RESUME * 3, enabled=True) is None
+
+def test_batch_split_survives_a_bad_single_parse(llm_enabled, mock_llm, monkeypatch):
+    doc = dict(DOC, skills=DOC["skills"] + [{"name": None}])
+    _answer(monkeypatch, json.dumps(doc), batch="not json")
+    texts = [f"Candidate {i}\\n" + RESUME * 3 for i in range(4)]
+    out = app.llm_extract_resumes_batch(texts, enabled=True)
+    assert all(p is not None and [sk.name for sk in p.skills] == ["python", "docker"] for p in out)
+    assert mock_llm.stats["requests"] == 1 + 2 + 4   # the batch, its two halves, then one request per resume
+
+def test_stream_timings_are_recorded(llm_enabled, monkeypatch):
+    _answer(monkeypatch, json.dumps(DOC))
+    monkeypatch.setattr(app.METRICS, "enabled", True)
+    before = app.METRICS.stage_totals()
+    parsed, stats = app.llm_extract_resume_streaming(RESUME * 3)
+    after = app.METRICS.stage_totals()
+    assert parsed is not None and stats.complete
+    assert 0 <= stats.first_result_s <= stats.total_s
+    for stage in ("llm_first_result", "llm_stream"):
+        assert after[stage][0] == before.get(stage, (0, 0.0))[0] + 1
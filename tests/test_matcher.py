@@ -0,0 +1,46 @@
+import re
+
+import pytest
+
+import app
+from corpus import make_corpus
+
+CONFIG = app.resolve_config("backend", "")
+_, CORPUS = make_corpus(60, seed=5)
+
+def _naive(terms, text, words):
+    """One re.finditer per term: the semantics SkillMatcher promises, term by term."""
+    out = {}
+    for t in sorted({t.lower() for t in terms}):
+        pat = app._word_regex(t) if words else re.escape(t)
+        if words:
+            pat = f"(?<![{app._WORD_GLUE}])" + pat
+        spans = [m.span() for m in re.finditer(pat, text)]
+        if spans:
+            out[t] = spans
+    return out
+
+@pytest.mark.parametrize("words", [False, True])
+def test_matches_one_regex_per_term(words):
+    matcher = app.skill_matcher(CONFIG.terms, words=words)
+    for r in CORPUS:
+        lowered = r.text.lower()
+        assert matcher.find(lowered) == _naive(CONFIG.terms, lowered, words)
+
+@pytest.mark.parametrize("text,present,absent", [
+    ("go, google and ago", {"go"}, set()),
+    ("we use google cloud", set(), {"go"}),
+    ("react.js and python/django", {"react", "python", "django"}, set()),
+    ("javascript only", set(), {"java"}),
+    ("c++ and c# daily", {"c++"}, set()),
+    ("applied machine\n  learning", {"machine learning"}, set()),
+])
+def test_whole_word_matching(text, present, absent):
+    terms = {"go", "react", "python", "django", "java", "c++", "machine learning"}
+    found = set(app.SkillMatcher(terms, words=True).find(text))
+    assert present <= found
+    assert not (absent & found)
+
+def test_limit_caps_spans_per_term():
+    hits = app.SkillMatcher({"sql"}, words=True).find("sql " * 10, limit=3)
+    assert hits["sql"] == [(0, 3), (4, 7), (8, 11)]
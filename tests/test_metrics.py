@@ -0,0 +1,75 @@
+import threading
+
+import app
+
+def test_disabled_registry_records_nothing():
+    m = app.Metrics(enabled=False)
+    m.inc("talentiq_x_total")
+    m.observe("talentiq_y_seconds", 0.1)
+    assert m.render() == "\n" and m.counter_totals() == {}
+
+def test_render_is_prometheus_text():
+    m = app.Metrics(enabled=True, buckets=(0.01, 0.1))
+    m.inc("talentiq_requests_total", outcome="ok")
+    m.inc("talentiq_requests_total", 2, outcome='bad "quote"')
+    for seconds in (0.005, 0.05, 0.05, 3.0):
+        m.observe("talentiq_stage_seconds", seconds, stage="hybrid")
+    assert m.render().splitlines() == [
+        "# TYPE talentiq_requests_total counter",
+        'talentiq_requests_total{outcome="bad \\"quote\\""} 2',
+        'talentiq_requests_total{outcome="ok"} 1',
+        "# TYPE talentiq_stage_seconds histogram",
+        'talentiq_stage_seconds_bucket{stage="hybrid",le="0.01"} 1',
+        'talentiq_stage_seconds_bucket{stage="hybrid",le="0.1"} 3',
+        'talentiq_stage_seconds_bucket{stage="hybrid",le="+Inf"} 4',
+        'talentiq_stage_seconds_sum{stage="hybrid"} 3.105000',
+        'talentiq_stage_seconds_count{stage="hybrid"} 4',
+    ]
+    assert m.stage_totals() == {"hybrid": (4, 3.105)}
+    assert m.counter_totals() == {"talentiq_requests_total": 3}
+
+def test_timed_and_counters_are_thread_safe():
+    m = app.Metrics(enabled=True)
+
+    @m.timed("work")
+    def work():
+        m.inc("talentiq_work_total")
+
+    threads = [threading.Thread(target=lambda: [work() for _ in range(500)]) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert m.counter_totals() == {"talentiq_work_total": 4000}
+    assert m.stage_totals()["work"][0] == 4000
+
+def test_pipeline_stages_are_recorded(monkeypatch):
+    app.METRICS.reset()  # off during tests, so nothing else is in there
+    monkeypatch.setattr(app.METRICS, "enabled", True)
+    jd = "Backend engineer: Python, PostgreSQL, Docker, AWS."
+    ctx = app.build_scoring_context(app.resolve_config("backend", jd), jd)
+    app.score_all(ctx, [("a", "Python and Docker on AWS")], use_llm=False, executor="serial")
+    assert {"regex_extract_resume", "hybrid"} <= set(app.METRICS.stage_totals())
+    app.METRICS.reset()
+
+def test_drain_and_merge_add_up():
+    worker, parent = app.Metrics(enabled=True), app.Metrics(enabled=True)
+    for m in (worker, parent):
+        m.inc("talentiq_x_total", outcome="ok")
+        m.observe("talentiq_stage_seconds", 0.2, stage="hybrid")
+    parent.merge(worker.drain())
+    assert worker.counter_totals() == {} and worker.stage_totals() == {}
+    assert parent.counter_totals() == {"talentiq_x_total": 2}
+    assert parent.stage_totals() == {"hybrid": (2, 0.4)}
+
+def test_process_pool_stages_are_recorded_in_the_parent(monkeypatch):
+    app.METRICS.reset()
+    monkeypatch.setattr(app.METRICS, "enabled", True)
+    monkeypatch.setattr(app, "PROCESS_POOL_MIN_BATCH", 0)
+    jd = "Backend engineer: Python, PostgreSQL, Docker, AWS."
+    ctx = app.build_scoring_context(app.resolve_config("backend", jd), jd)
+    resumes = [(f"r{i}", "Python and Docker on AWS") for i in range(6)]
+    app.score_all(ctx, resumes, use_llm=False, executor="process", max_workers=2)
+    stages = app.METRICS.stage_totals()
+    assert stages["regex_extract_resume"][0] == stages["hybrid"][0] == 6
+    app.METRICS.reset()
@@ -0,0 +1,90 @@
+import pytest
+
+import app
+
+PAGES = [f"Page {i:02d}: " + "Python PostgreSQL Docker Kubernetes AWS " * 40 for i in range(20)]
+
+def _backend(pages, pulled, fail_after=None):
+    def read(data, max_pages):
+        for i, text in enumerate(pages[:max_pages]):
+            if fail_after is not None and i == fail_after:
+                raise ValueError("corrupt xref")
+            pulled.append(i)
+            yield text
+    return read
+
+@pytest.fixture
+def pulled(monkeypatch):
+    pulled = []
+    monkeypatch.setattr(app, "PDF_BACKENDS", (("fake", _backend(PAGES, pulled)),))
+    return pulled
+
+def test_full_text_is_kept_by_default(pulled):
+    out = app.extract_pdf_text(b"%PDF")
+    assert len(out.text) > app.MAX_RESUME_CHARS and not out.truncated
+    assert out.text == "\n".join(PAGES[:app.MAX_PDF_PAGES])
+    assert len(pulled) == out.pages == app.MAX_PDF_PAGES
+
+def test_page_cap(pulled):
+    out = app.extract_pdf_text(b"%PDF", max_pages=3, max_chars=10 ** 6)
+    assert (out.pages, pulled, out.truncated) == (3, [0, 1, 2], False)
+    assert out.text == "\n".join(PAGES[:3])
+
+def test_char_cap_stops_reading_early(pulled):
+    out = app.extract_pdf_text(b"%PDF", max_chars=1000)
+    assert len(out.text) == 1000 and out.truncated
+    assert pulled == [0]
+
+def test_next_backend_picks_up_where_the_first_failed(monkeypatch):
+    first, second = [], []
+    monkeypatch.setattr(app, "PDF_BACKENDS", (
+        ("broken", _backend(PAGES, first, fail_after=2)),
+        ("backup", _backend(PAGES, second)),
+    ))
+    out = app.extract_pdf_text(b"%PDF", max_pages=5, max_chars=10 ** 6)
+    assert out.text == "\n".join(PAGES[:5]) and out.backend == "backup"
+    assert first == [0, 1] and second == [0, 1, 2, 3, 4]
+
+def test_no_usable_backend_raises(monkeypatch):
+    monkeypatch.setattr(app, "PDF_BACKENDS", (("broken", _backend(PAGES, [], fail_after=0)),))
+    with pytest.raises(RuntimeError, match="Unable to extract text"):
+        app.extract_pdf_text(b"%PDF")
+
+def test_generated_pdf_round_trips_through_a_real_backend():
+    pytest.importorskip("pdfminer")
+    from corpus import pdf_bytes
+    lines = [f"Line {i:03d} Python PostgreSQL Docker" for i in range(120)]
+    out = app.extract_pdf_text(pdf_bytes(lines, lines_per_page=50), max_chars=10 ** 6)
+    assert out.pages == 3 and not out.truncated
+    assert "Line 000" in out.text and "Line 119" in out.text
+
+def test_llm_prompt_is_capped_but_regex_sees_everything():
+    text = "filler " * (app.MAX_RESUME_CHARS // 7) + "\nKubernetes"
+    prompt = app._resume_messages(text)[1]["content"]
+    assert "Kubernetes" not in prompt
+    rs = app.regex_extract_resume(text, app.resolve_config("backend", ""))
+    assert "kubernetes" in {sk.name for sk in rs.skills}
+
+def _slow_extract(data, max_pages, max_chars):
+    import time
+    time.sleep(60)
+
+def _quick_extract(data, max_pages, max_chars):
+    return app.PdfExtraction("quick", "fake", 1, 0.0)
+
+def test_timed_out_extraction_kills_the_worker_and_resets_the_pool(monkeypatch):
+    monkeypatch.setattr(app, "LARGE_PDF_BYTES", 0)
+    monkeypatch.setattr(app, "PDF_TIMEOUT_S", 1.0)
+    monkeypatch.setattr(app, "extract_pdf_text", _slow_extract)
+    pool = app._pdf_pool()
+    pool.submit(int).result()  # started, so the timeout below measures the extractor alone
+    workers = list(pool._processes.values())
+    with pytest.raises(TimeoutError):
+        app.load_pdf_bytes(b"%PDF slow")
+    assert app._PDF_POOL is None
+    for proc in workers:
+        proc.join(5)
+        assert not proc.is_alive()
+    monkeypatch.setattr(app, "extract_pdf_text", _quick_extract)
+    assert app.load_pdf_bytes(b"%PDF quick").text == "quick"
+    assert app._PDF_POOL is not None and app._PDF_POOL is not pool
@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+import app
+from test_context import JD, _ctx, _random_struct
+
+def _structs(role, n=150, seed=0):
+    rng = random.Random(seed)
+    return [(f"c{i:03d}", _random_struct(rng, role)) for i in range(n)]
+
+def _expected(ctx, items, alpha, beta):
+    rows = []
+    for name, rs in items:
+        score, _, _, tech, l2r, r2l = app.hybrid(ctx, rs, alpha=alpha, beta=beta)
+        rows.append((name, score, tech, l2r, r2l))
+    rows.sort(key=lambda r: r[1], reverse=True)
+    return rows
+
+@pytest.mark.parametrize("role", sorted(app.DEFAULT_TAXONOMY))
+@pytest.mark.parametrize("alpha,beta", [(0.4, 1.5), (0.0, 1.0), (1.0, 0.5)])
+def test_pool_ranks_like_hybrid(role, alpha, beta):
+    ctx = _ctx(role, JD)
+    items = _structs(role)
+    expected = _expected(ctx, items, alpha, beta)
+    assert sum(row[1] > 0 for row in expected) >= len(expected) // 3
+    assert app.CandidatePool.from_structs(items).rank(ctx, alpha, beta) == expected
+
+def test_one_pool_many_jds():
+    items = _structs("backend", seed=3)
+    pool = app.CandidatePool.from_structs(items)
+    for jd in (JD, "Go and Kafka.", ""):
+        ctx = _ctx("backend", jd)
+        assert pool.rank(ctx) == _expected(ctx, items, 0.4, 1.5)
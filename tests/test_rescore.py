@@ -0,0 +1,41 @@
+import pytest
+
+import app
+from test_batch import JD, RESUMES
+
+A11Y_JD = "Frontend: React and Redux. Accessibility first - WCAG, ARIA and a11y audits. Jest, Webpack."
+
+def _key(rows):
+    return [(r.name, r.score, r.tech, r.l2r, r.r2l, r.coverages) for r in rows]
+
+@pytest.mark.parametrize("role,jd,new_jd", [("backend", JD, JD + " Kafka and Go."), ("frontend", JD, A11Y_JD)])
+@pytest.mark.parametrize("alpha,beta", [(0.4, 1.5), (0.9, 0.5)])
+def test_rescore_matches_a_fresh_run_without_parsing(role, jd, new_jd, alpha, beta, monkeypatch):
+    config = app.resolve_config(role, jd)
+    _, structs, _ = app.score_all(app.build_scoring_context(config, jd), RESUMES, use_llm=False, executor="serial")
+    new_ctx = app.build_scoring_context(config, new_jd)
+    fresh, _, _ = app.score_all(new_ctx, RESUMES, alpha=alpha, beta=beta, use_llm=False, executor="serial")
+
+    def no_parsing(*args, **kwargs):
+        raise AssertionError("rescore_all must not parse again")
+
+    monkeypatch.setattr(app, "regex_extract_resume", no_parsing)
+    monkeypatch.setattr(app, "extract_resume_struct", no_parsing)
+    assert _key(app.rescore_all(new_ctx, structs, alpha=alpha, beta=beta)) == _key(fresh)
+
+def test_table_rows_are_ranked_in_order():
+    ctx = app.build_scoring_context(app.resolve_config("backend", JD), JD)
+    rows, _, _ = app.score_all(ctx, RESUMES, use_llm=False, executor="serial")
+    table = app._table_rows(rows)
+    assert [t["Rank"] for t in table] == list(range(1, len(rows) + 1))
+    assert [(t["Candidate"], t["Hybrid%"]) for t in table] == [(r.name, r.score) for r in rows]
+
+def test_same_named_resumes_survive_rescoring():
+    resumes = [("resume.pdf", RESUMES[0][1]), ("resume.pdf", RESUMES[2][1]), RESUMES[1]]
+    ctx = app.build_scoring_context(app.resolve_config("backend", JD), JD)
+    rows, structs, _ = app.score_all(ctx, resumes, use_llm=False, executor="serial", compact=True)
+    assert len(structs) == len(rows) == 3
+    assert _key(app.rescore_all(ctx, structs)) == _key(rows)
+    if app.np is not None:
+        sheet = app._score_sheet(rows, structs)
+        assert _key(sheet.ranked(0.4, 1.5)) == _key(rows)
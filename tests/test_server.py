@@ -0,0 +1,133 @@
+import http.client
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import httpx
+import pytest
+
+import app
+import server
+from corpus import make_corpus
+
+JDS, CORPUS = make_corpus(12, seed=2)
+JD = JDS["backend"]
+
+@pytest.fixture
+def service():
+    return server.JobService(workers=1, queue_size=1, executor="serial")
+
+@pytest.fixture
+def client(service):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), server.make_handler(service, "*"))
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    with httpx.Client(base_url=f"http://127.0.0.1:{httpd.server_address[1]}", timeout=10) as c:
+        yield c
+    httpd.shutdown()
+    httpd.server_close()
+
+def _upload(client, resumes):
+    ids = []
+    for r in resumes:
+        resp = client.post("/resumes", params={"name": f"{r.name}.txt"}, content=r.text.encode())
+        assert resp.status_code == 201
+        ids.append(resp.json()["id"])
+    return ids
+
+def _submit(client, ids, **extra):
+    return client.post("/jobs", json={"jd": JD, "resumes": ids, "role": "backend", "use_llm": False, **extra})
+
+def _wait(client, job_id):
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        snap = client.get(f"/jobs/{job_id}").json()
+        if snap["status"] in ("done", "failed"):
+            return snap
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+def test_job_results_match_score_all_and_page(client):
+    ids = _upload(client, CORPUS)
+    resp = _submit(client, ids)
+    assert resp.status_code == 202 and resp.headers["Location"] == f"/jobs/{resp.json()['id']}"
+    snap = _wait(client, resp.json()["id"])
+    assert (snap["status"], snap["done"], snap["total"], snap["failed"]) == ("done", 12, 12, 0)
+
+    ctx = app.build_scoring_context(app.resolve_config("backend", JD), JD)
+    rows, _, _ = app.score_all(ctx, [(f"{r.name}.txt", r.text) for r in CORPUS], use_llm=False, executor="serial")
+    pages = [client.get(f"/jobs/{snap['id']}/results", params={"offset": off, "limit": 5}).json() for off in (0, 5, 10)]
+    assert all(p["complete"] and p["total"] == 12 for p in pages)
+    items = [item for p in pages for item in p["items"]]
+    assert [item["rank"] for item in items] == list(range(1, 13))
+    assert [(item["candidate"], item["hybrid"]) for item in items] == [(r.name, r.score) for r in rows]
+
+def test_full_queue_answers_429(client, service, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    run = service._run
+
+    def blocked(job):
+        started.set()
+        release.wait(10)
+        run(job)
+
+    monkeypatch.setattr(service, "_run", blocked)
+    ids = _upload(client, CORPUS[:2])
+    first = _submit(client, ids).json()["id"]
+    assert started.wait(5)                             # the only worker is busy
+    second = _submit(client, ids)
+    assert second.status_code == 202 and second.json()["queued"] == 1
+    full = _submit(client, ids)
+    assert full.status_code == 429 and full.headers["Retry-After"] == "5"
+    release.set()
+    assert _wait(client, first)["status"] == "done"
+    assert _wait(client, second.json()["id"])["status"] == "done"
+
+def test_events_stream_ends_with_done(client):
+    ids = _upload(client, CORPUS[:3])
+    job_id = _submit(client, ids).json()["id"]
+    events = []
+    with client.stream("GET", f"/jobs/{job_id}/events") as resp:
+        assert resp.headers["content-type"] == "text/event-stream"
+        for line in resp.iter_lines():
+            if line.startswith("event: "):
+                events.append(line[7:])
+            elif line.startswith("data: ") and events[-1] == "done":
+                assert json.loads(line[6:])["done"] == 3
+    assert events[-1] == "done" and set(events[:-1]) <= {"progress"}
+
+@pytest.mark.parametrize("body,message", [
+    ({"resumes": ["x"]}, "'jd'"),
+    ({"jd": JD, "resumes": []}, "'resumes'"),
+    ({"jd": JD, "resumes": ["nope"]}, "unknown resume id"),
+    ({"jd": JD, "resumes": ["nope"], "role": "chef"}, "'role'"),
+])
+def test_bad_submissions_are_400(client, body, message):
+    resp = client.post("/jobs", json=body)
+    assert resp.status_code == 400 and message in resp.json()["error"]
+
+@pytest.mark.parametrize("length,status,message", [
+    ("abc", 400, "non-negative integer"),
+    ("-1", 400, "non-negative integer"),
+    ("1e3", 400, "non-negative integer"),
+    ("99999999999", 413, "body larger than"),
+])
+def test_bad_content_length_is_rejected(client, length, status, message):
+    conn = http.client.HTTPConnection(client.base_url.host, client.base_url.port, timeout=5)
+    conn.putrequest("POST", "/resumes?name=cv.txt")
+    conn.putheader("Content-Length", length)
+    conn.endheaders()
+    resp = conn.getresponse()
+    assert resp.status == status and message in json.loads(resp.read())["error"]
+    conn.close()
+
+def test_upload_limit_is_configurable(client, monkeypatch):
+    monkeypatch.setattr(server, "MAX_UPLOAD_BYTES", 4)
+    assert client.post("/resumes", params={"name": "cv.txt"}, content=b"12345").status_code == 413
+    assert client.post("/resumes", params={"name": "cv.txt"}, content=b"1234").status_code == 201
+
+def test_unknown_routes_and_jobs_are_404(client):
+    assert client.get("/jobs/deadbeef").status_code == 404
+    assert client.get("/nope").status_code == 404
+    assert client.post("/resumes", params={"name": "cv.docx"}, content=b"x").status_code == 400
@@ -0,0 +1,40 @@
+import pytest
+
+import app
+from corpus import make_corpus
+
+JDS, CORPUS = make_corpus(120, seed=11)
+RESUMES = [(r.name, r.text) for r in CORPUS]
+
+def _ctx(role):
+    jd = JDS[role]
+    return app.build_scoring_context(app.resolve_config("auto", jd), jd)
+
+@pytest.mark.parametrize("role", sorted(JDS))
+@pytest.mark.parametrize("cutoff,k", [(0.0, 5), (40.0, 10), (70.0, 3)])
+def test_regex_shortlist_matches_score_all(role, cutoff, k):
+    ctx = _ctx(role)
+    rows, _, _ = app.score_all(ctx, RESUMES, use_llm=False, executor="serial")
+    expected = [(r.name, r.score) for r in rows if r.score >= cutoff][:k]
+    got, stats = app.shortlist(ctx, RESUMES, cutoff, k, use_llm=False, executor="serial")
+    assert [(r.name, r.score) for r in got] == expected
+    assert stats["scored"] + stats["skipped"] + stats["failed"] == len(RESUMES)
+
+def test_bounds_dominate_regex_scores():
+    ctx = _ctx("backend")
+    rows, _, _ = app.score_all(ctx, RESUMES, use_llm=False, executor="serial")
+    text = dict(RESUMES)
+    for r in rows:
+        assert app.score_upper_bound(ctx, text[r.name], use_llm=False) >= r.score
+
+def test_llm_bound_counts_alias_spellings():
+    config = app.resolve_config("backend", "")
+    ctx = app.build_scoring_context(config, "We need ci/cd experience.")
+    text = "Set up continuous integration for every service."
+    parsed = app.ResumeStruct(
+        identity={}, roles=[], skills=[app.SkillItem(name="continuous integration", level_hint="advanced")], raw_text=text,
+    )
+    rs = app.extract_resume_struct(text, config, use_llm=False, parsed=parsed)
+    actual = app.hybrid(ctx, rs)[0]
+    assert actual > 0
+    assert app.score_upper_bound(ctx, text, use_llm=True) >= actual
@@ -0,0 +1,71 @@
+import pytest
+
+import app
+from test_context import JD, _ctx
+from test_pool import _expected, _structs
+
+ITEMS = {role: _structs(role, seed=7) for role in sorted(app.DEFAULT_TAXONOMY)}
+
+@pytest.fixture(scope="module")
+def stores(tmp_path_factory):
+    out = {}
+    for role, items in ITEMS.items():
+        out[role] = app.CandidateStore(tmp_path_factory.mktemp("store") / "candidates.sqlite3")
+        out[role].add_many(items)
+    return out
+
+@pytest.mark.parametrize("role", sorted(app.DEFAULT_TAXONOMY))
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_store_ranks_like_hybrid(stores, role, vectorized, monkeypatch):
+    if not vectorized:
+        monkeypatch.setattr(app, "np", None)
+    ctx = _ctx(role, JD)
+    store = stores[role]
+    hit = set(store.candidates_for(ctx.skillset))
+    everyone = _expected(ctx, ITEMS[role], 0.4, 1.5)
+    assert store.rank(ctx) == [row for row in everyone if row[0] in hit]
+    assert hit and all(row[1] == 0 for row in everyone if row[0] not in hit)
+
+def _parse(text):
+    return app.regex_extract_resume(text, app.resolve_config("backend", ""))
+
+def test_same_filename_different_resumes_are_both_kept(tmp_path):
+    store = app.CandidateStore(tmp_path / "candidates.sqlite3")
+    first, second = _parse("Python and Django."), _parse("Java, Spring and Kubernetes.")
+    store.add("resume.pdf", first)
+    store.add("resume.pdf", second)
+    store.add("resume.pdf", first)  # the same upload again refreshes its row
+    assert len(store) == 2
+    assert store.get("resume.pdf", store.content_hash(first)) == first
+    assert store.get("resume.pdf", store.content_hash(second)) == second
+    assert store.get("resume.pdf") == first  # latest
+    assert store.get_all("resume.pdf") == [second, first]
+    assert store.candidates_for(["python"]) == store.candidates_for(["java"]) == ["resume.pdf"]
+    assert store.remove("resume.pdf", store.content_hash(first))
+    assert store.get_all("resume.pdf") == [second]
+
+def test_store_replace_and_remove(tmp_path):
+    store = app.CandidateStore(tmp_path / "candidates.sqlite3")
+    (a, rs_a), (_, rs_b) = ITEMS["backend"][:2]
+    store.add(a, rs_a)
+    store.add("other", rs_b)
+    store.replace(a, rs_b)
+    assert len(store) == 2
+    assert [sk.name for sk in store.get(a).skills] == [sk.name.lower() for sk in rs_b.skills]
+    assert store.remove(a) and not store.remove(a)
+    assert store.remove("other")
+    assert len(store) == 0 and store.candidates_for(["python"]) == []
+
+def test_name_keyed_store_is_rebuilt(tmp_path):
+    path = tmp_path / "candidates.sqlite3"
+    with app.sqlite3.connect(str(path)) as db:
+        db.execute(
+            "CREATE TABLE candidates (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, content_hash TEXT NOT NULL,"
+            " struct TEXT NOT NULL, total_depth REAL NOT NULL, penalty REAL NOT NULL, added REAL NOT NULL)"
+        )
+        db.execute("INSERT INTO candidates VALUES (1, 'a', 'h', '{}', 0, 1, 0)")
+    store = app.CandidateStore(path)
+    assert len(store) == 0
+    store.add("resume.pdf", _parse("Python."))
+    store.add("resume.pdf", _parse("Go."))
+    assert len(store) == 2
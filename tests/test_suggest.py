@@ -0,0 +1,47 @@
+from collections import Counter
+
+import pytest
+
+import app
+from corpus import ROLES, make_corpus
+
+_, CORPUS = make_corpus(120, seed=6, density=0.6)
+TEXTS = [r.text for r in CORPUS]
+CONFIG = app.resolve_config(next(iter(app.DEFAULT_TAXONOMY)), "")
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_clusters_recover_the_roles(vectorized, monkeypatch):
+    if not vectorized:
+        monkeypatch.setattr(app, "np", None)
+    profiles = [app.skill_profile(t, CONFIG) for t in TEXTS]
+    clusters = app.cluster_skill_profiles(profiles, len(ROLES))
+    assert sorted(i for c in clusters for i in c) == [i for i, p in enumerate(profiles) if p]
+    majority = sum(Counter(CORPUS[i].role for i in c).most_common(1)[0][1] for c in clusters)
+    assert majority / len(TEXTS) >= 0.9
+
+def test_resumes_without_skills_are_left_out():
+    profiles = [{"python": 1.0}, {}, {"react": 1.0}]
+    clusters = app.cluster_skill_profiles(profiles, 2)
+    assert sorted(clusters) == [[0], [2]]
+
+def test_one_bounded_prompt_per_cluster_then_cache(llm_enabled, mock_llm, resume_cache, monkeypatch):
+    prompts = []
+    chat = app.llm_chat
+
+    def spy(messages, **kwargs):
+        prompts.append(messages[-1]["content"])
+        return chat(messages, **kwargs)
+
+    monkeypatch.setattr(app, "llm_chat", spy)
+    out = app.llm_suggest_jds_from_resumes(TEXTS, max_clusters=4)
+    assert len(out) == app.SUGGEST_MAX_ROLES
+    assert len({item["role"] for item in out}) == len(out)
+    first_round = [item["candidates"] for item in out[:4]]  # one role per cluster, largest first
+    assert first_round == sorted(first_round, reverse=True) and sum(first_round) <= len(TEXTS)
+    assert len(prompts) == mock_llm.stats["requests"] == 4
+    assert all(p.count("\n- ") <= app.SUGGEST_TOP_SKILLS for p in prompts)
+    assert not any(line in p for p in prompts for line in TEXTS[0].splitlines()[:1])
+
+    prompts.clear()
+    assert app.llm_suggest_jds_from_resumes(TEXTS, max_clusters=4) == out
+    assert not prompts and mock_llm.stats["requests"] == 4
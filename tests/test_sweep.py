@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import app
+from corpus import make_corpus
+
+JDS, CORPUS = make_corpus(60, seed=4)
+RESUMES = [(r.name, r.text) for r in CORPUS]
+CTX = app.build_scoring_context(app.resolve_config("auto", JDS["backend"]), JDS["backend"])
+ROWS, STRUCTS, _ = app.score_all(CTX, RESUMES, use_llm=False, executor="serial")
+KEYS = {key[0]: key for key in STRUCTS}
+
+def _rows(rows):
+    return [(r.name, r.score, r.tech, r.l2r, r.r2l) for r in rows]
+
+def test_ranked_equals_rescore():
+    sheet = app.ScoreSheet(ROWS)
+    for alpha in app.SWEEP_ALPHAS:
+        for beta in app.SWEEP_BETAS:
+            assert _rows(sheet.ranked(alpha, beta)) == _rows(app.rescore_all(CTX, STRUCTS, alpha=alpha, beta=beta))
+
+@pytest.mark.parametrize("k,cutoff", [(5, float("-inf")), (10, 40.0)])
+def test_sweep_matches_rescoring_every_grid_point(k, cutoff):
+    sheet = app.ScoreSheet(ROWS)
+    sweep = sheet.sweep(k, cutoff=cutoff)
+    names = sheet.names
+    hits = {n: 0 for n in names}
+    ranks = {n: [] for n in names}
+    top_sets = set()
+    for alpha in app.SWEEP_ALPHAS:
+        for beta in app.SWEEP_BETAS:
+            # rescore_all keeps ties in insertion order, i.e. sheet order when fed in that order
+            ranked = app.rescore_all(CTX, {KEYS[n]: STRUCTS[KEYS[n]] for n in names}, alpha=alpha, beta=beta)
+            top = tuple(r.name for r in ranked[:k] if r.score >= cutoff)
+            top_sets.add(top)
+            for pos, r in enumerate(ranked):
+                ranks[r.name].append(pos + 1)
+            for n in top:
+                hits[n] += 1
+    points = len(app.SWEEP_ALPHAS) * len(app.SWEEP_BETAS)
+    assert np.allclose(sweep["top_share"], [hits[n] / points for n in names])
+    assert list(sweep["best_rank"]) == [min(ranks[n]) for n in names]
+    assert list(sweep["worst_rank"]) == [max(ranks[n]) for n in names]
+    assert sweep["always"] == [n for n in names if hits[n] == points]
+    assert set(sweep["sometimes"]) == {n for n in names if 0 < hits[n] < points}
+    assert sweep["top_sets"] == len(top_sets)